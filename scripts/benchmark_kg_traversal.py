@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Benchmark knowledge graph traversal on synthetic power-law graphs.
+
+Builds a preferential-attachment (Barabasi-Albert style) graph, whose few
+high-degree hubs make path queries branch heavily, and compares:
+
+- multi-hop ``relation_path`` queries with the previous list-based walk
+  (every path kept, no frontier deduplication) against the set-based
+  GraphTraversal engine;
+- shortest paths with a one-sided BFS against the bidirectional search.
+
+The list-based walk is abandoned once its frontier exceeds --max-paths
+entries (shown as ">").
+
+Run with:
+    python scripts/benchmark_kg_traversal.py
+    python scripts/benchmark_kg_traversal.py --sizes 10000 100000 --edges-per-node 4 --hops 5
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from symphony.core.registry.backends.knowledge_graph.traversal import GraphTraversal, Hop
+
+
+def power_law_graph(size, edges_per_node, seed):
+    """Build entity and adjacency maps for a preferential-attachment graph."""
+    rng = np.random.default_rng(seed)
+    entities = {f"n{i}": {"id": f"n{i}", "type": "node", "properties": {}} for i in range(size)}
+    outgoing = defaultdict(dict)
+    incoming = defaultdict(dict)
+
+    # Every edge endpoint is appended here, so sampling from it picks
+    # nodes proportionally to their degree
+    endpoints = list(range(edges_per_node))
+    for node in range(edges_per_node, size):
+        targets = {endpoints[i] for i in rng.integers(0, len(endpoints), edges_per_node)}
+        for target in targets:
+            from_id, to_id = f"n{node}", f"n{target}"
+            # Alternate edge direction so hubs have both in- and out-edges
+            if (node + target) % 2:
+                from_id, to_id = to_id, from_id
+            outgoing[from_id][to_id] = {"LINKS": {}}
+            incoming[to_id][from_id] = {"LINKS": {}}
+            endpoints.extend((node, target))
+    return entities, outgoing, incoming
+
+
+def list_walk(outgoing, start_id, relation_path, limit, max_paths):
+    """The previous query walk: a list holding every path's end entity."""
+    current = [start_id]
+    for relation_type in relation_path:
+        next_entities = []
+        for entity_id in current:
+            for to_id, relations in outgoing.get(entity_id, {}).items():
+                if relation_type in relations:
+                    next_entities.append(to_id)
+            if len(next_entities) > max_paths:
+                return None
+        current = next_entities
+        if not current:
+            return []
+    return current[:limit]
+
+
+def one_sided_path(traversal, start_id, end_id, hop):
+    """Shortest path with a plain BFS from the start only."""
+    parents = {start_id: None}
+    queue = deque([start_id])
+    while queue:
+        entity_id = queue.popleft()
+        if entity_id == end_id:
+            break
+        for neighbor in traversal.neighbors(entity_id, hop):
+            if neighbor not in parents:
+                parents[neighbor] = entity_id
+                queue.append(neighbor)
+    if end_id not in parents:
+        return None
+    path = []
+    node = end_id
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    return path[::-1]
+
+
+def time_queries(func, args):
+    """Total wall-clock time of running func over every argument tuple."""
+    start = time.perf_counter()
+    results = [func(*arg) for arg in args]
+    return time.perf_counter() - start, results
+
+
+def run(sizes, edges_per_node, hops, queries, limit, max_paths, seed):
+    """Run the benchmark and print a results table."""
+    rng = np.random.default_rng(seed)
+    relation_path = ["LINKS"] * hops
+    hop_path = [Hop("LINKS")] * hops
+    both = Hop("LINKS", "both")
+
+    print(f"edges_per_node={edges_per_node} hops={hops} queries={queries} limit={limit}")
+    print(
+        f"{'nodes':>10} {'list walk (s)':>14} {'engine (s)':>11} "
+        f"{'bfs path (s)':>13} {'bidir (s)':>10}"
+    )
+
+    for size in sizes:
+        entities, outgoing, incoming = power_law_graph(size, edges_per_node, seed)
+        traversal = GraphTraversal(entities, outgoing, incoming)
+        starts = [(f"n{i}",) for i in rng.integers(0, size, queries)]
+        pairs = [(f"n{a}", f"n{b}") for a, b in rng.integers(0, size, (queries, 2))]
+
+        list_time, list_results = time_queries(
+            lambda s: list_walk(outgoing, s, relation_path, limit, max_paths), starts
+        )
+        list_label = f"{'>' if any(r is None for r in list_results) else ''}{list_time:.3f}"
+        engine_time, _ = time_queries(lambda s: traversal.follow(s, hop_path, limit), starts)
+
+        bfs_time, bfs_paths = time_queries(lambda a, b: one_sided_path(traversal, a, b, both), pairs)
+        bidir_time, bidir_paths = time_queries(lambda a, b: traversal.shortest_path(a, b, both), pairs)
+        assert [len(p or ()) for p in bfs_paths] == [len(p or ()) for p in bidir_paths]
+
+        print(
+            f"{size:>10} {list_label:>14} {engine_time:>11.3f} "
+            f"{bfs_time:>13.3f} {bidir_time:>10.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--edges-per-node", type=int, default=3)
+    parser.add_argument("--hops", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--max-paths", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(
+        args.sizes, args.edges_per_node, args.hops, args.queries,
+        args.limit, args.max_paths, args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
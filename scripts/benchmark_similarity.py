@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Micro-benchmark for the shared cosine similarity kernel.
+
+Compares the pure-Python per-item cosine similarity that LocalGraph and
+ConversationKnowledgeGraphMemory used to run against the vectorized NumPy
+kernel in symphony.memory.vector_index, for one query over N stored items.
+
+The pure-Python loop is timed on at most --python-sample items and
+extrapolated linearly for larger N (marked with "~").
+
+Run with:
+    python scripts/benchmark_similarity.py
+    python scripts/benchmark_similarity.py --sizes 10000 100000 --dimension 384
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from symphony.memory.vector_index import cosine_similarities, normalize_rows
+
+
+def python_cosine_similarity(vec1, vec2):
+    """The previous pure-Python implementation."""
+    dot_product = sum(a * b for a, b in zip(vec1, vec2))
+    norm1 = sum(a * a for a in vec1) ** 0.5
+    norm2 = sum(b * b for b in vec2) ** 0.5
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+    return dot_product / (norm1 * norm2)
+
+
+def time_call(func, repeat):
+    """Return the best wall-clock time of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, dimension, python_sample, repeat):
+    """Run the benchmark and print a results table."""
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(dimension, dtype=np.float32)
+    query_list = query.tolist()
+
+    print(f"dimension={dimension}")
+    print(f"{'items':>10} {'python (s)':>14} {'kernel (s)':>12} {'prenorm (s)':>12} {'speedup':>10}")
+
+    for size in sizes:
+        vectors = rng.standard_normal((size, dimension), dtype=np.float32)
+
+        sample = min(size, python_sample)
+        sample_lists = vectors[:sample].tolist()
+        python_time = time_call(
+            lambda: [python_cosine_similarity(query_list, v) for v in sample_lists], 1
+        ) * (size / sample)
+        python_label = f"{'~' if sample < size else ''}{python_time:.3f}"
+
+        kernel_time = time_call(lambda: cosine_similarities(query, vectors), repeat)
+
+        # Stored rows pre-normalized once, as VectorIndex keeps them
+        normalized = normalize_rows(vectors)
+        query_norm = normalize_rows(query)
+        prenorm_time = time_call(lambda: normalized @ query_norm, repeat)
+
+        print(
+            f"{size:>10} {python_label:>14} {kernel_time:>12.4f} {prenorm_time:>12.4f} "
+            f"{python_time / prenorm_time:>9.0f}x"
+        )
+        del vectors, normalized
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--python-sample", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.sizes, args.dimension, args.python_sample, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
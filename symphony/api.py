@@ -384,15 +384,15 @@ class Symphony:
         if not self._persistence_enabled or not self._checkpoint_manager:
             raise RuntimeError("State persistence not enabled. Initialize Symphony with persistence_enabled=True.")
         
-        checkpoints = await self._checkpoint_manager.list_checkpoints()
+        entries = await self._checkpoint_manager.list_entries()
         return [
             {
-                "id": checkpoint.checkpoint_id,
-                "name": checkpoint.name,
-                "created_at": checkpoint.created_at,
-                "entity_count": len(checkpoint.entities)
+                "id": entry.checkpoint_id,
+                "name": entry.name,
+                "created_at": entry.created_at,
+                "entity_count": entry.entity_count
             }
-            for checkpoint in checkpoints
+            for entry in entries
         ]
     
     async def delete_checkpoint(self, checkpoint_id: str) -> bool:
@@ -7,6 +7,7 @@ used for storing structured relationships between entities.
 from symphony.core.registry.backends.knowledge_graph.base import KnowledgeGraphBackend
 from symphony.core.registry.backends.knowledge_graph.memory import InMemoryKnowledgeGraph
 from symphony.core.registry.backends.knowledge_graph.file import FileKnowledgeGraph
+from symphony.core.registry.backends.knowledge_graph.traversal import GraphTraversal, Hop
 
 # Register built-in providers
 from symphony.core.registry.backends.base import BackendType, StorageBackendFactory
@@ -28,4 +29,6 @@ __all__ = [
     'KnowledgeGraphBackend',
     'InMemoryKnowledgeGraph',
     'FileKnowledgeGraph',
+    'GraphTraversal',
+    'Hop',
 ]
\ No newline at end of file
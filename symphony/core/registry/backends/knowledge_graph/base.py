@@ -4,12 +4,70 @@ This module defines the abstract interface for knowledge graph backends
 used for storing structured relationships between entities.
 """
 
+import gc
 from abc import abstractmethod
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Container, Iterator
 
 from symphony.core.registry.backends.base import StorageBackend
 
 
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause cyclic garbage collection during a synchronous bulk load.
+    
+    Bulk loads allocate many small dictionaries that survive, which would
+    otherwise trigger repeated full collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def validate_bulk_entities(entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Check that every bulk entity has an id and a type.
+    
+    Raises:
+        ValueError: If an entity dictionary has no "id" or "type"
+    """
+    for entity in entities:
+        if "id" not in entity or "type" not in entity:
+            raise ValueError(f"Bulk entities need 'id' and 'type' keys: {entity!r}")
+    return entities
+
+
+def validate_bulk_relations(
+    relations: List[Dict[str, Any]],
+    entities: Optional[Container[str]] = None
+) -> List[Dict[str, Any]]:
+    """Check that every bulk relation has its endpoints and a type.
+    
+    Args:
+        relations: Relation dictionaries
+        entities: IDs of existing entities; when given, both endpoints of
+            every relation must be among them
+        
+    Returns:
+        The relations
+        
+    Raises:
+        ValueError: If a relation is incomplete or an endpoint does not exist
+    """
+    for relation in relations:
+        if "from_id" not in relation or "to_id" not in relation or "type" not in relation:
+            raise ValueError(f"Bulk relations need 'from_id', 'to_id' and 'type' keys: {relation!r}")
+        if entities is not None:
+            if relation["from_id"] not in entities:
+                raise ValueError(f"Source entity '{relation['from_id']}' does not exist")
+            if relation["to_id"] not in entities:
+                raise ValueError(f"Target entity '{relation['to_id']}' does not exist")
+    return relations
+
+
 class KnowledgeGraphBackend(StorageBackend):
     """Abstract base class for knowledge graph backends.
     
@@ -95,6 +153,41 @@ class KnowledgeGraphBackend(StorageBackend):
         """
         pass
     
+    async def add_entities_bulk(self, entities: List[Dict[str, Any]]) -> None:
+        """Add many entities at once.
+        
+        Backends should override this to store the whole batch in one step;
+        the default implementation calls add_entity() per entity.
+        
+        Args:
+            entities: Entity dictionaries with "id", "type" and optional
+                "properties" keys
+            
+        Raises:
+            ValueError: If an entity dictionary has no "id" or "type"
+        """
+        for entity in validate_bulk_entities(entities):
+            await self.add_entity(entity["id"], entity["type"], entity.get("properties"))
+    
+    async def add_relations_bulk(self, relations: List[Dict[str, Any]]) -> None:
+        """Add many relations at once.
+        
+        Backends should override this to store the whole batch in one step;
+        the default implementation calls add_relation() per relation.
+        
+        Args:
+            relations: Relation dictionaries with "from_id", "to_id", "type"
+                and optional "properties" keys
+            
+        Raises:
+            ValueError: If a relation dictionary is incomplete or refers to an
+                entity that does not exist
+        """
+        for relation in validate_bulk_relations(relations):
+            await self.add_relation(
+                relation["from_id"], relation["to_id"], relation["type"], relation.get("properties")
+            )
+    
     @abstractmethod
     async def get_relations(
         self, 
@@ -142,12 +235,129 @@ class KnowledgeGraphBackend(StorageBackend):
     ) -> List[Dict[str, Any]]:
         """Query for entities connected through a path of relations.
         
+        Each distinct entity at the end of the path is returned once.
+        
         Args:
             start_entity_id: ID of the starting entity
-            relation_path: List of relation types to traverse
+            relation_path: List of hops to traverse; each is a relation type
+                (followed outgoing) or a dictionary with optional "type",
+                "direction", "properties", "entity_type" and "where" keys
+                (see traversal.Hop)
             limit: Maximum number of results
             
         Returns:
             List of entity dictionaries matching the query
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def neighborhood(
+        self,
+        start_entity_id: str,
+        max_depth: int = 1,
+        relation_types: Optional[List[str]] = None,
+        direction: str = "outgoing",
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the entities within a bounded number of hops, breadth-first.
+        
+        Backends should override this with a native traversal; the default
+        implementation walks get_relations() level by level.
+        
+        Args:
+            start_entity_id: ID of the starting entity
+            max_depth: Maximum number of hops from the start
+            relation_types: Relation types to follow (all if None)
+            direction: "outgoing", "incoming", or "both"
+            limit: Maximum number of results, including the start entity
+            
+        Returns:
+            Entity dictionaries with an added "depth" key, nearest first
+        """
+        start = await self.get_entity(start_entity_id)
+        if start is None:
+            return []
+        
+        results = [{**start, "depth": 0}]
+        visited = {start_entity_id}
+        frontier = [start_entity_id]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for entity_id in frontier:
+                for neighbor_id in await self._related_ids(entity_id, relation_types, direction):
+                    if neighbor_id in visited:
+                        continue
+                    visited.add(neighbor_id)
+                    entity = await self.get_entity(neighbor_id)
+                    if entity is None:
+                        continue
+                    next_frontier.append(neighbor_id)
+                    results.append({**entity, "depth": depth})
+                    if len(results) >= limit:
+                        return results
+            frontier = next_frontier
+        return results
+    
+    async def shortest_path(
+        self,
+        from_entity_id: str,
+        to_entity_id: str,
+        relation_types: Optional[List[str]] = None,
+        direction: str = "outgoing",
+        max_depth: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find a shortest chain of relations between two entities.
+        
+        Backends should override this with a native traversal; the default
+        implementation runs a breadth-first search over get_relations().
+        
+        Args:
+            from_entity_id: ID of the first entity
+            to_entity_id: ID of the last entity
+            relation_types: Relation types to follow (all if None)
+            direction: "outgoing", "incoming", or "both"
+            max_depth: Maximum path length in hops
+            
+        Returns:
+            Entity dictionaries along the path from start to end, or an
+            empty list if no path exists
+        """
+        if await self.get_entity(from_entity_id) is None or await self.get_entity(to_entity_id) is None:
+            return []
+        
+        parents: Dict[str, Optional[str]] = {from_entity_id: None}
+        frontier = [from_entity_id]
+        depth = 0
+        while frontier and to_entity_id not in parents:
+            if max_depth is not None and depth >= max_depth:
+                return []
+            depth += 1
+            next_frontier = []
+            for entity_id in frontier:
+                for neighbor_id in await self._related_ids(entity_id, relation_types, direction):
+                    if neighbor_id not in parents:
+                        parents[neighbor_id] = entity_id
+                        next_frontier.append(neighbor_id)
+            frontier = next_frontier
+        
+        if to_entity_id not in parents:
+            return []
+        path = []
+        node: Optional[str] = to_entity_id
+        while node is not None:
+            path.append(await self.get_entity(node))
+            node = parents[node]
+        return path[::-1]
+    
+    async def _related_ids(
+        self,
+        entity_id: str,
+        relation_types: Optional[List[str]],
+        direction: str
+    ) -> List[str]:
+        """Get the IDs of entities one relation away, via get_relations()."""
+        neighbor_ids = []
+        for relation in await self.get_relations(entity_id, direction=direction):
+            if relation_types is None or relation["type"] in relation_types:
+                neighbor_id = relation["to_id"] if relation["from_id"] == entity_id else relation["from_id"]
+                neighbor_ids.append(neighbor_id)
+        return neighbor_ids
\ No newline at end of file
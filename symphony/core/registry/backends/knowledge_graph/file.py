@@ -3,17 +3,32 @@
 import os
 import json
 import asyncio
-from typing import List, Dict, Any, Optional, DefaultDict
+from typing import List, Dict, Any, Iterator, Optional, DefaultDict
 from collections import defaultdict
 
-from symphony.core.registry.backends.knowledge_graph.base import KnowledgeGraphBackend
+from symphony.core.registry.backends.knowledge_graph.base import (
+    KnowledgeGraphBackend,
+    gc_paused,
+    validate_bulk_entities,
+    validate_bulk_relations
+)
+from symphony.core.registry.backends.knowledge_graph.graph_queries import AdjacencyQueryMixin
+from symphony.core.registry.backends.knowledge_graph.log import RecordLog
 
 
-class FileKnowledgeGraph(KnowledgeGraphBackend):
+class FileKnowledgeGraph(AdjacencyQueryMixin, KnowledgeGraphBackend):
     """File-based implementation of knowledge graph.
     
-    Stores entities and relationships as JSON files on disk. This implementation
-    is suitable for development and small-scale applications where persistence is required.
+    Supports two storage modes:
+    
+    - "log": every change is appended to a single JSON-lines log, which is
+      periodically compacted into a snapshot. Startup replays the snapshot
+      plus the log tail.
+    - "files": each entity and relation is a pretty-printed JSON file
+      (the original layout, kept for existing data directories).
+    
+    This implementation is suitable for development and small-scale
+    applications where persistence is required.
     """
     
     class Provider:
@@ -24,7 +39,8 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             """Create a new FileKnowledgeGraph instance.
             
             Args:
-                config: Configuration dictionary, must contain "path" key
+                config: Configuration dictionary, must contain "path" key and
+                    may contain "storage", "compact_threshold" and "fsync"
                 
             Returns:
                 A new FileKnowledgeGraph instance
@@ -35,18 +51,45 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             if not config or "path" not in config:
                 raise ValueError("FileKnowledgeGraph requires 'path' in configuration")
             
-            return FileKnowledgeGraph(config["path"])
+            return FileKnowledgeGraph(
+                config["path"],
+                storage=config.get("storage"),
+                compact_threshold=config.get("compact_threshold", 10000),
+                fsync=config.get("fsync", False)
+            )
     
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        storage: Optional[str] = None,
+        compact_threshold: int = 10000,
+        fsync: bool = False
+    ):
         """Initialize file-based knowledge graph.
         
         Args:
             path: Path to directory for storing graph files
+            storage: "log" or "files"; by default directories that already
+                use the per-file layout keep it and everything else uses "log"
+            compact_threshold: Log records after which the log is compacted
+                into a new snapshot ("log" storage only)
+            fsync: Whether to fsync every log append ("log" storage only)
+            
+        Raises:
+            ValueError: If storage is not "log" or "files"
         """
         self.path = path
         self.entities_path = os.path.join(path, "entities")
         self.relations_path = os.path.join(path, "relations")
         
+        if storage is None:
+            storage = "files" if os.path.isdir(self.entities_path) else "log"
+        if storage not in ("log", "files"):
+            raise ValueError(f"Unknown FileKnowledgeGraph storage mode: {storage}")
+        self.storage = storage
+        self.compact_threshold = compact_threshold
+        self.log = RecordLog(os.path.join(path, "log"), fsync=fsync) if storage == "log" else None
+        
         # In-memory cache
         self.entities: Dict[str, Dict[str, Any]] = {}
         self.outgoing: DefaultDict[str, Dict[str, Dict[str, Dict[str, Any]]]] = defaultdict(
@@ -66,8 +109,11 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             config: Configuration dictionary (path is already set in constructor)
         """
         # Create directories if they don't exist
-        os.makedirs(self.entities_path, exist_ok=True)
-        os.makedirs(self.relations_path, exist_ok=True)
+        if self.log:
+            os.makedirs(self.log.path, exist_ok=True)
+        else:
+            os.makedirs(self.entities_path, exist_ok=True)
+            os.makedirs(self.relations_path, exist_ok=True)
     
     async def connect(self) -> None:
         """Connect to the storage backend.
@@ -81,6 +127,9 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
     
     async def disconnect(self) -> None:
         """Disconnect from the storage backend."""
+        if self.log:
+            self.log.close()
+        
         # Clear in-memory cache
         self.entities.clear()
         self.outgoing.clear()
@@ -93,12 +142,15 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         Returns:
             True if directories exist and are writable
         """
-        if not os.path.exists(self.entities_path) or not os.path.exists(self.relations_path):
+        data_path = self.log.path if self.log else self.entities_path
+        if not os.path.exists(data_path):
+            return False
+        if not self.log and not os.path.exists(self.relations_path):
             return False
         
         # Check if directories are writable
         try:
-            test_file = os.path.join(self.entities_path, "healthcheck")
+            test_file = os.path.join(data_path, "healthcheck")
             with open(test_file, "w") as f:
                 f.write("ok")
             os.remove(test_file)
@@ -114,6 +166,11 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             self.outgoing.clear()
             self.incoming.clear()
             
+            if self.log:
+                for record in self.log.replay():
+                    self._apply_record(record)
+                return
+            
             # Load entities
             if os.path.exists(self.entities_path):
                 for filename in os.listdir(self.entities_path):
@@ -157,6 +214,53 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
                         # Skip files that can't be loaded
                         continue
     
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """Apply a replayed log record to the in-memory graph."""
+        op = record["op"]
+        if op == "entity":
+            self.entities[record["id"]] = {
+                "id": record["id"],
+                "type": record["type"],
+                "properties": record["properties"]
+            }
+        elif op == "delete_entity":
+            self.entities.pop(record["id"], None)
+        elif op == "relation":
+            self.outgoing[record["from_id"]][record["to_id"]][record["type"]] = record["properties"]
+            self.incoming[record["to_id"]][record["from_id"]][record["type"]] = record["properties"]
+        elif op == "delete_relation":
+            self._remove_relation(record["from_id"], record["to_id"], record["type"])
+    
+    def _snapshot_records(self) -> Iterator[Dict[str, Any]]:
+        """Records that rebuild the current graph when replayed."""
+        for entity in self.entities.values():
+            yield {"op": "entity", **entity}
+        for from_id, targets in self.outgoing.items():
+            for to_id, rel_dict in targets.items():
+                for rel_type, props in rel_dict.items():
+                    yield {
+                        "op": "relation",
+                        "from_id": from_id,
+                        "to_id": to_id,
+                        "type": rel_type,
+                        "properties": props
+                    }
+    
+    def _append(self, *records: Dict[str, Any]) -> None:
+        """Append records to the log, compacting once it grows too long."""
+        self.log.append_many(records)
+        if self.log.records_since_snapshot >= self.compact_threshold:
+            self.log.compact(self._snapshot_records())
+    
+    async def compact(self) -> None:
+        """Compact the log into a new snapshot ("log" storage only)."""
+        if not self.log:
+            return
+        if not self.loaded:
+            await self.connect()
+        async with self._lock:
+            self.log.compact(self._snapshot_records())
+    
     def _get_entity_path(self, entity_id: str) -> str:
         """Get file path for entity."""
         return os.path.join(self.entities_path, f"{entity_id}.json")
@@ -194,10 +298,12 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         self.entities[entity_id] = entity
         
         # Save to disk
-        file_path = self._get_entity_path(entity_id)
         async with self._lock:
-            with open(file_path, "w") as f:
-                json.dump(entity, f, indent=2)
+            if self.log:
+                self._append({"op": "entity", **entity})
+            else:
+                with open(self._get_entity_path(entity_id), "w") as f:
+                    json.dump(entity, f, indent=2)
     
     async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get an entity by ID.
@@ -216,6 +322,10 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         if entity_id in self.entities:
             return self.entities[entity_id]
         
+        # The log is fully replayed at connect time
+        if self.log:
+            return None
+        
         # Try to load from disk
         file_path = self._get_entity_path(entity_id)
         if not os.path.exists(file_path):
@@ -258,10 +368,12 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         entity["properties"].update(properties)
         
         # Save to disk
-        file_path = self._get_entity_path(entity_id)
         async with self._lock:
-            with open(file_path, "w") as f:
-                json.dump(entity, f, indent=2)
+            if self.log:
+                self._append({"op": "entity", **entity})
+            else:
+                with open(self._get_entity_path(entity_id), "w") as f:
+                    json.dump(entity, f, indent=2)
         
         return True
     
@@ -279,17 +391,23 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             await self.connect()
         
         # Check if entity exists
-        if entity_id not in self.entities and not os.path.exists(self._get_entity_path(entity_id)):
+        if entity_id not in self.entities and (
+            self.log or not os.path.exists(self._get_entity_path(entity_id))
+        ):
             return False
         
         # Remove entity from memory
         if entity_id in self.entities:
             del self.entities[entity_id]
         
-        # Remove entity file
-        file_path = self._get_entity_path(entity_id)
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Remove entity file or log its deletion
+        if self.log:
+            async with self._lock:
+                self._append({"op": "delete_entity", "id": entity_id})
+        else:
+            file_path = self._get_entity_path(entity_id)
+            if os.path.exists(file_path):
+                os.remove(file_path)
         
         # Get all relations involving this entity
         relations_to_delete = []
@@ -353,10 +471,97 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         self.incoming[to_entity_id][from_entity_id][relation_type] = relation_props
         
         # Save to disk
-        file_path = self._get_relation_path(from_entity_id, to_entity_id, relation_type)
         async with self._lock:
-            with open(file_path, "w") as f:
-                json.dump(relation, f, indent=2)
+            if self.log:
+                self._append({"op": "relation", **relation})
+            else:
+                file_path = self._get_relation_path(from_entity_id, to_entity_id, relation_type)
+                with open(file_path, "w") as f:
+                    json.dump(relation, f, indent=2)
+    
+    async def add_entities_bulk(self, entities: List[Dict[str, Any]]) -> None:
+        """Add many entities at once.
+        
+        The batch is written under a single lock acquisition; with "log"
+        storage it is one append (and at most one fsync).
+        
+        Args:
+            entities: Entity dictionaries with "id", "type" and optional
+                "properties" keys
+            
+        Raises:
+            ValueError: If an entity dictionary has no "id" or "type"
+        """
+        # Ensure data is loaded
+        if not self.loaded:
+            await self.connect()
+        
+        validate_bulk_entities(entities)
+        
+        async with self._lock:
+            with gc_paused():
+                batch = [
+                    {
+                        "id": entity["id"],
+                        "type": entity["type"],
+                        "properties": entity.get("properties") or {}
+                    }
+                    for entity in entities
+                ]
+                for entity in batch:
+                    self.entities[entity["id"]] = entity
+            
+            if self.log:
+                self._append(*({"op": "entity", **entity} for entity in batch))
+            else:
+                for entity in batch:
+                    with open(self._get_entity_path(entity["id"]), "w") as f:
+                        json.dump(entity, f, indent=2)
+    
+    async def add_relations_bulk(self, relations: List[Dict[str, Any]]) -> None:
+        """Add many relations at once.
+        
+        The whole batch is validated before any relation is stored, then
+        written under a single lock acquisition; with "log" storage it is
+        one append (and at most one fsync).
+        
+        Args:
+            relations: Relation dictionaries with "from_id", "to_id", "type"
+                and optional "properties" keys
+            
+        Raises:
+            ValueError: If a relation dictionary is incomplete or refers to an
+                entity that does not exist
+        """
+        # Ensure data is loaded
+        if not self.loaded:
+            await self.connect()
+        
+        validate_bulk_relations(relations, self.entities)
+        
+        async with self._lock:
+            outgoing, incoming = self.outgoing, self.incoming
+            with gc_paused():
+                batch = [
+                    {
+                        "from_id": relation["from_id"],
+                        "to_id": relation["to_id"],
+                        "type": relation["type"],
+                        "properties": relation.get("properties") or {}
+                    }
+                    for relation in relations
+                ]
+                for relation in batch:
+                    outgoing[relation["from_id"]][relation["to_id"]][relation["type"]] = relation["properties"]
+                    incoming[relation["to_id"]][relation["from_id"]][relation["type"]] = relation["properties"]
+            
+            if self.log:
+                self._append(*({"op": "relation", **relation} for relation in batch))
+            else:
+                for relation in batch:
+                    file_path = self._get_relation_path(relation["from_id"], relation["to_id"], relation["type"])
+                    with open(file_path, "w") as f:
+                        json.dump(relation, f, indent=2)
     
     async def get_relations(
         self, 
@@ -429,26 +634,47 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
         if not self.loaded:
             await self.connect()
         
-        # Check if relation exists
+        # Remove relation from memory
+        removed = self._remove_relation(from_entity_id, to_entity_id, relation_type)
+        
+        if self.log:
+            if removed:
+                async with self._lock:
+                    self._append({
+                        "op": "delete_relation",
+                        "from_id": from_entity_id,
+                        "to_id": to_entity_id,
+                        "type": relation_type
+                    })
+            return removed
+        
+        # Remove relation file
         file_path = self._get_relation_path(from_entity_id, to_entity_id, relation_type)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            return True
+        
+        return removed
+    
+    def _remove_relation(self, from_entity_id: str, to_entity_id: str, relation_type: str) -> bool:
+        """Remove a relation from the in-memory indexes.
         
+        Returns:
+            True if the relation was present
+        """
         if (from_entity_id not in self.outgoing or
                 to_entity_id not in self.outgoing[from_entity_id] or
-                relation_type not in self.outgoing[from_entity_id][to_entity_id]) and not os.path.exists(file_path):
+                relation_type not in self.outgoing[from_entity_id][to_entity_id]):
             return False
         
-        # Remove relation from memory
-        if (from_entity_id in self.outgoing and 
-                to_entity_id in self.outgoing[from_entity_id] and
-                relation_type in self.outgoing[from_entity_id][to_entity_id]):
-            del self.outgoing[from_entity_id][to_entity_id][relation_type]
-            
-            # Clean up empty dictionaries
-            if not self.outgoing[from_entity_id][to_entity_id]:
-                del self.outgoing[from_entity_id][to_entity_id]
-            
-            if not self.outgoing[from_entity_id]:
-                del self.outgoing[from_entity_id]
+        del self.outgoing[from_entity_id][to_entity_id][relation_type]
+        
+        # Clean up empty dictionaries
+        if not self.outgoing[from_entity_id][to_entity_id]:
+            del self.outgoing[from_entity_id][to_entity_id]
+        
+        if not self.outgoing[from_entity_id]:
+            del self.outgoing[from_entity_id]
         
         if (to_entity_id in self.incoming and 
                 from_entity_id in self.incoming[to_entity_id] and
@@ -462,62 +688,9 @@ class FileKnowledgeGraph(KnowledgeGraphBackend):
             if not self.incoming[to_entity_id]:
                 del self.incoming[to_entity_id]
         
-        # Remove relation file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        
         return True
     
-    async def query(
-        self, 
-        start_entity_id: str,
-        relation_path: List[str],
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Query for entities connected through a path of relations.
-        
-        Args:
-            start_entity_id: ID of the starting entity
-            relation_path: List of relation types to traverse
-            limit: Maximum number of results
-            
-        Returns:
-            List of entity dictionaries matching the query
-        """
-        # Ensure data is loaded
+    async def _ensure_loaded(self) -> None:
+        """Load the graph from disk if it has not been loaded yet."""
         if not self.loaded:
             await self.connect()
-        
-        if not relation_path:
-            # Return starting entity if it exists
-            entity = await self.get_entity(start_entity_id)
-            return [entity] if entity else []
-        
-        # Start with the initial entity
-        current_entities = [start_entity_id]
-        
-        # Traverse the path
-        for relation_type in relation_path:
-            next_entities = []
-            
-            for entity_id in current_entities:
-                # Get all outgoing relations of the specified type
-                for to_id, rel_dict in self.outgoing.get(entity_id, {}).items():
-                    if relation_type in rel_dict:
-                        next_entities.append(to_id)
-            
-            # Update current entities for next iteration
-            current_entities = next_entities
-            
-            # Stop early if no entities found
-            if not current_entities:
-                return []
-        
-        # Fetch entity details for result entities
-        result = []
-        for entity_id in current_entities[:limit]:
-            entity = await self.get_entity(entity_id)
-            if entity:
-                result.append(entity)
-        
-        return result
\ No newline at end of file
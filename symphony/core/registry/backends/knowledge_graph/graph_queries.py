@@ -0,0 +1,113 @@
+"""Graph queries shared by the adjacency-map knowledge graph backends."""
+
+from typing import List, Dict, Any, Optional, Union
+
+from symphony.core.registry.backends.knowledge_graph.traversal import GraphTraversal, Hop
+
+
+class AdjacencyQueryMixin:
+    """Native query, neighborhood and shortest-path over adjacency maps.
+    
+    Classes using this mixin keep an ``entities`` dictionary keyed by id and
+    the ``outgoing``/``incoming`` adjacency maps described in traversal.py.
+    List it before ``KnowledgeGraphBackend`` so these methods replace the
+    generic get_relations() walks defined there.
+    """
+    
+    async def _ensure_loaded(self) -> None:
+        """Make sure the adjacency maps are populated before a query."""
+        pass
+    
+    async def query(
+        self, 
+        start_entity_id: str,
+        relation_path: List[Union[str, Dict[str, Any]]],
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Query for entities connected through a path of relations.
+        
+        Frontiers are deduplicated at every hop and the walk stops as soon
+        as ``limit`` entities are found at the end of the path.
+        
+        Args:
+            start_entity_id: ID of the starting entity
+            relation_path: List of hops to traverse; each is a relation type
+                (followed outgoing) or a hop dictionary (see traversal.Hop)
+            limit: Maximum number of results
+            
+        Returns:
+            List of entity dictionaries matching the query
+            
+        Raises:
+            ValueError: If a hop specification is invalid
+        """
+        await self._ensure_loaded()
+        
+        if not relation_path:
+            # Return starting entity if it exists
+            entity = self.entities.get(start_entity_id)
+            return [entity] if entity else []
+        
+        hops = [Hop.coerce(spec) for spec in relation_path]
+        entity_ids = self._traversal().follow(start_entity_id, hops, limit)
+        return [self.entities[entity_id] for entity_id in entity_ids]
+    
+    async def neighborhood(
+        self,
+        start_entity_id: str,
+        max_depth: int = 1,
+        relation_types: Optional[List[str]] = None,
+        direction: str = "outgoing",
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the entities within a bounded number of hops, breadth-first.
+        
+        Args:
+            start_entity_id: ID of the starting entity
+            max_depth: Maximum number of hops from the start
+            relation_types: Relation types to follow (all if None)
+            direction: "outgoing", "incoming", or "both"
+            limit: Maximum number of results, including the start entity
+            
+        Returns:
+            Entity dictionaries with an added "depth" key, nearest first
+        """
+        await self._ensure_loaded()
+        
+        hop = Hop(relation_types, direction)
+        return [
+            {**self.entities[entity_id], "depth": depth}
+            for entity_id, depth in self._traversal().bfs(start_entity_id, max_depth, hop, limit)
+        ]
+    
+    async def shortest_path(
+        self,
+        from_entity_id: str,
+        to_entity_id: str,
+        relation_types: Optional[List[str]] = None,
+        direction: str = "outgoing",
+        max_depth: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find a shortest chain of relations between two entities.
+        
+        Args:
+            from_entity_id: ID of the first entity
+            to_entity_id: ID of the last entity
+            relation_types: Relation types to follow (all if None)
+            direction: "outgoing", "incoming", or "both"
+            max_depth: Maximum path length in hops
+            
+        Returns:
+            Entity dictionaries along the path from start to end, or an
+            empty list if no path exists
+        """
+        await self._ensure_loaded()
+        
+        path = self._traversal().shortest_path(
+            from_entity_id, to_entity_id, Hop(relation_types, direction), max_depth
+        )
+        return [self.entities[entity_id] for entity_id in path or []]
+    
+    def _traversal(self) -> GraphTraversal:
+        """Traversal engine over the adjacency maps."""
+        return GraphTraversal(self.entities, self.outgoing, self.incoming)
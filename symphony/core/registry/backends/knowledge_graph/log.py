@@ -0,0 +1,145 @@
+"""Append-only record log with snapshot compaction for file-backed graphs."""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+
+# Shared compact encoder; json.dumps(..., separators=...) builds a new one per call
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class RecordLog:
+    """Append-only JSON-lines log of graph records plus a compacted snapshot.
+
+    The directory holds ``snapshot.jsonl`` and ``log-<generation>.jsonl``
+    files. The snapshot's first line is a header naming the log generation
+    and byte offset it covers up to, so startup replays only the snapshot
+    and the log tail after that offset. ``compact()`` writes a new snapshot
+    of the live records and starts a new, empty log generation.
+
+    A torn record at the end of the log (from a crash mid-write) is
+    discarded on replay.
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        """Initialize the log.
+
+        Args:
+            path: Directory holding the snapshot and log files
+            fsync: Whether to fsync after every appended record
+        """
+        self.path = path
+        self.fsync = fsync
+        self.generation = 0
+        self.records_since_snapshot = 0
+        self._file = None
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"log-{generation:06d}.jsonl")
+
+    def exists(self) -> bool:
+        """Whether the directory already holds a snapshot or log."""
+        return os.path.isdir(self.path) and any(
+            name == SNAPSHOT_FILE or name.startswith("log-") for name in os.listdir(self.path)
+        )
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield the snapshot records, then the log records after it.
+
+        The log is opened for appending once replay finishes.
+        """
+        self.close()
+        os.makedirs(self.path, exist_ok=True)
+        self.generation = 0
+        offset = 0
+
+        snapshot_path = os.path.join(self.path, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                self.generation = header["log_generation"]
+                offset = header["log_offset"]
+                for line in f:
+                    yield json.loads(line)
+
+        log_path = self._log_path(self.generation)
+        self.records_since_snapshot = 0
+        if os.path.exists(log_path):
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                good_offset = offset
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    good_offset += len(line)
+                    self.records_since_snapshot += 1
+                    yield record
+            if good_offset < os.path.getsize(log_path):
+                os.truncate(log_path, good_offset)
+
+        self._remove_stale_logs()
+        self._file = open(log_path, "a", encoding="utf-8")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record to the log."""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append several records with a single write (and fsync)."""
+        lines = [_encode(record) + "\n" for record in records]
+        if not lines:
+            return
+        if self._file is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._file = open(self._log_path(self.generation), "a", encoding="utf-8")
+        self._file.write("".join(lines))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.records_since_snapshot += len(lines)
+
+    def compact(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the snapshot with the given live records and rotate the log.
+
+        The new snapshot is written to a temp file and renamed into place,
+        so a crash leaves either the old snapshot and log or the new ones.
+
+        Args:
+            records: Records that rebuild the current state when replayed
+        """
+        os.makedirs(self.path, exist_ok=True)
+        next_generation = self.generation + 1
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".snapshot-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"log_generation": next_generation, "log_offset": 0}) + "\n")
+            for record in records:
+                f.write(_encode(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.close()
+        os.replace(tmp_path, os.path.join(self.path, SNAPSHOT_FILE))
+        self.generation = next_generation
+        self.records_since_snapshot = 0
+        self._remove_stale_logs()
+        self._file = open(self._log_path(self.generation), "a", encoding="utf-8")
+
+    def _remove_stale_logs(self) -> None:
+        """Delete logs and temp files not referenced by the snapshot."""
+        current = os.path.basename(self._log_path(self.generation))
+        for name in os.listdir(self.path):
+            if (name.startswith("log-") and name != current) or name.startswith(".snapshot-"):
+                os.remove(os.path.join(self.path, name))
+
+    def close(self) -> None:
+        """Close the append handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
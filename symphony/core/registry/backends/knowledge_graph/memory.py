@@ -3,10 +3,16 @@
 from typing import List, Dict, Any, Optional, DefaultDict
 from collections import defaultdict
 
-from symphony.core.registry.backends.knowledge_graph.base import KnowledgeGraphBackend
+from symphony.core.registry.backends.knowledge_graph.base import (
+    KnowledgeGraphBackend,
+    gc_paused,
+    validate_bulk_entities,
+    validate_bulk_relations
+)
+from symphony.core.registry.backends.knowledge_graph.graph_queries import AdjacencyQueryMixin
 
 
-class InMemoryKnowledgeGraph(KnowledgeGraphBackend):
+class InMemoryKnowledgeGraph(AdjacencyQueryMixin, KnowledgeGraphBackend):
     """In-memory implementation of knowledge graph.
     
     Stores entities and relationships in memory. This implementation is
@@ -181,6 +187,44 @@ class InMemoryKnowledgeGraph(KnowledgeGraphBackend):
         self.outgoing[from_entity_id][to_entity_id][relation_type] = relation_props
         self.incoming[to_entity_id][from_entity_id][relation_type] = relation_props
     
+    async def add_entities_bulk(self, entities: List[Dict[str, Any]]) -> None:
+        """Add many entities at once.
+        
+        Args:
+            entities: Entity dictionaries with "id", "type" and optional
+                "properties" keys
+            
+        Raises:
+            ValueError: If an entity dictionary has no "id" or "type"
+        """
+        with gc_paused():
+            for entity in validate_bulk_entities(entities):
+                self.entities[entity["id"]] = {
+                    "id": entity["id"],
+                    "type": entity["type"],
+                    "properties": entity.get("properties") or {}
+                }
+    
+    async def add_relations_bulk(self, relations: List[Dict[str, Any]]) -> None:
+        """Add many relations at once.
+        
+        The whole batch is validated before any relation is stored.
+        
+        Args:
+            relations: Relation dictionaries with "from_id", "to_id", "type"
+                and optional "properties" keys
+            
+        Raises:
+            ValueError: If a relation dictionary is incomplete or refers to an
+                entity that does not exist
+        """
+        outgoing, incoming = self.outgoing, self.incoming
+        with gc_paused():
+            for relation in validate_bulk_relations(relations, self.entities):
+                relation_props = relation.get("properties") or {}
+                outgoing[relation["from_id"]][relation["to_id"]][relation["type"]] = relation_props
+                incoming[relation["to_id"]][relation["from_id"]][relation["type"]] = relation_props
+    
     async def get_relations(
         self, 
         entity_id: str, 
@@ -268,53 +312,3 @@ class InMemoryKnowledgeGraph(KnowledgeGraphBackend):
             del self.incoming[to_entity_id]
         
         return True
-    
-    async def query(
-        self, 
-        start_entity_id: str,
-        relation_path: List[str],
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Query for entities connected through a path of relations.
-        
-        Args:
-            start_entity_id: ID of the starting entity
-            relation_path: List of relation types to traverse
-            limit: Maximum number of results
-            
-        Returns:
-            List of entity dictionaries matching the query
-        """
-        if not relation_path:
-            # Return starting entity if it exists
-            entity = await self.get_entity(start_entity_id)
-            return [entity] if entity else []
-        
-        # Start with the initial entity
-        current_entities = [start_entity_id]
-        
-        # Traverse the path
-        for relation_type in relation_path:
-            next_entities = []
-            
-            for entity_id in current_entities:
-                # Get all outgoing relations of the specified type
-                for to_id, rel_dict in self.outgoing.get(entity_id, {}).items():
-                    if relation_type in rel_dict:
-                        next_entities.append(to_id)
-            
-            # Update current entities for next iteration
-            current_entities = next_entities
-            
-            # Stop early if no entities found
-            if not current_entities:
-                return []
-        
-        # Fetch entity details for result entities
-        result = []
-        for entity_id in current_entities[:limit]:
-            entity = await self.get_entity(entity_id)
-            if entity:
-                result.append(entity)
-        
-        return result
\ No newline at end of file
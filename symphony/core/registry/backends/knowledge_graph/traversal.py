@@ -0,0 +1,317 @@
+"""Set-based multi-hop traversal over in-memory knowledge graph adjacency."""
+
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+)
+
+# {from_id: {to_id: {relation_type: properties}}}, as kept by the in-memory
+# and file backends (and the mirrored {to_id: {from_id: ...}} incoming map)
+Adjacency = Mapping[str, Mapping[str, Mapping[str, Dict[str, Any]]]]
+
+DIRECTIONS = ("outgoing", "incoming", "both")
+REVERSED = {"outgoing": "incoming", "incoming": "outgoing", "both": "both"}
+
+
+class Hop:
+    """One step of a relation path with its direction and predicates.
+
+    A hop follows every relation that has one of the given types (any type
+    if None), runs in the given direction, has all of ``properties`` (by
+    equality) and satisfies ``where``. ``entity_type`` additionally
+    restricts the entities the hop lands on.
+    """
+
+    def __init__(
+        self,
+        relation_type: Union[None, str, Iterable[str]] = None,
+        direction: str = "outgoing",
+        properties: Optional[Dict[str, Any]] = None,
+        entity_type: Optional[str] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ):
+        """Initialize the hop.
+
+        Args:
+            relation_type: Relation type or types to follow (None for any)
+            direction: "outgoing", "incoming", or "both"
+            properties: Relation properties that must be equal
+            entity_type: Required type of the entity reached
+            where: Predicate called with the relation dictionary (same
+                format as ``get_relations``)
+
+        Raises:
+            ValueError: If the direction is not recognized
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown traversal direction: {direction}")
+        if isinstance(relation_type, str):
+            relation_type = [relation_type]
+        self.relation_types = frozenset(relation_type) if relation_type is not None else None
+        self.direction = direction
+        self.properties = properties or {}
+        self.entity_type = entity_type
+        self.where = where
+
+    @classmethod
+    def coerce(cls, spec: Union[str, Dict[str, Any], "Hop"]) -> "Hop":
+        """Build a hop from a relation type, a hop dictionary or a hop.
+
+        Dictionaries use the constructor argument names, with "type"
+        accepted for ``relation_type``.
+
+        Raises:
+            ValueError: If the spec cannot be turned into a hop
+        """
+        if isinstance(spec, Hop):
+            return spec
+        if isinstance(spec, str):
+            return cls(spec)
+        if isinstance(spec, dict):
+            options = dict(spec)
+            if "type" in options:
+                options["relation_type"] = options.pop("type")
+            try:
+                return cls(**options)
+            except TypeError as e:
+                raise ValueError(f"Invalid hop specification {spec!r}: {e}")
+        raise ValueError(f"Invalid hop specification: {spec!r}")
+
+    def reversed(self) -> "Hop":
+        """The same hop walked against its direction."""
+        return Hop(self.relation_types, REVERSED[self.direction], self.properties, None, self.where)
+
+    def matches(self, from_id: str, to_id: str, relation_type: str, properties: Dict[str, Any]) -> bool:
+        """Check whether a single relation can be followed."""
+        if self.relation_types is not None and relation_type not in self.relation_types:
+            return False
+        if any(properties.get(key) != value for key, value in self.properties.items()):
+            return False
+        if self.where is not None:
+            return bool(self.where({
+                "from_id": from_id,
+                "to_id": to_id,
+                "type": relation_type,
+                "properties": properties
+            }))
+        return True
+
+
+class GraphTraversal:
+    """Traversal engine over an entity map and its adjacency maps.
+
+    Frontiers are sets, so an entity reached along several paths is
+    expanded once per hop and branching paths grow with the number of
+    distinct entities rather than the number of paths. Results keep the
+    order in which entities were first reached.
+    """
+
+    def __init__(
+        self,
+        entities: Mapping[str, Dict[str, Any]],
+        outgoing: Adjacency,
+        incoming: Adjacency
+    ):
+        """Initialize the engine.
+
+        Args:
+            entities: {entity_id: entity dictionary}
+            outgoing: {from_id: {to_id: {relation_type: properties}}}
+            incoming: {to_id: {from_id: {relation_type: properties}}}
+        """
+        self.entities = entities
+        self.outgoing = outgoing
+        self.incoming = incoming
+
+    def neighbors(self, entity_id: str, hop: Hop) -> Iterator[str]:
+        """Yield the entities one hop away (possibly more than once)."""
+        if hop.direction in ("outgoing", "both"):
+            for to_id, relations in self.outgoing.get(entity_id, {}).items():
+                if self._can_follow(entity_id, to_id, to_id, relations, hop):
+                    yield to_id
+        if hop.direction in ("incoming", "both"):
+            for from_id, relations in self.incoming.get(entity_id, {}).items():
+                if self._can_follow(from_id, entity_id, from_id, relations, hop):
+                    yield from_id
+
+    def _can_follow(
+        self,
+        from_id: str,
+        to_id: str,
+        target: str,
+        relations: Mapping[str, Dict[str, Any]],
+        hop: Hop
+    ) -> bool:
+        if hop.entity_type is not None:
+            entity = self.entities.get(target)
+            if entity is None or entity.get("type") != hop.entity_type:
+                return False
+        if hop.relation_types is not None and not hop.properties and hop.where is None:
+            return not hop.relation_types.isdisjoint(relations)
+        return any(
+            hop.matches(from_id, to_id, relation_type, properties)
+            for relation_type, properties in relations.items()
+        )
+
+    def follow(self, start_id: str, hops: List[Hop], limit: Optional[int] = None) -> List[str]:
+        """Walk a relation path and return the distinct entities at its end.
+
+        Args:
+            start_id: ID of the starting entity
+            hops: The hops to take in order
+            limit: Stop once this many end entities are found
+
+        Returns:
+            Entity IDs in the order they were reached
+        """
+        if start_id not in self.entities:
+            return []
+
+        frontier = [start_id]
+        for depth, hop in enumerate(hops):
+            last = depth == len(hops) - 1
+            seen: Set[str] = set()
+            next_frontier = []
+            for entity_id in frontier:
+                for neighbor in self.neighbors(entity_id, hop):
+                    if neighbor in seen or neighbor not in self.entities:
+                        continue
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+                    if last and limit and len(next_frontier) >= limit:
+                        return next_frontier
+            if not next_frontier:
+                return []
+            frontier = next_frontier
+
+        return frontier[:limit] if limit else frontier
+
+    def bfs(
+        self,
+        start_id: str,
+        max_depth: int,
+        hop: Optional[Hop] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Breadth-first search up to a bounded depth.
+
+        Args:
+            start_id: ID of the starting entity (returned at depth 0)
+            max_depth: Maximum number of hops from the start
+            hop: Hop followed at every level (any outgoing relation if None)
+            limit: Maximum number of entities to return
+
+        Returns:
+            (entity_id, depth) pairs in breadth-first order
+        """
+        if start_id not in self.entities:
+            return []
+
+        hop = hop or Hop()
+        visited = {start_id}
+        result = [(start_id, 0)]
+        frontier = [start_id]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for entity_id in frontier:
+                for neighbor in self.neighbors(entity_id, hop):
+                    if neighbor in visited or neighbor not in self.entities:
+                        continue
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+                    result.append((neighbor, depth))
+                    if limit and len(result) >= limit:
+                        return result
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return result
+
+    def shortest_path(
+        self,
+        start_id: str,
+        end_id: str,
+        hop: Optional[Hop] = None,
+        max_depth: Optional[int] = None
+    ) -> Optional[List[str]]:
+        """Find a shortest path with a bidirectional breadth-first search.
+
+        Each round expands whichever side has the smaller frontier by one
+        full level, so on hub-heavy graphs neither search has to reach the
+        hubs' whole neighbourhoods before the two meet.
+
+        Args:
+            start_id: ID of the first entity
+            end_id: ID of the last entity
+            hop: Hop followed at every step (any outgoing relation if None)
+            max_depth: Maximum path length in hops
+
+        Returns:
+            Entity IDs from start to end, or None if no path exists
+        """
+        if start_id not in self.entities or end_id not in self.entities:
+            return None
+        if start_id == end_id:
+            return [start_id]
+
+        forward_hop = hop or Hop()
+        backward_hop = forward_hop.reversed()
+        forward_parents: Dict[str, Optional[str]] = {start_id: None}
+        backward_parents: Dict[str, Optional[str]] = {end_id: None}
+        forward_frontier = [start_id]
+        backward_frontier = [end_id]
+        length = 0
+
+        while forward_frontier and backward_frontier:
+            if max_depth is not None and length >= max_depth:
+                return None
+            length += 1
+
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self._expand(
+                    forward_frontier, forward_hop, forward_parents, backward_parents
+                )
+            else:
+                # Entities the backward search expands are hop targets on the
+                # path, so the hop's entity type applies to them
+                backward_frontier, meeting = self._expand(
+                    backward_frontier, backward_hop, backward_parents, forward_parents,
+                    forward_hop.entity_type
+                )
+
+            if meeting is not None:
+                path = []
+                node: Optional[str] = meeting
+                while node is not None:
+                    path.append(node)
+                    node = forward_parents[node]
+                path.reverse()
+                node = backward_parents[meeting]
+                while node is not None:
+                    path.append(node)
+                    node = backward_parents[node]
+                return path
+
+        return None
+
+    def _expand(
+        self,
+        frontier: List[str],
+        hop: Hop,
+        parents: Dict[str, Optional[str]],
+        other_parents: Dict[str, Optional[str]],
+        entity_type: Optional[str] = None
+    ) -> Tuple[List[str], Optional[str]]:
+        """Expand one BFS level, stopping at the first entity seen from the other side."""
+        next_frontier = []
+        for entity_id in frontier:
+            entity = self.entities.get(entity_id)
+            if entity is None or (entity_type is not None and entity.get("type") != entity_type):
+                continue
+            for neighbor in self.neighbors(entity_id, hop):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = entity_id
+                if neighbor in other_parents:
+                    return next_frontier, neighbor
+                next_frontier.append(neighbor)
+        return next_frontier, None
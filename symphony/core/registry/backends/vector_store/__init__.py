@@ -7,6 +7,8 @@ used for embedding storage and similarity search.
 from symphony.core.registry.backends.vector_store.base import VectorStoreBackend
 from symphony.core.registry.backends.vector_store.memory import InMemoryVectorStore
 from symphony.core.registry.backends.vector_store.file import FileVectorStore
+from symphony.core.registry.backends.vector_store.ivf import IVFVectorStore
+from symphony.core.registry.backends.vector_store.metadata_index import MetadataIndex
 
 # Register built-in providers
 from symphony.core.registry.backends.base import BackendType, StorageBackendFactory
@@ -24,8 +26,16 @@ StorageBackendFactory.register_provider(
     FileVectorStore.Provider
 )
 
+StorageBackendFactory.register_provider(
+    BackendType.VECTOR_STORE, 
+    "ivf", 
+    IVFVectorStore.Provider
+)
+
 __all__ = [
     'VectorStoreBackend',
     'InMemoryVectorStore',
     'FileVectorStore',
+    'IVFVectorStore',
+    'MetadataIndex',
 ]
\ No newline at end of file
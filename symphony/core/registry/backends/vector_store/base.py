@@ -58,7 +58,8 @@ class VectorStoreBackend(StorageBackend, Generic[T]):
         self, 
         query_vector: List[float], 
         limit: int = 10,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors.
         
@@ -66,12 +67,39 @@ class VectorStoreBackend(StorageBackend, Generic[T]):
             query_vector: The query embedding vector
             limit: Maximum number of results to return
             metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
             
         Returns:
             List of dictionaries containing vector data and similarity scores
         """
         pass
     
+    async def search_many(
+        self, 
+        query_vectors: List[List[float]], 
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for vectors similar to each of several query vectors.
+        
+        Backends should override this to score all queries in one pass;
+        the default implementation runs one search per query.
+        
+        Args:
+            query_vectors: The query embedding vectors
+            limit: Maximum number of results to return per query
+            metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
+            
+        Returns:
+            One result list per query, in the same format as search()
+        """
+        return [
+            await self.search(query_vector, limit, metadata_filter, include_vectors)
+            for query_vector in query_vectors
+        ]
+    
     @abstractmethod
     async def count(self) -> int:
         """Get the number of vectors in the store.
@@ -4,16 +4,31 @@ import os
 import json
 import numpy as np
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from symphony.core.registry.backends.vector_store.base import VectorStoreBackend
+from symphony.core.registry.backends.vector_store.matrix_search import MatrixSearchMixin
+from symphony.core.registry.backends.vector_store.metadata_index import MetadataIndex
+from symphony.core.registry.backends.vector_store.packed import PackedVectorFiles
+from symphony.memory.vector_index import VectorIndex, normalize_rows
 
 
-class FileVectorStore(VectorStoreBackend):
+class FileVectorStore(VectorStoreBackend, MatrixSearchMixin):
     """File-based implementation of vector store.
     
-    Stores vectors as JSON files on disk. This implementation is suitable
-    for development and small-scale applications where persistence is required.
+    Supports two storage modes:
+    
+    - "packed": vectors are appended to fixed-width float32 segment files
+      that are memory-mapped on load, with separate id and metadata files.
+      Deletes write tombstones, and segments are compacted in the
+      background once too many rows are dead.
+    - "files": each vector is a JSON file (the original layout, kept for
+      existing data directories).
+    
+    Loaded vectors are also kept normalized in a contiguous matrix, so a
+    search is a single matrix product followed by a partial top-k selection.
+    This implementation is suitable for development and small-scale
+    applications where persistence is required.
     """
     
     class Provider:
@@ -24,7 +39,9 @@ class FileVectorStore(VectorStoreBackend):
             """Create a new FileVectorStore instance.
             
             Args:
-                config: Configuration dictionary, must contain "path" key
+                config: Configuration dictionary, must contain "path" key and
+                    may contain "storage", "segment_size", "compaction_ratio"
+                    and "indexed_metadata_keys"
                 
             Returns:
                 A new FileVectorStore instance
@@ -35,20 +52,58 @@ class FileVectorStore(VectorStoreBackend):
             if not config or "path" not in config:
                 raise ValueError("FileVectorStore requires 'path' in configuration")
             
-            return FileVectorStore(config["path"])
+            return FileVectorStore(
+                config["path"],
+                storage=config.get("storage"),
+                segment_size=config.get("segment_size", 65536),
+                compaction_ratio=config.get("compaction_ratio", 0.3),
+                metadata_index=MetadataIndex(config.get("indexed_metadata_keys"))
+            )
     
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        storage: Optional[str] = None,
+        segment_size: int = 65536,
+        compaction_ratio: float = 0.3,
+        metadata_index: Optional[MetadataIndex] = None
+    ):
         """Initialize file-based vector store.
         
         Args:
             path: Path to directory for storing vector files
+            storage: "packed" or "files"; by default directories that already
+                use the per-file layout keep it and everything else is packed
+            segment_size: Maximum rows per packed segment
+            compaction_ratio: Fraction of dead rows that triggers a background
+                compaction ("packed" storage only)
+            metadata_index: Inverted index used for metadata filters
+                (defaults to a MetadataIndex over every key)
+            
+        Raises:
+            ValueError: If storage is not "packed" or "files"
         """
         self.path = path
         self.vectors_path = os.path.join(path, "vectors")
         self.vectors_loaded = False
         self.vectors: Dict[str, np.ndarray] = {}
         self.metadata: Dict[str, Dict[str, Any]] = {}
+        self._index = VectorIndex()
+        self._metadata_index = metadata_index if metadata_index is not None else MetadataIndex()
         self._lock = asyncio.Lock()
+        
+        if storage is None:
+            storage = "files" if os.path.isdir(self.vectors_path) else "packed"
+        if storage not in ("packed", "files"):
+            raise ValueError(f"Unknown FileVectorStore storage mode: {storage}")
+        self.storage = storage
+        self.compaction_ratio = compaction_ratio
+        self.packed = (
+            PackedVectorFiles(os.path.join(path, "packed"), segment_size)
+            if storage == "packed" else None
+        )
+        self._locations: Dict[str, Tuple[str, int]] = {}
+        self._compaction_task: Optional[asyncio.Task] = None
     
     async def initialize(self, config: Dict[str, Any]) -> None:
         """Initialize the backend with configuration.
@@ -56,7 +111,7 @@ class FileVectorStore(VectorStoreBackend):
         Args:
             config: Configuration dictionary (path is already set in constructor)
         """
-        os.makedirs(self.vectors_path, exist_ok=True)
+        os.makedirs(self.packed.path if self.packed else self.vectors_path, exist_ok=True)
     
     async def connect(self) -> None:
         """Connect to the storage backend.
@@ -70,9 +125,16 @@ class FileVectorStore(VectorStoreBackend):
     
     async def disconnect(self) -> None:
         """Disconnect from the storage backend."""
-        # We don't need to do anything specific here
+        if self._compaction_task is not None:
+            await self._compaction_task
+            self._compaction_task = None
+        if self.packed:
+            self.packed.close()
+        
         self.vectors.clear()
         self.metadata.clear()
+        self._index.clear()
+        self._metadata_index.clear()
         self.vectors_loaded = False
     
     async def health_check(self) -> bool:
@@ -81,12 +143,13 @@ class FileVectorStore(VectorStoreBackend):
         Returns:
             True if vectors directory exists and is writable
         """
-        if not os.path.exists(self.vectors_path):
+        data_path = self.packed.path if self.packed else self.vectors_path
+        if not os.path.exists(data_path):
             return False
         
         # Check if directory is writable
         try:
-            test_file = os.path.join(self.vectors_path, "healthcheck")
+            test_file = os.path.join(data_path, "healthcheck")
             with open(test_file, "w") as f:
                 f.write("ok")
             os.remove(test_file)
@@ -100,6 +163,16 @@ class FileVectorStore(VectorStoreBackend):
             # Clear existing data
             self.vectors.clear()
             self.metadata.clear()
+            self._index.clear()
+            
+            if self.packed:
+                self._locations = {}
+                for id, vector, metadata, location in self.packed.load():
+                    self.vectors[id] = vector
+                    self.metadata[id] = metadata
+                    self._locations[id] = location
+                self._build_index()
+                return
             
             # List all files in vectors directory
             if not os.path.exists(self.vectors_path):
@@ -121,6 +194,21 @@ class FileVectorStore(VectorStoreBackend):
                 except Exception:
                     # Skip files that can't be loaded
                     continue
+            
+            self._build_index()
+    
+    def _build_index(self) -> None:
+        """Build the search matrix and metadata index from the loaded vectors."""
+        self._metadata_index.clear()
+        for id, metadata in self.metadata.items():
+            self._metadata_index.add(id, metadata)
+        
+        if not self.vectors:
+            self._index = VectorIndex()
+            return
+        ids = list(self.vectors.keys())
+        matrix = normalize_rows(np.stack([self.vectors[id] for id in ids]))
+        self._index = VectorIndex.from_matrix(ids, matrix, copy=False)
     
     async def _save_vector(self, id: str) -> None:
         """Save a vector to disk.
@@ -131,6 +219,15 @@ class FileVectorStore(VectorStoreBackend):
         if id not in self.vectors:
             return
         
+        if self.packed:
+            async with self._lock:
+                old_location = self._locations.pop(id, None)
+                if old_location:
+                    self.packed.add_tombstone(old_location)
+                self._locations[id] = self.packed.append(id, self.vectors[id], self.metadata.get(id, {}))
+            self._maybe_compact()
+            return
+        
         file_path = os.path.join(self.vectors_path, f"{id}.json")
         
         async with self._lock:
@@ -148,13 +245,22 @@ class FileVectorStore(VectorStoreBackend):
             id: Unique identifier for the vector
             vector: The embedding vector
             metadata: Optional metadata to store with the vector
+            
+        Raises:
+            ValueError: If the vector dimension does not match the store
         """
+        # Packed rows must be loaded before appending so overwrites are tombstoned
+        if self.packed and not self.vectors_loaded:
+            await self.connect()
+        
         # Store in memory
-        self.vectors[id] = np.array(vector, dtype=np.float32)
-        if metadata:
-            self.metadata[id] = metadata
-        else:
-            self.metadata[id] = {}
+        vector_np = np.array(vector, dtype=np.float32)
+        self._index.add(id, vector_np)
+        self.vectors[id] = vector_np
+        if id in self.metadata:
+            self._metadata_index.remove(id, self.metadata[id])
+        self.metadata[id] = dict(metadata) if metadata else {}
+        self._metadata_index.add(id, self.metadata[id])
         
         # Save to disk
         await self._save_vector(id)
@@ -176,6 +282,13 @@ class FileVectorStore(VectorStoreBackend):
                 "metadata": self.metadata.get(id, {})
             }
         
+        # Packed segments are fully loaded at connect time
+        if self.packed:
+            if self.vectors_loaded:
+                return None
+            await self.connect()
+            return await self.get(id)
+        
         # Try to load from disk
         file_path = os.path.join(self.vectors_path, f"{id}.json")
         if not os.path.exists(file_path):
@@ -188,6 +301,8 @@ class FileVectorStore(VectorStoreBackend):
             # Cache in memory
             self.vectors[id] = np.array(data["vector"], dtype=np.float32)
             self.metadata[id] = data.get("metadata", {})
+            self._index.add(id, self.vectors[id])
+            self._metadata_index.add(id, self.metadata[id])
             
             return data
         except Exception:
@@ -204,12 +319,25 @@ class FileVectorStore(VectorStoreBackend):
         """
         file_path = os.path.join(self.vectors_path, f"{id}.json")
         
+        if self.packed and not self.vectors_loaded:
+            await self.connect()
+        
         # Remove from memory
         found = id in self.vectors
         if found:
             del self.vectors[id]
             if id in self.metadata:
-                del self.metadata[id]
+                self._metadata_index.remove(id, self.metadata.pop(id))
+            self._index.remove(id)
+        
+        # Tombstone the packed row
+        if self.packed:
+            async with self._lock:
+                location = self._locations.pop(id, None)
+                if location:
+                    self.packed.add_tombstone(location)
+            self._maybe_compact()
+            return found
         
         # Remove from disk
         if os.path.exists(file_path):
@@ -222,7 +350,8 @@ class FileVectorStore(VectorStoreBackend):
         self, 
         query_vector: List[float], 
         limit: int = 10,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors.
         
@@ -230,6 +359,7 @@ class FileVectorStore(VectorStoreBackend):
             query_vector: The query embedding vector
             limit: Maximum number of results to return
             metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
             
         Returns:
             List of dictionaries containing vector data and similarity scores
@@ -241,46 +371,60 @@ class FileVectorStore(VectorStoreBackend):
         if not self.vectors:
             return []
         
-        query_np = np.array(query_vector, dtype=np.float32)
-        
-        # Filter by metadata if provided
-        ids_to_search = []
-        if metadata_filter:
-            for id, meta in self.metadata.items():
-                match = True
-                for key, value in metadata_filter.items():
-                    if meta.get(key) != value:
-                        match = False
-                        break
-                if match:
-                    ids_to_search.append(id)
-        else:
-            ids_to_search = list(self.vectors.keys())
-        
-        if not ids_to_search:
-            return []
+        return self._search_matrix([query_vector], limit, metadata_filter, include_vectors)[0]
+    
+    async def search_many(
+        self, 
+        query_vectors: List[List[float]], 
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for vectors similar to each of several query vectors.
         
-        # Calculate cosine similarity
-        results = []
-        for id in ids_to_search:
-            vector = self.vectors[id]
-            # Normalize vectors for cosine similarity
-            norm_query = query_np / np.linalg.norm(query_np)
-            norm_vector = vector / np.linalg.norm(vector)
-            # Calculate cosine similarity
-            similarity = np.dot(norm_query, norm_vector)
-            results.append({
-                "id": id,
-                "similarity": float(similarity),
-                "vector": vector.tolist(),
-                "metadata": self.metadata.get(id, {})
-            })
+        All queries are scored against the candidate vectors in one
+        (Q x N) matrix product.
+        
+        Args:
+            query_vectors: The query embedding vectors
+            limit: Maximum number of results to return per query
+            metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
+            
+        Returns:
+            One result list per query, in the same format as search()
+        """
+        # Ensure vectors are loaded
+        if not self.vectors_loaded:
+            await self.connect()
         
-        # Sort by similarity (highest first)
-        results.sort(key=lambda x: x["similarity"], reverse=True)
+        if not self.vectors or not query_vectors:
+            return [[] for _ in query_vectors]
         
-        # Limit results
-        return results[:limit]
+        return self._search_matrix(query_vectors, limit, metadata_filter, include_vectors)
+    
+    def _maybe_compact(self) -> None:
+        """Start a background compaction if enough packed rows are dead."""
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        if self.packed.tombstone_count > self.compaction_ratio * self.packed.total_rows:
+            self._compaction_task = asyncio.get_running_loop().create_task(self.compact())
+    
+    async def compact(self) -> None:
+        """Rewrite the live packed rows into a single segment ("packed" storage only).
+        
+        The files are written in a worker thread while adds and deletes wait.
+        """
+        if not self.packed:
+            return
+        async with self._lock:
+            # A delete drops the vector before it waits for the lock to
+            # tombstone the row, so its id can still be listed here
+            rows = [
+                (id, self.vectors[id], self.metadata.get(id, {}))
+                for id in self._locations if id in self.vectors
+            ]
+            self._locations = await asyncio.to_thread(self.packed.compact, rows)
     
     async def count(self) -> int:
         """Get the number of vectors in the store.
@@ -0,0 +1,448 @@
+"""Approximate nearest-neighbour implementation of the VectorStore backend."""
+
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from symphony.core.registry.backends.vector_store.base import VectorStoreBackend
+from symphony.core.registry.backends.vector_store.metadata_index import MetadataIndex
+from symphony.memory.vector_index import VectorIndex, normalize_rows, top_k_indices
+
+
+class IVFVectorStore(VectorStoreBackend):
+    """In-memory inverted-file (IVF) vector store for approximate search.
+
+    Vectors are partitioned into ``n_lists`` clusters by a spherical k-means
+    coarse quantizer. A search scores the query against the centroids and
+    only scans the ``nprobe`` closest lists, trading recall for latency.
+    Until ``train_size`` vectors have been added the store keeps a single
+    list and searches exactly.
+
+    Filtered searches only score the vectors the metadata index matches.
+    They scan the ``nprobe`` closest lists and then keep widening to the
+    next closest lists until ``limit`` matching vectors have been scored,
+    so a selective filter still returns up to ``limit`` hits.
+    """
+
+    class Provider:
+        """Provider for creating IVFVectorStore instances."""
+
+        @staticmethod
+        def create_backend(config: Dict[str, Any] = None) -> 'IVFVectorStore':
+            """Create a new IVFVectorStore instance.
+
+            Args:
+                config: Optional configuration with "n_lists", "nprobe",
+                    "train_size", "kmeans_iterations", "seed" and
+                    "indexed_metadata_keys" keys
+
+            Returns:
+                A new IVFVectorStore instance
+            """
+            config = config or {}
+            return IVFVectorStore(
+                n_lists=config.get("n_lists"),
+                nprobe=config.get("nprobe", 8),
+                train_size=config.get("train_size", 1024),
+                kmeans_iterations=config.get("kmeans_iterations", 10),
+                seed=config.get("seed", 0),
+                metadata_index=MetadataIndex(config.get("indexed_metadata_keys"))
+            )
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        train_size: int = 1024,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        metadata_index: Optional[MetadataIndex] = None
+    ):
+        """Initialize the IVF vector store.
+
+        Args:
+            n_lists: Number of inverted lists (defaults to sqrt of the
+                vector count at training time)
+            nprobe: Number of lists scanned per query (higher means better
+                recall and slower search)
+            train_size: Vector count at which the quantizer is first trained
+            kmeans_iterations: Number of k-means iterations when training
+            seed: Random seed for k-means initialization
+            metadata_index: Inverted index used for metadata filters
+                (defaults to a MetadataIndex over every key)
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self.vectors: Dict[str, np.ndarray] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[VectorIndex] = [VectorIndex()]
+        self._assignments: Dict[str, int] = {}
+        self._metadata_index = metadata_index if metadata_index is not None else MetadataIndex()
+
+    async def initialize(self, config: Dict[str, Any]) -> None:
+        """Initialize the backend with configuration.
+
+        Args:
+            config: Configuration dictionary (already applied by the provider)
+        """
+        pass
+
+    async def connect(self) -> None:
+        """Connect to the storage backend."""
+        pass  # No connection needed for in-memory store
+
+    async def disconnect(self) -> None:
+        """Disconnect from the storage backend."""
+        self.vectors.clear()
+        self.metadata.clear()
+        self.centroids = None
+        self._lists = [VectorIndex()]
+        self._assignments.clear()
+        self._metadata_index.clear()
+
+    async def health_check(self) -> bool:
+        """Check if the backend is healthy.
+
+        Returns:
+            Always True for in-memory store
+        """
+        return True
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self.centroids is not None
+
+    async def add(self, id: str, vector: List[float], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Add a vector to the store.
+
+        The vector is assigned to the list of its nearest centroid. The
+        quantizer is trained automatically once ``train_size`` vectors exist.
+
+        Args:
+            id: Unique identifier for the vector
+            vector: The embedding vector
+            metadata: Optional metadata to store with the vector
+        """
+        if id in self._assignments:
+            self._lists[self._assignments.pop(id)].remove(id)
+
+        vector_np = np.array(vector, dtype=np.float32)
+        self.vectors[id] = vector_np
+        if id in self.metadata:
+            self._metadata_index.remove(id, self.metadata[id])
+        self.metadata[id] = dict(metadata) if metadata else {}
+        self._metadata_index.add(id, self.metadata[id])
+
+        list_no = 0
+        if self.centroids is not None:
+            list_no = int(np.argmax(self.centroids @ normalize_rows(vector_np)))
+        self._lists[list_no].add(id, vector_np)
+        self._assignments[id] = list_no
+
+        if self.centroids is None and len(self.vectors) >= self.train_size:
+            self.train()
+
+    async def get(self, id: str) -> Optional[Dict[str, Any]]:
+        """Get a vector by ID.
+
+        Args:
+            id: Unique identifier for the vector
+
+        Returns:
+            Dictionary containing the vector and metadata, or None if not found
+        """
+        if id not in self.vectors:
+            return None
+
+        return {
+            "id": id,
+            "vector": self.vectors[id].tolist(),
+            "metadata": self.metadata.get(id, {})
+        }
+
+    async def delete(self, id: str) -> bool:
+        """Delete a vector from the store.
+
+        Args:
+            id: Unique identifier for the vector
+
+        Returns:
+            True if deleted, False if not found
+        """
+        if id not in self.vectors:
+            return False
+
+        self._lists[self._assignments.pop(id)].remove(id)
+        del self.vectors[id]
+        self._metadata_index.remove(id, self.metadata.pop(id))
+        return True
+
+    def train(self, n_lists: Optional[int] = None) -> None:
+        """Train (or retrain) the coarse quantizer and rebuild the lists.
+
+        Call this again after large distribution shifts; incremental adds
+        only assign new vectors to the existing centroids.
+
+        Args:
+            n_lists: Number of lists to use (defaults to the configured value
+                or sqrt of the current vector count)
+        """
+        if not self.vectors:
+            return
+
+        ids = list(self.vectors.keys())
+        data = normalize_rows(np.stack([self.vectors[id] for id in ids]))
+        n_lists = n_lists or self.n_lists or int(np.sqrt(len(ids)))
+        n_lists = max(1, min(n_lists, len(ids)))
+
+        self.centroids = self._kmeans(data, n_lists)
+        assignments = self._assign(data, self.centroids)
+
+        self._lists = [VectorIndex(dimension=data.shape[1]) for _ in range(n_lists)]
+        self._assignments = {}
+        for id, list_no in zip(ids, assignments):
+            self._lists[list_no].add(id, self.vectors[id])
+            self._assignments[id] = int(list_no)
+
+    def _kmeans(self, data: np.ndarray, n_lists: int, points_per_list: int = 256) -> np.ndarray:
+        """Run spherical k-means on a sample and return normalized centroids."""
+        rng = np.random.default_rng(self.seed)
+        if data.shape[0] > n_lists * points_per_list:
+            data = data[rng.choice(data.shape[0], n_lists * points_per_list, replace=False)]
+        centroids = data[rng.choice(data.shape[0], n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = self._assign(data, centroids)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=n_lists)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+            sums = data[rng.choice(data.shape[0], n_lists)]  # re-seeds empty clusters
+            non_empty = counts > 0
+            sums[non_empty] = np.add.reduceat(data[order], starts[non_empty], axis=0)
+            centroids = normalize_rows(sums)
+
+        return centroids
+
+    @staticmethod
+    def _assign(data: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Assign each normalized row to its nearest centroid."""
+        labels = np.empty(data.shape[0], dtype=np.int64)
+        for start in range(0, data.shape[0], chunk_size):
+            chunk = data[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(chunk @ centroids.T, axis=1)
+        return labels
+
+    def _probe(self, query: np.ndarray, nprobe: Optional[int]) -> List[int]:
+        """Get the lists to scan for a normalized query."""
+        if self.centroids is None:
+            return [0]
+
+        nprobe = max(1, min(nprobe or self.nprobe, len(self._lists)))
+        return top_k_indices(self.centroids @ query, nprobe).tolist()
+
+    def _search_normalized(
+        self,
+        query: np.ndarray,
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        nprobe: Optional[int],
+        include_vectors: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Search the probed lists for a normalized query vector."""
+        if metadata_filter:
+            return self._search_filtered(query, limit, metadata_filter, nprobe, include_vectors)
+
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+        for list_no in self._probe(query, nprobe):
+            inverted_list = self._lists[list_no]
+            if len(inverted_list):
+                ids.extend(inverted_list.ids)
+                scores.append(inverted_list.matrix @ query)
+
+        if not ids:
+            return []
+
+        return self._hits(ids, np.concatenate(scores), limit, include_vectors)
+
+    def _search_filtered(
+        self,
+        query: np.ndarray,
+        limit: int,
+        metadata_filter: Dict[str, Any],
+        nprobe: Optional[int],
+        include_vectors: bool
+    ) -> List[Dict[str, Any]]:
+        """Search the vectors matching a metadata filter.
+
+        Lists are scanned from the closest centroid outwards: the first
+        ``nprobe`` lists always, then further lists until ``limit``
+        matching vectors have been scored.
+        """
+        rows_by_list: Dict[int, List[int]] = defaultdict(list)
+        for id in self._metadata_index.filter(metadata_filter, self.metadata):
+            list_no = self._assignments[id]
+            rows_by_list[list_no].append(self._lists[list_no].row(id))
+
+        if not rows_by_list:
+            return []
+
+        if self.centroids is None:
+            order = [0]
+        else:
+            order = np.argsort(-(self.centroids @ query), kind="stable").tolist()
+        nprobe = max(1, nprobe or self.nprobe)
+
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+        for probed, list_no in enumerate(order):
+            if probed >= nprobe and len(ids) >= limit:
+                break
+            rows = rows_by_list.get(list_no)
+            if rows:
+                rows.sort()
+                inverted_list = self._lists[list_no]
+                ids.extend(inverted_list.ids[row] for row in rows)
+                scores.append(inverted_list.matrix[rows] @ query)
+
+        return self._hits(ids, np.concatenate(scores), limit, include_vectors)
+
+    def _hits(
+        self,
+        ids: List[str],
+        all_scores: np.ndarray,
+        limit: int,
+        include_vectors: bool
+    ) -> List[Dict[str, Any]]:
+        """Build the top ``limit`` results from scored ids."""
+        results = []
+        for i in top_k_indices(all_scores, limit):
+            hit = {"id": ids[i], "similarity": float(all_scores[i])}
+            if include_vectors:
+                hit["vector"] = self.vectors[ids[i]].tolist()
+            hit["metadata"] = self.metadata.get(ids[i], {})
+            results.append(hit)
+        return results
+
+    async def search(
+        self,
+        query_vector: List[float],
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True,
+        *,
+        nprobe: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for approximately most similar vectors.
+
+        Args:
+            query_vector: The query embedding vector
+            limit: Maximum number of results to return
+            metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
+            nprobe: Number of lists to scan (defaults to the store setting)
+
+        Returns:
+            List of dictionaries containing vector data and similarity scores
+        """
+        if not self.vectors:
+            return []
+
+        query = normalize_rows(np.asarray(query_vector, dtype=np.float32))
+        return self._search_normalized(query, limit, metadata_filter, nprobe, include_vectors)
+
+    async def search_many(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True,
+        *,
+        nprobe: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for vectors similar to each of several query vectors.
+
+        Args:
+            query_vectors: The query embedding vectors
+            limit: Maximum number of results to return per query
+            metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
+            nprobe: Number of lists to scan (defaults to the store setting)
+
+        Returns:
+            One result list per query, in the same format as search()
+        """
+        if not self.vectors or not query_vectors:
+            return [[] for _ in query_vectors]
+
+        queries = normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+        return [
+            self._search_normalized(query, limit, metadata_filter, nprobe, include_vectors)
+            for query in queries
+        ]
+
+    async def count(self) -> int:
+        """Get the number of vectors in the store.
+
+        Returns:
+            Number of vectors
+        """
+        return len(self.vectors)
+
+    async def recall_report(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        nprobe_values: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Measure recall and latency against an exact brute-force search.
+
+        Args:
+            query_vectors: Sample query vectors
+            limit: Number of neighbours compared per query (recall@limit)
+            nprobe_values: nprobe settings to evaluate (defaults to the
+                current setting and a full scan)
+
+        Returns:
+            One dictionary per nprobe value with "nprobe", "recall" and
+            "mean_latency_ms" keys
+        """
+        if not self.vectors or not query_vectors:
+            return []
+
+        ids = list(self.vectors.keys())
+        data = normalize_rows(np.stack([self.vectors[id] for id in ids]))
+        queries = normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+        exact = [
+            {ids[i] for i in top_k_indices(row, limit)}
+            for row in queries @ data.T
+        ]
+
+        if nprobe_values is None:
+            nprobe_values = sorted({self.nprobe, len(self._lists)})
+
+        report = []
+        for nprobe in nprobe_values:
+            hits = 0
+            expected = 0
+            start = time.perf_counter()
+            for query, exact_ids in zip(queries, exact):
+                found = self._search_normalized(query, limit, None, nprobe)
+                hits += len(exact_ids.intersection(result["id"] for result in found))
+                expected += len(exact_ids)
+            elapsed = time.perf_counter() - start
+            report.append({
+                "nprobe": nprobe,
+                "recall": hits / expected if expected else 1.0,
+                "mean_latency_ms": elapsed * 1000 / len(queries)
+            })
+
+        return report
@@ -0,0 +1,68 @@
+"""Matrix search shared by the exact vector store backends."""
+
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+from symphony.memory.vector_index import normalize_rows, top_k_indices
+
+
+class MatrixSearchMixin:
+    """Exact search over a normalized matrix of every stored vector.
+    
+    Classes using this mixin keep ``vectors`` and ``metadata`` dictionaries
+    keyed by id, a ``VectorIndex`` in ``_index`` and a ``MetadataIndex``
+    in ``_metadata_index``.
+    """
+    
+    def _search_matrix(
+        self,
+        query_vectors: List[List[float]],
+        limit: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        include_vectors: bool
+    ) -> List[List[Dict[str, Any]]]:
+        """Score queries against the normalized matrix and build the hits.
+        
+        Only the top ``limit`` rows of each query are converted to results.
+        """
+        if metadata_filter:
+            # Only the rows matching the filter are scored
+            rows = sorted(self._index.row(id) for id in self._filter_ids(metadata_filter))
+            if not rows:
+                return [[] for _ in query_vectors]
+            ids = [self._index.ids[row] for row in rows]
+            matrix = self._index.matrix[rows]
+        else:
+            ids = self._index.ids
+            matrix = self._index.matrix
+        
+        queries = normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+        scores = queries @ matrix.T
+        
+        results = []
+        for row in scores:
+            hits = []
+            for i in top_k_indices(row, limit):
+                hit = {"id": ids[i], "similarity": float(row[i])}
+                if include_vectors:
+                    hit["vector"] = self.vectors[ids[i]].tolist()
+                hit["metadata"] = self.metadata.get(ids[i], {})
+                hits.append(hit)
+            results.append(hits)
+        
+        return results
+    
+    def _filter_ids(self, metadata_filter: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Get the ids whose metadata matches every key in the filter.
+        
+        Args:
+            metadata_filter: Optional filter on metadata fields, with
+                equality or {"$in": [...]} conditions
+            
+        Returns:
+            List of matching vector ids (all ids if no filter is given)
+        """
+        if not metadata_filter:
+            return list(self.vectors.keys())
+        
+        return self._metadata_index.filter(metadata_filter, self.metadata)
@@ -4,12 +4,17 @@ import numpy as np
 from typing import List, Dict, Any, Optional
 
 from symphony.core.registry.backends.vector_store.base import VectorStoreBackend
+from symphony.core.registry.backends.vector_store.matrix_search import MatrixSearchMixin
+from symphony.core.registry.backends.vector_store.metadata_index import MetadataIndex
+from symphony.memory.vector_index import VectorIndex
 
 
-class InMemoryVectorStore(VectorStoreBackend):
+class InMemoryVectorStore(VectorStoreBackend, MatrixSearchMixin):
     """In-memory implementation of vector store.
     
     Stores vectors in memory using numpy arrays for efficient similarity search.
+    A normalized copy of every vector is kept in a contiguous matrix, so a
+    search is a single matrix product followed by a partial top-k selection.
     This implementation is suitable for testing and small-scale applications.
     """
     
@@ -21,17 +26,28 @@ class InMemoryVectorStore(VectorStoreBackend):
             """Create a new InMemoryVectorStore instance.
             
             Args:
-                config: Optional configuration (ignored for memory store)
+                config: Optional configuration with an "indexed_metadata_keys"
+                    list restricting which metadata keys are indexed
                 
             Returns:
                 A new InMemoryVectorStore instance
             """
-            return InMemoryVectorStore()
+            config = config or {}
+            return InMemoryVectorStore(
+                metadata_index=MetadataIndex(config.get("indexed_metadata_keys"))
+            )
     
-    def __init__(self):
-        """Initialize in-memory vector store."""
+    def __init__(self, metadata_index: Optional[MetadataIndex] = None):
+        """Initialize in-memory vector store.
+        
+        Args:
+            metadata_index: Inverted index used for metadata filters
+                (defaults to a MetadataIndex over every key)
+        """
         self.vectors: Dict[str, np.ndarray] = {}
         self.metadata: Dict[str, Dict[str, Any]] = {}
+        self._index = VectorIndex()
+        self._metadata_index = metadata_index if metadata_index is not None else MetadataIndex()
     
     async def initialize(self, config: Dict[str, Any]) -> None:
         """Initialize the backend with configuration.
@@ -49,6 +65,8 @@ class InMemoryVectorStore(VectorStoreBackend):
         """Disconnect from the storage backend."""
         self.vectors.clear()
         self.metadata.clear()
+        self._index.clear()
+        self._metadata_index.clear()
     
     async def health_check(self) -> bool:
         """Check if the backend is healthy.
@@ -65,12 +83,17 @@ class InMemoryVectorStore(VectorStoreBackend):
             id: Unique identifier for the vector
             vector: The embedding vector
             metadata: Optional metadata to store with the vector
+            
+        Raises:
+            ValueError: If the vector dimension does not match the store
         """
-        self.vectors[id] = np.array(vector, dtype=np.float32)
-        if metadata:
-            self.metadata[id] = metadata
-        else:
-            self.metadata[id] = {}
+        vector_np = np.array(vector, dtype=np.float32)
+        self._index.add(id, vector_np)
+        self.vectors[id] = vector_np
+        if id in self.metadata:
+            self._metadata_index.remove(id, self.metadata[id])
+        self.metadata[id] = dict(metadata) if metadata else {}
+        self._metadata_index.add(id, self.metadata[id])
     
     async def get(self, id: str) -> Optional[Dict[str, Any]]:
         """Get a vector by ID.
@@ -104,7 +127,8 @@ class InMemoryVectorStore(VectorStoreBackend):
         
         del self.vectors[id]
         if id in self.metadata:
-            del self.metadata[id]
+            self._metadata_index.remove(id, self.metadata.pop(id))
+        self._index.remove(id)
         
         return True
     
@@ -112,7 +136,8 @@ class InMemoryVectorStore(VectorStoreBackend):
         self, 
         query_vector: List[float], 
         limit: int = 10,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors.
         
@@ -120,6 +145,7 @@ class InMemoryVectorStore(VectorStoreBackend):
             query_vector: The query embedding vector
             limit: Maximum number of results to return
             metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
             
         Returns:
             List of dictionaries containing vector data and similarity scores
@@ -127,46 +153,33 @@ class InMemoryVectorStore(VectorStoreBackend):
         if not self.vectors:
             return []
         
-        query_np = np.array(query_vector, dtype=np.float32)
-        
-        # Filter by metadata if provided
-        ids_to_search = []
-        if metadata_filter:
-            for id, meta in self.metadata.items():
-                match = True
-                for key, value in metadata_filter.items():
-                    if meta.get(key) != value:
-                        match = False
-                        break
-                if match:
-                    ids_to_search.append(id)
-        else:
-            ids_to_search = list(self.vectors.keys())
-        
-        if not ids_to_search:
-            return []
+        return self._search_matrix([query_vector], limit, metadata_filter, include_vectors)[0]
+    
+    async def search_many(
+        self, 
+        query_vectors: List[List[float]], 
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_vectors: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for vectors similar to each of several query vectors.
+        
+        All queries are scored against the candidate vectors in one
+        (Q x N) matrix product.
+        
+        Args:
+            query_vectors: The query embedding vectors
+            limit: Maximum number of results to return per query
+            metadata_filter: Optional filter on metadata fields
+            include_vectors: Whether to return each hit's vector
+            
+        Returns:
+            One result list per query, in the same format as search()
+        """
+        if not self.vectors or not query_vectors:
+            return [[] for _ in query_vectors]
         
-        # Calculate cosine similarity
-        results = []
-        for id in ids_to_search:
-            vector = self.vectors[id]
-            # Normalize vectors for cosine similarity
-            norm_query = query_np / np.linalg.norm(query_np)
-            norm_vector = vector / np.linalg.norm(vector)
-            # Calculate cosine similarity
-            similarity = np.dot(norm_query, norm_vector)
-            results.append({
-                "id": id,
-                "similarity": float(similarity),
-                "vector": vector.tolist(),
-                "metadata": self.metadata.get(id, {})
-            })
-        
-        # Sort by similarity (highest first)
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        
-        # Limit results
-        return results[:limit]
+        return self._search_matrix(query_vectors, limit, metadata_filter, include_vectors)
     
     async def count(self) -> int:
         """Get the number of vectors in the store.
@@ -0,0 +1,136 @@
+"""Inverted index over vector metadata for filtered search."""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+IN_OPERATOR = "$in"
+
+
+def _predicate_values(condition: Any) -> Tuple[bool, List[Any]]:
+    """Split a filter condition into (is_in, accepted values)."""
+    if isinstance(condition, dict) and set(condition) == {IN_OPERATOR}:
+        return True, list(condition[IN_OPERATOR])
+    return False, [condition]
+
+
+def metadata_matches(metadata: Dict[str, Any], metadata_filter: Dict[str, Any]) -> bool:
+    """Check one metadata dict against a filter.
+
+    Each filter entry is either ``key: value`` (equality) or
+    ``key: {"$in": [values]}`` (membership); all entries must match.
+
+    Args:
+        metadata: Metadata of a vector
+        metadata_filter: Filter on metadata fields
+
+    Returns:
+        True if every predicate matches
+    """
+    for key, condition in metadata_filter.items():
+        is_in, values = _predicate_values(condition)
+        value = metadata.get(key)
+        if is_in:
+            if not any(value == accepted for accepted in values):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class MetadataIndex:
+    """Inverted index from (key, value) to the set of ids holding that value.
+
+    Equality and ``$in`` predicates on indexed keys are answered by
+    intersecting id sets, smallest first, so a filtered search only touches
+    the matching ids. Predicates the index cannot answer (keys outside
+    ``keys``, unhashable values or ``None``, which also matches missing
+    keys) are checked against the remaining candidates one by one.
+
+    Stores accept any object with the same ``add``/``remove``/``clear``/
+    ``filter`` methods, so a different index can be plugged in.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]] = None):
+        """Initialize the index.
+
+        Args:
+            keys: Metadata keys to index (None indexes every key)
+        """
+        self.keys = set(keys) if keys is not None else None
+        self._postings: Dict[str, Dict[Any, Set[str]]] = defaultdict(dict)
+
+    def _indexes(self, key: str) -> bool:
+        return self.keys is None or key in self.keys
+
+    def add(self, id: str, metadata: Dict[str, Any]) -> None:
+        """Index the metadata of a new vector.
+
+        Args:
+            id: Vector id (must not currently be indexed)
+            metadata: The vector's metadata
+        """
+        for key, value in metadata.items():
+            if self._indexes(key) and _hashable(value):
+                self._postings[key].setdefault(value, set()).add(id)
+
+    def remove(self, id: str, metadata: Dict[str, Any]) -> None:
+        """Remove a vector indexed with the given metadata."""
+        for key, value in metadata.items():
+            if not self._indexes(key) or not _hashable(value):
+                continue
+            ids = self._postings[key].get(value)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self._postings[key][value]
+
+    def clear(self) -> None:
+        """Remove every posting."""
+        self._postings.clear()
+
+    def filter(
+        self,
+        metadata_filter: Dict[str, Any],
+        metadata: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """Get the ids whose metadata matches every predicate.
+
+        Args:
+            metadata_filter: Filter on metadata fields
+            metadata: Metadata of every stored vector, by id
+
+        Returns:
+            Matching ids
+        """
+        candidates: Optional[Set[str]] = None
+        residual: Dict[str, Any] = {}
+        postings = []
+        for key, condition in metadata_filter.items():
+            is_in, values = _predicate_values(condition)
+            if not self._indexes(key) or not all(_hashable(v) and v is not None for v in values):
+                residual[key] = condition
+                continue
+            index = self._postings.get(key, {})
+            if is_in:
+                postings.append(set().union(*(index.get(value, ()) for value in values)))
+            else:
+                postings.append(index.get(condition, set()))
+
+        for ids in sorted(postings, key=len):
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        if candidates is None:
+            candidates = metadata.keys()
+        if not residual:
+            return list(candidates)
+        return [id for id in candidates if metadata_matches(metadata[id], residual)]
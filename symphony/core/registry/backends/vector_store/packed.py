@@ -0,0 +1,272 @@
+"""Segmented packed on-disk storage for FileVectorStore."""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+TOMBSTONES_FILE = "tombstones.jsonl"
+
+
+class PackedVectorFiles:
+    """Append-only float32 segments with id tables, metadata and tombstones.
+
+    Each segment ``seg-<n>`` is three appendable files: ``.f32`` with the
+    raw rows (memory-mapped with ``np.memmap`` on load), ``.ids`` with one
+    JSON-encoded id per row (the id/row table) and ``.meta`` with one
+    compact JSON metadata object per row. New rows go to the last segment
+    until it holds ``segment_size`` rows.
+
+    Deletes and overwrites never touch segment files; they append the dead
+    (segment, row) to ``tombstones.jsonl``. ``compact()`` rewrites the live
+    rows into a fresh segment and drops the tombstones.
+    """
+
+    def __init__(self, path: str, segment_size: int = 65536):
+        """Initialize the storage.
+
+        Args:
+            path: Directory holding the manifest, segments and tombstones
+            segment_size: Maximum rows per segment
+        """
+        self.path = path
+        self.segment_size = max(1, segment_size)
+        self.dimension: Optional[int] = None
+        self.segments: List[str] = []
+        self.segment_rows: Dict[str, int] = {}
+        self.next_segment = 1
+        self.tombstone_count = 0
+        self._handles: Optional[Tuple[Any, Any, Any]] = None
+
+    def _file(self, segment: str, suffix: str) -> str:
+        return os.path.join(self.path, f"{segment}.{suffix}")
+
+    def exists(self) -> bool:
+        """Whether the directory holds a manifest."""
+        return os.path.exists(os.path.join(self.path, MANIFEST_FILE))
+
+    @property
+    def total_rows(self) -> int:
+        """Rows across all segments, live or dead."""
+        return sum(self.segment_rows.values())
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest."""
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".manifest-")
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "dimension": self.dimension,
+                "segments": self.segments,
+                "next_segment": self.next_segment
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+    def load(self) -> List[Tuple[str, np.ndarray, Dict[str, Any], Tuple[str, int]]]:
+        """Read every live row.
+
+        Rows beyond the shortest of a segment's three files (left by a
+        crash mid-append) are truncated away.
+
+        Returns:
+            List of (id, vector, metadata, (segment, row)); each vector is a
+            read-only view into a memory-mapped segment
+        """
+        self.close()
+        self.segments = []
+        self.segment_rows = {}
+        self.tombstone_count = 0
+        if not self.exists():
+            return []
+
+        with open(os.path.join(self.path, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+        self.dimension = manifest["dimension"]
+        self.segments = manifest["segments"]
+        self.next_segment = manifest["next_segment"]
+
+        dead = set()
+        tombstones_path = os.path.join(self.path, TOMBSTONES_FILE)
+        if os.path.exists(tombstones_path):
+            for _, line in self._read_lines(tombstones_path):
+                segment, row = json.loads(line)
+                dead.add((segment, row))
+        self.tombstone_count = len(dead)
+
+        live: Dict[str, Tuple[np.ndarray, Dict[str, Any], Tuple[str, int]]] = {}
+        for segment in self.segments:
+            ids = self._read_lines(self._file(segment, "ids"))
+            metadata = self._read_lines(self._file(segment, "meta"))
+            vector_rows = 0
+            if self.dimension and os.path.exists(self._file(segment, "f32")):
+                vector_rows = os.path.getsize(self._file(segment, "f32")) // (4 * self.dimension)
+            rows = min(len(ids), len(metadata), vector_rows)
+            self._truncate(segment, rows, ids, metadata)
+            self.segment_rows[segment] = rows
+            if not rows:
+                continue
+
+            # Parse each column with a single json.loads call
+            id_column = json.loads(b"[" + b",".join(line.rstrip(b"\n") for _, line in ids[:rows]) + b"]")
+            meta_column = json.loads(
+                b"[" + b",".join(line.rstrip(b"\n") for _, line in metadata[:rows]) + b"]"
+            )
+            matrix = np.memmap(
+                self._file(segment, "f32"), dtype=np.float32, mode="r", shape=(rows, self.dimension)
+            )
+            for row, id in enumerate(id_column):
+                if (segment, row) not in dead:
+                    live[id] = (matrix[row], meta_column[row], (segment, row))
+
+        return [(id, vector, meta, location) for id, (vector, meta, location) in live.items()]
+
+    @staticmethod
+    def _read_lines(path: str) -> List[Tuple[int, bytes]]:
+        """Read complete lines as (end offset, line) pairs."""
+        if not os.path.exists(path):
+            return []
+        lines = []
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                lines.append((offset, line))
+        return lines
+
+    def _truncate(
+        self,
+        segment: str,
+        rows: int,
+        ids: List[Tuple[int, bytes]],
+        metadata: List[Tuple[int, bytes]]
+    ) -> None:
+        """Cut a segment's files back to ``rows`` complete rows."""
+        for suffix, lines in (("ids", ids), ("meta", metadata)):
+            path = self._file(segment, suffix)
+            size = lines[rows - 1][0] if rows else 0
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+        path = self._file(segment, "f32")
+        size = rows * 4 * (self.dimension or 0)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def append(self, id: str, vector: np.ndarray, metadata: Dict[str, Any]) -> Tuple[str, int]:
+        """Append a row to the active segment.
+
+        Args:
+            id: Vector id
+            vector: float32 vector of the store dimension
+            metadata: JSON-serializable metadata
+
+        Returns:
+            The (segment, row) the vector was written to
+
+        Raises:
+            ValueError: If the vector dimension does not match the store
+        """
+        if self.dimension is None:
+            self.dimension = int(vector.shape[0])
+        elif vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {vector.shape[0]} does not match store dimension {self.dimension}"
+            )
+
+        if not self.segments or self.segment_rows[self.segments[-1]] >= self.segment_size:
+            self._start_segment()
+
+        segment = self.segments[-1]
+        vectors_file, ids_file, meta_file = self._open_handles(segment)
+        vectors_file.write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+        ids_file.write(json.dumps(id) + "\n")
+        meta_file.write(json.dumps(metadata, separators=(",", ":"), default=str) + "\n")
+        for handle in (vectors_file, ids_file, meta_file):
+            handle.flush()
+
+        row = self.segment_rows[segment]
+        self.segment_rows[segment] = row + 1
+        return segment, row
+
+    def _start_segment(self) -> None:
+        self.close()
+        segment = f"seg-{self.next_segment:06d}"
+        self.next_segment += 1
+        self.segments.append(segment)
+        self.segment_rows[segment] = 0
+        self._write_manifest()
+
+    def _open_handles(self, segment: str) -> Tuple[Any, Any, Any]:
+        if self._handles is None:
+            self._handles = (
+                open(self._file(segment, "f32"), "ab"),
+                open(self._file(segment, "ids"), "a", encoding="utf-8"),
+                open(self._file(segment, "meta"), "a", encoding="utf-8")
+            )
+        return self._handles
+
+    def add_tombstone(self, location: Tuple[str, int]) -> None:
+        """Mark a (segment, row) as dead."""
+        with open(os.path.join(self.path, TOMBSTONES_FILE), "a") as f:
+            f.write(json.dumps(list(location)) + "\n")
+        self.tombstone_count += 1
+
+    def compact(
+        self,
+        rows: Iterable[Tuple[str, np.ndarray, Dict[str, Any]]]
+    ) -> Dict[str, Tuple[str, int]]:
+        """Rewrite the given live rows into one new segment.
+
+        The segment is fully written before the manifest is switched to it,
+        so a crash leaves either the old or the new layout.
+
+        Args:
+            rows: (id, vector, metadata) for every live vector
+
+        Returns:
+            New (segment, row) location of each id
+        """
+        self.close()
+        old_segments = list(self.segments)
+        segment = f"seg-{self.next_segment:06d}"
+        self.next_segment += 1
+
+        locations = {}
+        with open(self._file(segment, "f32"), "wb") as vectors_file, \
+                open(self._file(segment, "ids"), "w", encoding="utf-8") as ids_file, \
+                open(self._file(segment, "meta"), "w", encoding="utf-8") as meta_file:
+            for row, (id, vector, metadata) in enumerate(rows):
+                vectors_file.write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+                ids_file.write(json.dumps(id) + "\n")
+                meta_file.write(json.dumps(metadata, separators=(",", ":"), default=str) + "\n")
+                locations[id] = (segment, row)
+            for handle in (vectors_file, ids_file, meta_file):
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        self.segments = [segment]
+        self.segment_rows = {segment: len(locations)}
+        self._write_manifest()
+
+        tombstones_path = os.path.join(self.path, TOMBSTONES_FILE)
+        if os.path.exists(tombstones_path):
+            os.remove(tombstones_path)
+        self.tombstone_count = 0
+        for old in old_segments:
+            for suffix in ("f32", "ids", "meta"):
+                if os.path.exists(self._file(old, suffix)):
+                    os.remove(self._file(old, suffix))
+        return locations
+
+    def close(self) -> None:
+        """Close the append handles of the active segment."""
+        if self._handles is not None:
+            for handle in self._handles:
+                handle.close()
+            self._handles = None
@@ -6,7 +6,8 @@ allowing for checkpointing and resumption of complex workflows.
 
 from .serialization import StateBundle, create_state_bundle, EntityReference
 from .storage import FileStorageProvider, StorageError
-from .checkpoint import CheckpointManager, Checkpoint, CheckpointError
+from .catalog import CheckpointCatalog, CatalogEntry
+from .checkpoint import CheckpointManager, Checkpoint, CheckpointSnapshot, CheckpointError, mark_dirty
 from .restore import RestoreManager, RestorationContext, RestorationError, EntityRestorer, register_entity_restorer
 
 __all__ = [
@@ -15,9 +16,13 @@ __all__ = [
     'EntityReference',
     'FileStorageProvider',
     'StorageError',
+    'CheckpointCatalog',
+    'CatalogEntry',
     'CheckpointManager',
     'Checkpoint',
+    'CheckpointSnapshot',
     'CheckpointError',
+    'mark_dirty',
     'RestoreManager',
     'RestorationContext',
     'RestorationError',
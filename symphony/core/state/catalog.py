@@ -0,0 +1,294 @@
+"""Checkpoint catalog for Symphony.
+
+This module keeps a compact, append-only index of checkpoint metadata so
+that listing checkpoints, finding them by name or workflow and looking up
+the latest one do not have to read every checkpoint manifest.
+"""
+
+import bisect
+import fnmatch
+import json
+from typing import Dict, Any, Optional, List, Set, Tuple
+
+from .storage import FileStorageProvider
+
+CATALOG_KEY = "checkpoints/catalog.jsonl"
+
+WILDCARDS = "*?["
+
+
+class CatalogEntry:
+    """Metadata of one checkpoint as kept in the catalog."""
+
+    def __init__(
+        self,
+        checkpoint_id: str,
+        created_at: str,
+        name: Optional[str] = None,
+        workflow_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        entity_count: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.checkpoint_id = checkpoint_id
+        self.created_at = created_at
+        self.name = name
+        self.workflow_id = workflow_id
+        self.parent_id = parent_id
+        self.entity_count = entity_count
+        self.metadata = metadata or {}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint) -> 'CatalogEntry':
+        """Create the catalog entry of a Checkpoint."""
+        return cls(
+            checkpoint_id=checkpoint.checkpoint_id,
+            created_at=checkpoint.created_at,
+            name=checkpoint.name,
+            workflow_id=checkpoint.metadata.get("workflow_id"),
+            parent_id=checkpoint.parent_id,
+            entity_count=(
+                len(checkpoint.entities) if checkpoint.entity_count is None
+                else checkpoint.entity_count
+            ),
+            metadata=checkpoint.metadata
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "checkpoint_id": self.checkpoint_id,
+            "created_at": self.created_at,
+            "name": self.name,
+            "workflow_id": self.workflow_id,
+            "parent_id": self.parent_id,
+            "entity_count": self.entity_count,
+            "metadata": self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CatalogEntry':
+        """Create CatalogEntry from dictionary."""
+        return cls(
+            checkpoint_id=data["checkpoint_id"],
+            created_at=data["created_at"],
+            name=data.get("name"),
+            workflow_id=data.get("workflow_id"),
+            parent_id=data.get("parent_id"),
+            entity_count=data.get("entity_count", 0),
+            metadata=data.get("metadata", {})
+        )
+
+
+class CheckpointCatalog:
+    """Append-only catalog of checkpoints with in-memory sorted indexes.
+
+    Every change appends one JSON line to ``checkpoints/catalog.jsonl``
+    (``{"add": entry}`` or ``{"remove": checkpoint_id}``, where a later add
+    replaces an earlier one). The file is read once; afterwards the catalog
+    answers queries from sorted lists by creation time, by name, per
+    workflow and per workflow definition (the "workflow_definition_id"
+    metadata), so the latest checkpoint is O(1), name-prefix and workflow
+    lookups are O(log n) plus the matches, and nothing scales with the
+    number of manifests. The file is rewritten once it holds more removed
+    than live records.
+    """
+
+    def __init__(self, storage_provider: FileStorageProvider):
+        """Initialize the catalog.
+
+        Args:
+            storage_provider: Storage provider holding the catalog file
+        """
+        self.storage = storage_provider
+        self.loaded = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._by_time: List[Tuple[str, str]] = []  # (created_at, checkpoint_id)
+        self._by_name: List[Tuple[str, str, str]] = []  # (name, created_at, checkpoint_id)
+        self._by_workflow: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_definition: Dict[str, List[Tuple[str, str]]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._records = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, checkpoint_id: object) -> bool:
+        return checkpoint_id in self._entries
+
+    async def load(self) -> bool:
+        """Read the catalog file.
+
+        Returns:
+            True if the file exists, False if the catalog has to be rebuilt
+        """
+        self._clear()
+        data = await self.storage.retrieve(CATALOG_KEY)
+        self.loaded = data is not None
+        if data is None:
+            return False
+
+        torn = bool(data) and not data.endswith(b"\n")
+        for line in data.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted append
+                torn = True
+                continue
+            self._apply(record)
+
+        if torn:
+            # Appending after an unterminated line would corrupt the next record
+            await self._rewrite()
+        return True
+
+    async def rebuild(self, entries: List[CatalogEntry]) -> None:
+        """Replace the catalog with the given entries and rewrite its file."""
+        self._clear()
+        for entry in entries:
+            self._apply({"add": entry.to_dict()})
+        await self._rewrite()
+        self.loaded = True
+
+    async def _rewrite(self) -> None:
+        lines = [json.dumps({"add": entry.to_dict()}) for entry in self._entries.values()]
+        await self.storage.store(CATALOG_KEY, "".join(f"{line}\n" for line in lines).encode('utf-8'))
+        self._records = len(lines)
+
+    async def add(self, entry: CatalogEntry) -> None:
+        """Add a checkpoint, replacing any entry with the same ID."""
+        await self._append({"add": entry.to_dict()})
+
+    async def remove(self, checkpoint_id: str) -> None:
+        """Remove a checkpoint from the catalog."""
+        if checkpoint_id not in self._entries:
+            return
+        await self._append({"remove": checkpoint_id})
+        if self._records > 2 * len(self._entries):
+            await self._rewrite()
+
+    async def _append(self, record: Dict[str, Any]) -> None:
+        await self.storage.append(CATALOG_KEY, f"{json.dumps(record)}\n".encode('utf-8'))
+        self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        self._records += 1
+        if "remove" in record:
+            self._unindex(record["remove"])
+            return
+
+        entry = CatalogEntry.from_dict(record["add"])
+        self._unindex(entry.checkpoint_id)
+        self._entries[entry.checkpoint_id] = entry
+        bisect.insort(self._by_time, (entry.created_at, entry.checkpoint_id))
+        bisect.insort(self._by_name, (entry.name or "", entry.created_at, entry.checkpoint_id))
+        if entry.workflow_id is not None:
+            bisect.insort(
+                self._by_workflow.setdefault(entry.workflow_id, []),
+                (entry.created_at, entry.checkpoint_id)
+            )
+        definition_id = entry.metadata.get("workflow_definition_id")
+        if definition_id is not None:
+            bisect.insort(
+                self._by_definition.setdefault(definition_id, []),
+                (entry.created_at, entry.checkpoint_id)
+            )
+        if entry.parent_id is not None:
+            self._children.setdefault(entry.parent_id, set()).add(entry.checkpoint_id)
+
+    def _unindex(self, checkpoint_id: str) -> None:
+        entry = self._entries.pop(checkpoint_id, None)
+        if entry is None:
+            return
+        _discard(self._by_time, (entry.created_at, checkpoint_id))
+        _discard(self._by_name, (entry.name or "", entry.created_at, checkpoint_id))
+        if entry.workflow_id is not None:
+            _discard(self._by_workflow[entry.workflow_id], (entry.created_at, checkpoint_id))
+            if not self._by_workflow[entry.workflow_id]:
+                del self._by_workflow[entry.workflow_id]
+        definition_id = entry.metadata.get("workflow_definition_id")
+        if definition_id is not None:
+            _discard(self._by_definition[definition_id], (entry.created_at, checkpoint_id))
+            if not self._by_definition[definition_id]:
+                del self._by_definition[definition_id]
+        if entry.parent_id is not None:
+            self._children[entry.parent_id].discard(checkpoint_id)
+            if not self._children[entry.parent_id]:
+                del self._children[entry.parent_id]
+
+    def get(self, checkpoint_id: str) -> Optional[CatalogEntry]:
+        """Get the entry of a checkpoint."""
+        return self._entries.get(checkpoint_id)
+
+    def latest(
+        self,
+        workflow_id: Optional[str] = None,
+        definition_id: Optional[str] = None
+    ) -> Optional[CatalogEntry]:
+        """Get the newest checkpoint, optionally of one workflow or workflow definition."""
+        if definition_id is not None:
+            ordered = self._by_definition.get(definition_id)
+        elif workflow_id is not None:
+            ordered = self._by_workflow.get(workflow_id)
+        else:
+            ordered = self._by_time
+        if not ordered:
+            return None
+        return self._entries[ordered[-1][1]]
+
+    def list(
+        self,
+        workflow_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[CatalogEntry]:
+        """List checkpoints, newest first.
+
+        Args:
+            workflow_id: Only list checkpoints of this workflow
+            limit: Maximum number of entries to return
+        """
+        ordered = self._by_time if workflow_id is None else self._by_workflow.get(workflow_id, [])
+        if limit:
+            ordered = ordered[-limit:]
+        return [self._entries[checkpoint_id] for _, checkpoint_id in reversed(ordered)]
+
+    def find(self, name_pattern: str, limit: Optional[int] = None) -> List[CatalogEntry]:
+        """Find checkpoints whose name matches an fnmatch pattern, newest first.
+
+        Only names sharing the pattern's literal prefix are examined.
+
+        Args:
+            name_pattern: Pattern to match checkpoint names against
+            limit: Maximum number of entries to return
+        """
+        cut = min((i for i, char in enumerate(name_pattern) if char in WILDCARDS), default=len(name_pattern))
+        prefix = name_pattern[:cut]
+
+        matches = []
+        start = bisect.bisect_left(self._by_name, (prefix,))
+        for name, created_at, checkpoint_id in self._by_name[start:]:
+            if not name.startswith(prefix):
+                break
+            if fnmatch.fnmatchcase(name, name_pattern):
+                matches.append((created_at, checkpoint_id))
+
+        matches.sort(reverse=True)
+        if limit:
+            matches = matches[:limit]
+        return [self._entries[checkpoint_id] for _, checkpoint_id in matches]
+
+    def children(self, checkpoint_id: str) -> List[CatalogEntry]:
+        """Get the delta checkpoints chained directly onto a checkpoint."""
+        return [self._entries[child] for child in self._children.get(checkpoint_id, ())]
+
+
+def _discard(ordered: List[Tuple], item: Tuple) -> None:
+    index = bisect.bisect_left(ordered, item)
+    if index < len(ordered) and ordered[index] == item:
+        del ordered[index]
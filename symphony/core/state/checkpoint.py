@@ -15,8 +15,12 @@ except ImportError:
     UTC = timezone.utc
 from typing import Dict, Any, Optional, List, Tuple
 
-from .serialization import create_state_bundle
-from .storage import FileStorageProvider
+from .catalog import CatalogEntry, CheckpointCatalog
+from .serialization import StateBundle, create_state_bundle
+from .storage import BLOB_PREFIX, FileStorageProvider
+
+
+REVISION_ATTRIBUTE = "state_revision"
 
 
 class CheckpointError(Exception):
@@ -25,27 +29,50 @@ class CheckpointError(Exception):
 
 
 class Checkpoint:
-    """Represents a consistent checkpoint of Symphony state."""
+    """Represents a consistent checkpoint of Symphony state.
+    
+    A full checkpoint lists every entity. A delta checkpoint has a
+    ``parent_id`` and lists only the entities that changed since its parent,
+    plus the (entity_type, entity_id) pairs that no longer exist.
+    """
     
     def __init__(
         self,
         checkpoint_id: str,
         created_at: str,
         name: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        parent_id: Optional[str] = None,
+        chain_length: int = 0
     ):
         self.checkpoint_id = checkpoint_id
         self.created_at = created_at
         self.name = name
         self.metadata = metadata or {}
+        self.parent_id = parent_id
+        self.chain_length = chain_length
         self.entities = []
+        self.removed: List[List[str]] = []
+        self.entity_count: Optional[int] = None
+    
+    @property
+    def is_delta(self) -> bool:
+        """Whether this checkpoint only records changes to its parent."""
+        return self.parent_id is not None
     
-    def add_entity(self, entity_type: str, entity_id: str, bundle_key: str) -> None:
+    def add_entity(
+        self,
+        entity_type: str,
+        entity_id: str,
+        bundle_key: str,
+        revision: Optional[int] = None
+    ) -> None:
         """Add entity to checkpoint."""
         self.entities.append({
             "entity_type": entity_type,
             "entity_id": entity_id,
-            "bundle_key": bundle_key
+            "bundle_key": bundle_key,
+            "revision": revision
         })
     
     def to_dict(self) -> Dict[str, Any]:
@@ -55,7 +82,11 @@ class Checkpoint:
             "created_at": self.created_at,
             "name": self.name,
             "metadata": self.metadata,
-            "entities": self.entities
+            "parent_id": self.parent_id,
+            "chain_length": self.chain_length,
+            "entities": self.entities,
+            "removed": self.removed,
+            "entity_count": len(self.entities) if self.entity_count is None else self.entity_count
         }
     
     @classmethod
@@ -65,29 +96,106 @@ class Checkpoint:
             checkpoint_id=data["checkpoint_id"],
             created_at=data["created_at"],
             name=data.get("name"),
-            metadata=data.get("metadata", {})
+            metadata=data.get("metadata", {}),
+            parent_id=data.get("parent_id"),
+            chain_length=data.get("chain_length", 0)
         )
         
         for entity in data.get("entities", []):
             checkpoint.add_entity(
                 entity_type=entity["entity_type"],
                 entity_id=entity["entity_id"],
-                bundle_key=entity["bundle_key"]
+                bundle_key=entity["bundle_key"],
+                revision=entity.get("revision")
             )
+        checkpoint.removed = [list(key) for key in data.get("removed", [])]
+        checkpoint.entity_count = data.get("entity_count")
         
         return checkpoint
 
 
+def entity_revision(entity: Any) -> Optional[int]:
+    """Get an entity's change counter, if it keeps one.
+    
+    Entities that expose an integer ``state_revision`` (see ``mark_dirty``)
+    are skipped by delta checkpoints without being re-encoded while the
+    same object keeps the same counter. Other entities are compared by
+    content hash.
+    """
+    revision = getattr(entity, REVISION_ATTRIBUTE, None)
+    return revision if isinstance(revision, int) and not isinstance(revision, bool) else None
+
+
+def mark_dirty(entity: Any) -> int:
+    """Bump an entity's change counter so the next checkpoint captures it.
+    
+    Revisions are opt-in: once an entity has a ``state_revision``, changes
+    that are not followed by ``mark_dirty`` are missed by later checkpoints
+    of the same object. Core models are changed by plain attribute
+    assignment and are left to the content hash comparison.
+    
+    Args:
+        entity: Entity that was modified
+        
+    Returns:
+        The new revision
+    """
+    revision = (entity_revision(entity) or 0) + 1
+    setattr(entity, REVISION_ATTRIBUTE, revision)
+    return revision
+
+
+def _entity_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+    return (entry["entity_type"], entry["entity_id"])
+
+
+class CheckpointSnapshot:
+    """Entity state captured for a checkpoint that has not been written yet."""
+    
+    def __init__(self, deferred: Optional[List[Tuple[str, Any]]] = None):
+        # (state bundle, entity, revision) of each discovered entity
+        self.bundles: List[Tuple[StateBundle, Any, Optional[int]]] = []
+        # (entity_type, entity) pairs encoded when the snapshot is written
+        self.deferred = deferred or []
+
+
+class _Head:
+    """The last checkpoint written, with its fully resolved entity entries."""
+    
+    def __init__(
+        self,
+        checkpoint_id: str,
+        chain_length: int,
+        entities: Dict[Tuple[str, str], Dict[str, Any]],
+        revisions: Optional[Dict[Tuple[str, str], Tuple[Any, int]]] = None
+    ):
+        self.checkpoint_id = checkpoint_id
+        self.chain_length = chain_length
+        self.entities = entities
+        # (entity, revision) each entry was written from by this process.
+        # Revisions restart for every new object, so one is only meaningful
+        # together with the object it was read from
+        self.revisions = revisions or {}
+
+
 class CheckpointManager:
     """Manages creation and restoration of consistent checkpoints."""
     
-    def __init__(self, storage_provider: FileStorageProvider):
+    def __init__(self, storage_provider: FileStorageProvider, max_chain_length: int = 8):
         """Initialize checkpoint manager.
         
         Args:
             storage_provider: Storage provider for persistence
+            max_chain_length: Number of delta checkpoints allowed after a full
+                one before the next checkpoint is forced to be full (0 makes
+                every checkpoint full)
         """
         self.storage = storage_provider
+        self.max_chain_length = max_chain_length
+        self.catalog = CheckpointCatalog(storage_provider)
+        self._head: Optional[_Head] = None
+        # (entity, revision, bundle) last captured per (entity_type, entity_id)
+        self._bundles: Dict[Tuple[str, str], Tuple[Any, int, StateBundle]] = {}
     
     async def _discover_entities(self, symphony_instance) -> List[Tuple[str, Any]]:
         """Discover all stateful entities in Symphony instance.
@@ -100,32 +208,19 @@ class CheckpointManager:
         """
         entities = []
         
-        print(f"Discovering entities in Symphony instance: {type(symphony_instance).__name__}")
-        
         # Discover agents
         if hasattr(symphony_instance, "agents"):
-            print(f"Symphony has agents facade: {type(symphony_instance.agents).__name__}")
             agents = []
             
             # Handle different agent collection patterns
             if hasattr(symphony_instance.agents, "get_all_agents"):
-                print("Using get_all_agents() method")
                 agents = await symphony_instance.agents.get_all_agents()
-                print(f"Found {len(agents)} agents via get_all_agents()")
             elif hasattr(symphony_instance.agents, "agents"):
-                print("Using agents.agents attribute")
                 agents = symphony_instance.agents.agents.values()
-                print(f"Found {len(agents)} agents via agents.agents")
             elif hasattr(symphony_instance, "_agents"):
-                print("Using _agents attribute")
                 agents = symphony_instance._agents.values()
-                print(f"Found {len(agents)} agents via _agents")
-            else:
-                print("No known agent collection mechanism found")
                 
-            print(f"Total agents found: {len(agents)}")    
             for agent in agents:
-                print(f"Adding agent to checkpoint: {getattr(agent, 'id', str(id(agent)))}")
                 entities.append(("Agent", agent))
         
         # Discover memories
@@ -170,14 +265,88 @@ class CheckpointManager:
         self, 
         symphony_instance, 
         name: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        extra_entities: Optional[List[Tuple[str, Any]]] = None
     ) -> str:
         """Create checkpoint of Symphony state.
         
+        Entity bundles are stored by content hash and shared between
+        checkpoints, so state unchanged since an earlier checkpoint is not
+        written again.
+        
         Args:
             symphony_instance: Symphony instance
             name: Optional checkpoint name
             metadata: Optional metadata to store with checkpoint
+            extra_entities: (entity_type, entity) pairs to checkpoint in
+                addition to the entities discovered on the instance
+            
+        Returns:
+            Checkpoint ID
+        """
+        snapshot = await self.snapshot(symphony_instance, extra_entities)
+        return await self.write_snapshot(snapshot, name, metadata)
+    
+    async def snapshot(
+        self,
+        symphony_instance,
+        extra_entities: Optional[List[Tuple[str, Any]]] = None
+    ) -> CheckpointSnapshot:
+        """Capture the state of a checkpoint without writing it.
+        
+        Every discovered entity is encoded now, so the snapshot is
+        consistent with the moment it was taken. An entity with a
+        ``state_revision`` reuses the bundle captured before if it is the
+        same object at the same revision. Nothing is written to storage, so
+        the snapshot can be handed to ``write_snapshot`` off the critical
+        path.
+        
+        Args:
+            symphony_instance: Symphony instance
+            extra_entities: (entity_type, entity) pairs to checkpoint in
+                addition to the entities discovered on the instance. They
+                are encoded by ``write_snapshot``, so they must not change
+                in between (pass a copy or snapshot of mutable state).
+            
+        Returns:
+            The captured snapshot
+        """
+        snapshot = CheckpointSnapshot(deferred=list(extra_entities or []))
+        captured: Dict[Tuple[str, str], Tuple[Any, int, StateBundle]] = {}
+        for entity_type, entity in await self._discover_entities(symphony_instance):
+            try:
+                revision = entity_revision(entity)
+                key = (entity_type, getattr(entity, "id", str(id(entity))))
+                cached = self._bundles.get(key)
+                if (revision is not None and cached is not None
+                        and cached[0] is entity and cached[1] == revision):
+                    # Same object, unchanged since it was last captured
+                    bundle = cached[2]
+                else:
+                    bundle = create_state_bundle(entity, entity_type)
+                if revision is not None:
+                    captured[key] = (entity, revision, bundle)
+                snapshot.bundles.append((bundle, entity, revision))
+            except Exception as e:
+                # Log error but continue with other entities
+                print(f"Error checkpointing {entity_type} {getattr(entity, 'id', id(entity))}: {e}")
+        self._bundles = captured
+        return snapshot
+    
+    async def write_snapshot(
+        self,
+        snapshot: CheckpointSnapshot,
+        name: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Write a captured snapshot as a new checkpoint.
+        
+        Snapshots have to be written in the order they were taken.
+        
+        Args:
+            snapshot: Snapshot taken with ``snapshot``
+            name: Optional checkpoint name
+            metadata: Optional metadata to store with checkpoint
             
         Returns:
             Checkpoint ID
@@ -185,40 +354,77 @@ class CheckpointManager:
         # Generate checkpoint ID
         checkpoint_id = f"ckpt_{uuid.uuid4().hex}"
         
+        # Chain onto the previous checkpoint unless the chain is long enough
+        head = await self._load_head()
+        full = head is None or head.chain_length >= self.max_chain_length
+        
         # Create checkpoint object
         checkpoint = Checkpoint(
             checkpoint_id=checkpoint_id,
             created_at=datetime.now(UTC).isoformat(),
             name=name,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            parent_id=None if full else head.checkpoint_id,
+            chain_length=0 if full else head.chain_length + 1
         )
         
-        # Discover entities to checkpoint
-        entities = await self._discover_entities(symphony_instance)
+        bundles = list(snapshot.bundles)
+        for entity_type, entity in snapshot.deferred:
+            try:
+                bundles.append((create_state_bundle(entity, entity_type), entity, None))
+            except Exception as e:
+                print(f"Error checkpointing {entity_type} {getattr(entity, 'id', id(entity))}: {e}")
+        previous = head.entities if head else {}
+        written = head.revisions if head else {}
+        current: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        revisions: Dict[Tuple[str, str], Tuple[Any, int]] = {}
         
         # Start transaction
         transaction = await self.storage.create_transaction()
         
         try:
-            # Create state bundles for each entity
-            for entity_type, entity in entities:
+            # Store the state bundle of each entity
+            for bundle, entity, revision in bundles:
                 try:
-                    # Create state bundle
-                    bundle = create_state_bundle(entity, entity_type)
+                    key = (bundle.entity_type, bundle.entity_id)
+                    if revision is not None:
+                        revisions[key] = (entity, revision)
+                    prior = previous.get(key)
+                    last = written.get(key)
+                    if (prior is not None and revision is not None and last is not None
+                            and last[0] is entity and last[1] == revision):
+                        # Same object, unchanged since the previous checkpoint
+                        current[key] = prior
+                        continue
                     
-                    # Store bundle in transaction
-                    bundle_key = f"checkpoints/{checkpoint_id}/entities/{entity_type}/{bundle.entity_id}.json"
-                    await transaction.store(bundle_key, bundle.serialize())
+                    # Store bundle by content; unchanged state is already stored
+                    bundle_key = await self.storage.store_bundle_blob(bundle, transaction)
                     
-                    # Add to checkpoint manifest
-                    checkpoint.add_entity(
-                        entity_type=entity_type,
-                        entity_id=bundle.entity_id,
-                        bundle_key=bundle_key
-                    )
+                    current[key] = {
+                        "entity_type": bundle.entity_type,
+                        "entity_id": bundle.entity_id,
+                        "bundle_key": bundle_key,
+                        "revision": revision
+                    }
                 except Exception as e:
                     # Log error but continue with other entities
-                    print(f"Error checkpointing {entity_type} {getattr(entity, 'id', id(entity))}: {e}")
+                    print(f"Error checkpointing {bundle.entity_type} {bundle.entity_id}: {e}")
+            
+            # Add to checkpoint manifest everything a full checkpoint holds,
+            # or what changed since the parent for a delta
+            for key, entry in current.items():
+                prior = previous.get(key)
+                if full or prior is None or prior["bundle_key"] != entry["bundle_key"]:
+                    checkpoint.add_entity(**entry)
+            if not full:
+                checkpoint.removed = [list(key) for key in previous if key not in current]
+            checkpoint.entity_count = len(current)
+            
+            # Reference the blobs from this checkpoint
+            await self.storage.retain_blobs(
+                [entity["bundle_key"] for entity in checkpoint.entities],
+                transaction
+            )
             
             # Store checkpoint manifest
             manifest_key = f"checkpoints/{checkpoint_id}/manifest.json"
@@ -235,13 +441,121 @@ class CheckpointManager:
             
             # Commit transaction
             await transaction.commit()
-            
-            return checkpoint_id
+            self._head = _Head(checkpoint_id, checkpoint.chain_length, current, revisions)
             
         except Exception as e:
             # Roll back transaction if anything fails
             await transaction.rollback()
             raise CheckpointError(f"Failed to create checkpoint: {e}")
+        
+        await self._catalog_add(checkpoint)
+        return checkpoint_id
+    
+    async def _load_catalog(self) -> CheckpointCatalog:
+        """Get the checkpoint catalog, rebuilding it from manifests if needed."""
+        if not self.catalog.loaded:
+            exists = await self.catalog.load()
+            latest_data = await self.storage.retrieve("checkpoints/latest.txt")
+            latest_id = latest_data.decode('utf-8').strip() if latest_data else None
+            
+            # A missing catalog, or one that lost its last append, is rebuilt
+            if not exists or (latest_id and latest_id not in self.catalog):
+                checkpoints = await self._scan_checkpoints()
+                await self.catalog.rebuild([CatalogEntry.from_checkpoint(c) for c in checkpoints])
+        return self.catalog
+    
+    async def _catalog_add(self, checkpoint: Checkpoint) -> None:
+        """Record a checkpoint in the catalog."""
+        try:
+            catalog = await self._load_catalog()
+            await catalog.add(CatalogEntry.from_checkpoint(checkpoint))
+        except Exception as e:
+            # The checkpoint itself is committed; reload the catalog next time
+            print(f"Error updating checkpoint catalog: {e}")
+            self.catalog.loaded = False
+    
+    async def _load_head(self) -> Optional[_Head]:
+        """Get the checkpoint the next one can chain onto, if any."""
+        if self.max_chain_length <= 0:
+            return None
+        if self._head is None:
+            try:
+                latest = await self.get_latest_checkpoint()
+                if latest is None:
+                    return None
+                entries = await self.resolve_entities(latest)
+            except CheckpointError as e:
+                print(f"Error loading latest checkpoint, writing a full checkpoint: {e}")
+                return None
+            
+            # Checkpoints from before content-addressed storage keep bundles
+            # in their own directory, so later checkpoints cannot share them
+            if any(not entry["bundle_key"].startswith(f"{BLOB_PREFIX}/") for entry in entries):
+                return None
+            # Stored revisions may come from other objects or processes, so
+            # entries loaded from storage are compared by content hash
+            self._head = _Head(
+                latest.checkpoint_id,
+                latest.chain_length,
+                {_entity_key(entry): {**entry, "revision": None} for entry in entries}
+            )
+        return self._head
+    
+    async def resolve_entities(self, checkpoint: Checkpoint) -> List[Dict[str, Any]]:
+        """Get the full entity list of a checkpoint by replaying its delta chain.
+        
+        Args:
+            checkpoint: Full or delta checkpoint
+            
+        Returns:
+            Entity entries (entity_type, entity_id, bundle_key, revision)
+            
+        Raises:
+            CheckpointError: If a checkpoint in the chain is missing
+        """
+        chain = [checkpoint]
+        while chain[-1].parent_id is not None:
+            parent = await self.get_checkpoint(chain[-1].parent_id)
+            if parent is None:
+                raise CheckpointError(
+                    f"Parent checkpoint {chain[-1].parent_id} of {chain[-1].checkpoint_id} not found"
+                )
+            chain.append(parent)
+        
+        state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for link in reversed(chain):
+            for key in link.removed:
+                state.pop(tuple(key), None)
+            for entry in link.entities:
+                state[_entity_key(entry)] = entry
+        return list(state.values())
+    
+    async def load_entity_state(
+        self,
+        checkpoint_id: str,
+        entity_type: str,
+        entity_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Read the state of one entity as of a checkpoint.
+        
+        Args:
+            checkpoint_id: Checkpoint ID
+            entity_type: Type of the entity
+            entity_id: ID of the entity
+            
+        Returns:
+            The entity's encoded state, or None if the checkpoint or the
+            entity does not exist
+        """
+        checkpoint = await self.get_checkpoint(checkpoint_id)
+        if not checkpoint:
+            return None
+        
+        for entity in await self.resolve_entities(checkpoint):
+            if entity["entity_type"] == entity_type and entity["entity_id"] == entity_id:
+                bundle = await self.storage.retrieve_bundle(entity["bundle_key"])
+                return bundle.data if bundle else None
+        return None
     
     async def get_checkpoint(self, checkpoint_id: str) -> Optional[Checkpoint]:
         """Get checkpoint by ID.
@@ -285,9 +599,66 @@ class CheckpointManager:
         """List all checkpoints.
         
         Returns:
-            List of checkpoints
+            List of checkpoints (newest first)
+        """
+        checkpoints = []
+        for entry in (await self._load_catalog()).list():
+            checkpoint = await self.get_checkpoint(entry.checkpoint_id)
+            if checkpoint:
+                checkpoints.append(checkpoint)
+        return checkpoints
+    
+    async def list_entries(
+        self,
+        workflow_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[CatalogEntry]:
+        """List checkpoint metadata from the catalog without reading manifests.
+        
+        Args:
+            workflow_id: Only list checkpoints of this workflow
+            limit: Maximum number of entries to return
+            
+        Returns:
+            Catalog entries (newest first)
+        """
+        return (await self._load_catalog()).list(workflow_id, limit)
+    
+    async def find_checkpoints(
+        self,
+        name_pattern: str,
+        limit: Optional[int] = None
+    ) -> List[CatalogEntry]:
+        """Find checkpoints whose name matches an fnmatch pattern.
+        
+        Args:
+            name_pattern: Pattern to match checkpoint names against
+            limit: Maximum number of entries to return
+            
+        Returns:
+            Matching catalog entries (newest first)
+        """
+        return (await self._load_catalog()).find(name_pattern, limit)
+    
+    async def latest_entry(
+        self,
+        workflow_id: Optional[str] = None,
+        definition_id: Optional[str] = None
+    ) -> Optional[CatalogEntry]:
+        """Get the catalog entry of the newest checkpoint.
+        
+        Args:
+            workflow_id: Only consider checkpoints of this workflow
+            definition_id: Only consider checkpoints whose metadata has this
+                "workflow_definition_id"
+            
+        Returns:
+            Catalog entry if any, None otherwise
         """
-        # List checkpoint directories
+        return (await self._load_catalog()).latest(workflow_id, definition_id)
+    
+    async def _scan_checkpoints(self) -> List[Checkpoint]:
+        """Read every checkpoint manifest in storage."""
         checkpoints = []
         
         # Get all manifest files
@@ -307,9 +678,6 @@ class CheckpointManager:
                 # Log error but continue with other checkpoints
                 print(f"Error loading checkpoint manifest {key}: {e}")
         
-        # Sort by creation time (newest first)
-        checkpoints.sort(key=lambda c: c.created_at, reverse=True)
-        
         return checkpoints
     
     async def restore_checkpoint(self, symphony_instance, checkpoint_id: str) -> None:
@@ -327,8 +695,12 @@ class CheckpointManager:
         if not checkpoint:
             raise CheckpointError(f"Checkpoint {checkpoint_id} not found")
         
-        print(f"Found checkpoint: {checkpoint_id} with {len(checkpoint.entities)} entities")
-        for i, entity in enumerate(checkpoint.entities, 1):
+        # Replay the delta chain into a full entity list
+        manifest = checkpoint.to_dict()
+        manifest["entities"] = await self.resolve_entities(checkpoint)
+        
+        print(f"Found checkpoint: {checkpoint_id} with {len(manifest['entities'])} entities")
+        for i, entity in enumerate(manifest["entities"], 1):
             print(f"Entity {i}: {entity['entity_type']} {entity['entity_id']}")
         
         try:
@@ -337,7 +709,7 @@ class CheckpointManager:
             
             # Use restore manager to restore from checkpoint
             restoration_context = await restore_manager.restore_from_checkpoint(
-                checkpoint.to_dict(),
+                manifest,
                 symphony_instance
             )
             
@@ -358,6 +730,47 @@ class CheckpointManager:
             traceback.print_exc()
             raise CheckpointError(f"Unexpected error restoring checkpoint {checkpoint_id}: {e}")
     
+    async def _fold_into_children(self, checkpoint: Checkpoint, children: List[Checkpoint]) -> None:
+        """Merge a checkpoint's delta into the checkpoints chained onto it.
+        
+        Each child is rewritten relative to the checkpoint's parent (or as a
+        full checkpoint if it had none), so the checkpoint can be deleted
+        without breaking their chains.
+        """
+        transaction = await self.storage.create_transaction()
+        retained = []
+        try:
+            for child in children:
+                changed = {_entity_key(entry) for entry in child.entities}
+                removed = {tuple(key) for key in child.removed}
+                inherited = [
+                    entry for entry in checkpoint.entities
+                    if _entity_key(entry) not in changed and _entity_key(entry) not in removed
+                ]
+                retained.extend(entry["bundle_key"] for entry in inherited)
+                
+                child.entities = inherited + child.entities
+                if checkpoint.parent_id is None:
+                    child.removed = []
+                else:
+                    keys = [
+                        tuple(key) for key in checkpoint.removed if tuple(key) not in changed
+                    ] + [tuple(key) for key in child.removed]
+                    child.removed = [list(key) for key in dict.fromkeys(keys)]
+                child.parent_id = checkpoint.parent_id
+                child.chain_length = max(0, child.chain_length - 1)
+                
+                await transaction.store(
+                    f"checkpoints/{child.checkpoint_id}/manifest.json",
+                    json.dumps(child.to_dict()).encode('utf-8')
+                )
+            
+            await self.storage.retain_blobs(retained, transaction)
+            await transaction.commit()
+        except Exception as e:
+            await transaction.rollback()
+            raise CheckpointError(f"Failed to detach checkpoints from {checkpoint.checkpoint_id}: {e}")
+    
     async def delete_checkpoint(self, checkpoint_id: str) -> bool:
         """Delete checkpoint.
         
@@ -373,6 +786,21 @@ class CheckpointManager:
         if not checkpoint:
             return False
         
+        latest = await self.get_latest_checkpoint()
+        
+        # Delta checkpoints built on this one absorb its changes first
+        catalog = await self._load_catalog()
+        children = []
+        for entry in catalog.children(checkpoint_id):
+            child = await self.get_checkpoint(entry.checkpoint_id)
+            if child:
+                children.append(child)
+        if children:
+            await self._fold_into_children(checkpoint, children)
+            for child in children:
+                await catalog.add(CatalogEntry.from_checkpoint(child))
+        self._head = None
+        
         # Delete all checkpoint files
         keys = await self.storage.list_keys(f"checkpoints/{checkpoint_id}")
         
@@ -383,16 +811,24 @@ class CheckpointManager:
         manifest_key = f"checkpoints/{checkpoint_id}/manifest.json"
         await self.storage.delete(manifest_key)
         
+        # Release shared bundle blobs (checkpoints written before
+        # content-addressed storage keep their bundles in their own directory)
+        await self.storage.release_blobs(
+            entity["bundle_key"] for entity in checkpoint.entities
+            if entity["bundle_key"].startswith(f"{BLOB_PREFIX}/")
+        )
+        
+        await catalog.remove(checkpoint_id)
+        
         # Update latest reference if this was the latest
-        latest = await self.get_latest_checkpoint()
         if latest and latest.checkpoint_id == checkpoint_id:
             # Find next latest
-            checkpoints = await self.list_checkpoints()
-            if checkpoints:
+            next_latest = catalog.latest()
+            if next_latest:
                 # Update latest reference
                 await self.storage.store(
                     "checkpoints/latest.txt",
-                    checkpoints[0].checkpoint_id.encode('utf-8')
+                    next_latest.checkpoint_id.encode('utf-8')
                 )
             else:
                 # No checkpoints left
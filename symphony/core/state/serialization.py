@@ -218,6 +218,17 @@ class StateEncoder:
         
         return state
     
+    @staticmethod
+    def encode_workflow_context(context) -> Dict[str, Any]:
+        """Encode the data of a running workflow's context.
+        
+        Values that are not JSON serializable are stored as strings.
+        """
+        return {
+            "workflow_id": context.workflow_id,
+            "data": json.loads(json.dumps(context.data, default=str))
+        }
+    
     @staticmethod
     def encode_task(task) -> Dict[str, Any]:
         """Encode task state."""
@@ -279,7 +290,11 @@ def create_state_bundle(entity, entity_type: Optional[str] = None) -> StateBundl
     entity_id = getattr(entity, "id", str(id(entity)))
     
     # Select encoder based on entity type
-    if entity_type == "Agent" or "Agent" in entity.__class__.__name__:
+    if entity_type == "WorkflowContext":
+        # Contexts are identified by the workflow they belong to
+        entity_id = entity.workflow_id
+        data = StateEncoder.encode_workflow_context(entity)
+    elif entity_type == "Agent" or "Agent" in entity.__class__.__name__:
         data = StateEncoder.encode_agent(entity)
     elif entity_type == "Memory" or "Memory" in entity.__class__.__name__:
         data = StateEncoder.encode_memory(entity)
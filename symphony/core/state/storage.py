@@ -5,10 +5,12 @@ The initial implementation focuses on file-based storage with
 atomic operations to ensure state consistency.
 """
 
+import hashlib
+import json
 import os
 import shutil
 import tempfile
-from typing import Optional, List
+from typing import Callable, Dict, Iterable, Optional, List
 from datetime import datetime
 # Handle Python < 3.11 which doesn't have UTC constant
 try:
@@ -20,6 +22,9 @@ import uuid
 
 from .serialization import StateBundle
 
+BLOB_PREFIX = "blobs"
+REFCOUNTS_KEY = f"{BLOB_PREFIX}/refcounts.json"
+
 
 class StorageError(Exception):
     """Base exception for storage-related errors."""
@@ -43,6 +48,7 @@ class Transaction:
             transaction_id
         )
         self.operations = []
+        self.commit_callbacks: List[Callable[[], None]] = []
         self.committed = False
         self.rolled_back = False
         
@@ -107,6 +113,8 @@ class Transaction:
             
             # Mark as committed
             self.committed = True
+            for callback in self.commit_callbacks:
+                callback()
             
             # Clean up transaction directory
             if os.path.exists(self.temp_dir):
@@ -118,6 +126,14 @@ class Transaction:
             # This allows manual recovery if needed
             raise TransactionError(f"Failed to commit transaction {self.transaction_id}: {e}")
     
+    def staged(self, key: str) -> bool:
+        """Check whether a key is stored within this transaction."""
+        return ("store", key.lstrip('/')) in self.operations
+    
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Register a callback run once the transaction has committed."""
+        self.commit_callbacks.append(callback)
+    
     async def rollback(self) -> None:
         """Roll back the transaction, discarding all changes."""
         if self.committed:
@@ -152,6 +168,9 @@ class FileStorageProvider:
         os.makedirs(os.path.join(self.base_path, "transactions"), exist_ok=True)
         os.makedirs(os.path.join(self.base_path, "checkpoints"), exist_ok=True)
         
+        # Reference counts of content-addressed blobs, loaded on first use
+        self._refcounts: Optional[Dict[str, int]] = None
+        
     async def store(self, key: str, data: bytes) -> None:
         """Store data at key.
         
@@ -183,6 +202,28 @@ class FileStorageProvider:
                 pass
             raise StorageError(f"Failed to store {key}: {e}")
     
+    async def append(self, key: str, data: bytes) -> None:
+        """Append data to the value stored at key, creating it if needed.
+        
+        Unlike ``store`` this is not atomic; readers of append-only files
+        must tolerate a partial last record.
+        
+        Args:
+            key: Storage key
+            data: Data to append
+        """
+        # Normalize key
+        key = key.lstrip('/')
+        
+        key_path = os.path.join(self.base_path, "data", key)
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        
+        try:
+            with open(key_path, 'ab') as f:
+                f.write(data)
+        except Exception as e:
+            raise StorageError(f"Failed to append to {key}: {e}")
+    
     async def retrieve(self, key: str) -> Optional[bytes]:
         """Retrieve data stored at key.
         
@@ -318,4 +359,113 @@ class FileStorageProvider:
         try:
             return StateBundle.deserialize(data)
         except Exception as e:
-            raise StorageError(f"Failed to deserialize bundle at {key}: {e}")
\ No newline at end of file
+            raise StorageError(f"Failed to deserialize bundle at {key}: {e}")
+    
+    @staticmethod
+    def bundle_digest(bundle: StateBundle) -> str:
+        """Compute the content hash of a state bundle.
+        
+        The bundle's creation time is left out, so capturing unchanged
+        state again yields the same digest.
+        
+        Args:
+            bundle: StateBundle to hash
+            
+        Returns:
+            Hex SHA-256 digest
+        """
+        content = bundle.to_dict()
+        content.pop("created_at", None)
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def blob_key(digest: str) -> str:
+        """Get the storage key of the blob with the given digest."""
+        return f"{BLOB_PREFIX}/{digest[:2]}/{digest}.json"
+    
+    async def store_bundle_blob(
+        self,
+        bundle: StateBundle,
+        transaction: Optional[Transaction] = None
+    ) -> str:
+        """Store a state bundle by content, writing it only if it is new.
+        
+        Args:
+            bundle: StateBundle to store
+            transaction: Optional transaction to stage the blob in
+            
+        Returns:
+            Storage key of the blob
+        """
+        key = self.blob_key(self.bundle_digest(bundle))
+        if os.path.exists(os.path.join(self.base_path, "data", key)):
+            return key
+        if transaction is not None:
+            if not transaction.staged(key):
+                await transaction.store(key, bundle.serialize())
+        else:
+            await self.store(key, bundle.serialize())
+        return key
+    
+    async def _load_refcounts(self) -> Dict[str, int]:
+        if self._refcounts is None:
+            data = await self.retrieve(REFCOUNTS_KEY)
+            self._refcounts = json.loads(data.decode('utf-8')) if data else {}
+        return self._refcounts
+    
+    async def retain_blobs(
+        self,
+        keys: Iterable[str],
+        transaction: Optional[Transaction] = None
+    ) -> None:
+        """Add one reference to each blob.
+        
+        Within a transaction the new counts are staged with it and only take
+        effect when it commits.
+        
+        Args:
+            keys: Blob storage keys (one reference is added per occurrence)
+            transaction: Optional transaction to stage the counts in
+        """
+        refcounts = dict(await self._load_refcounts())
+        for key in keys:
+            refcounts[key] = refcounts.get(key, 0) + 1
+        data = json.dumps(refcounts, separators=(",", ":")).encode('utf-8')
+        
+        if transaction is not None:
+            await transaction.store(REFCOUNTS_KEY, data)
+            transaction.on_commit(lambda: setattr(self, "_refcounts", refcounts))
+        else:
+            await self.store(REFCOUNTS_KEY, data)
+            self._refcounts = refcounts
+    
+    async def release_blobs(self, keys: Iterable[str]) -> List[str]:
+        """Drop one reference to each blob and delete unreferenced blobs.
+        
+        Args:
+            keys: Blob storage keys (one reference is dropped per occurrence)
+            
+        Returns:
+            Keys of the blobs that were deleted
+        """
+        refcounts = dict(await self._load_refcounts())
+        released = []
+        for key in keys:
+            count = refcounts.get(key, 0) - 1
+            if count > 0:
+                refcounts[key] = count
+            else:
+                refcounts.pop(key, None)
+                released.append(key)
+        
+        # Persist the counts first, so a failure leaves orphaned blobs rather
+        # than references to deleted ones
+        await self.store(REFCOUNTS_KEY, json.dumps(refcounts, separators=(",", ":")).encode('utf-8'))
+        self._refcounts = refcounts
+        
+        deleted = []
+        for key in dict.fromkeys(released):
+            if await self.delete(key):
+                deleted.append(key)
+        return deleted
@@ -197,7 +197,7 @@ class WorkflowFacade:
                             workflow: WorkflowDefinition, 
                             initial_context: Dict[str, Any] = None,
                             auto_checkpoint: bool = True,
-                            resume_from_checkpoint: bool = True,
+                            resume_from_checkpoint: bool = False,
                             model_assignments: Optional[Dict[str, str]] = None) -> Workflow:
         """Execute a workflow.
         
@@ -205,7 +205,9 @@ class WorkflowFacade:
             workflow: Workflow definition
             initial_context: Initial context data (optional)
             auto_checkpoint: Whether to automatically create checkpoints during execution
-            resume_from_checkpoint: Whether to try resuming from a checkpoint if available
+            resume_from_checkpoint: Whether to continue the latest unfinished
+                run of this workflow from its checkpoint instead of starting a
+                new run (``initial_context`` is then ignored)
             model_assignments: Optional model assignments for specific steps
             
         Returns:
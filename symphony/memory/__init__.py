@@ -1,6 +1,7 @@
 """Memory module for Symphony."""
 
 from symphony.memory.base import BaseMemory, ConversationMemory, InMemoryMemory
+from symphony.memory.embedders import HashingEmbedder
 from symphony.memory.kg_memory import KnowledgeGraphMemory
 from symphony.memory.local_kg_memory import LocalKnowledgeGraphMemory
 from symphony.memory.memory_manager import (
@@ -20,6 +21,7 @@ __all__ = [
     "ConversationMemory",
     "ConversationMemoryManager",
     "ConversationVectorMemory",
+    "HashingEmbedder",
     "InMemoryMemory",
     "KnowledgeGraphMemory",
     "LocalKnowledgeGraphMemory",
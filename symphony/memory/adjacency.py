@@ -0,0 +1,198 @@
+"""Interned integer-id adjacency core for LocalGraph."""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class AdjacencyGraph:
+    """Append-only multigraph over interned entity ids with CSR adjacency.
+
+    Entity ids and relationship types are interned to ints. Edge endpoints
+    and types live in growable int32 arrays, and a hash map of
+    (source, type, target) keys finds an existing edge in O(1). Each edge
+    is listed under both of its endpoints in a CSR structure (``offsets``
+    plus an edge array); edges added since the last rebuild are kept in a
+    small per-node delta that is merged once it grows past a fraction of
+    the graph, so adds are amortized O(log E) and lookups never rebuild.
+    """
+
+    def __init__(self, initial_capacity: int = 64, merge_ratio: float = 0.25):
+        """Initialize an empty graph.
+
+        Args:
+            initial_capacity: Number of edges to allocate up front
+            merge_ratio: Delta size, relative to the CSR edges, at which
+                the delta is merged into the CSR arrays
+        """
+        self.merge_ratio = merge_ratio
+        self._node_ids: List[str] = []
+        self._nodes: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._types: Dict[str, int] = {}
+
+        self._edge_ids: List[str] = []
+        self._edges: Dict[str, int] = {}
+        self._keys: Dict[Tuple[int, int, int], int] = {}
+        capacity = max(1, initial_capacity)
+        self._sources = np.zeros(capacity, dtype=np.int32)
+        self._targets = np.zeros(capacity, dtype=np.int32)
+        self._edge_types = np.zeros(capacity, dtype=np.int32)
+
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._csr_edges = np.zeros(0, dtype=np.int32)
+        self._delta: Dict[int, List[int]] = {}
+        self._delta_size = 0
+
+    def __len__(self) -> int:
+        """Number of edges."""
+        return len(self._edge_ids)
+
+    def _intern(self, table: Dict[str, int], names: List[str], name: str) -> int:
+        code = table.get(name)
+        if code is None:
+            code = table[name] = len(names)
+            names.append(name)
+        return code
+
+    def find(self, source_id: str, edge_type: str, target_id: str) -> Optional[str]:
+        """Get the id of the edge with this (source, type, target), if any."""
+        source = self._nodes.get(source_id)
+        target = self._nodes.get(target_id)
+        code = self._types.get(edge_type)
+        if source is None or target is None or code is None:
+            return None
+        edge = self._keys.get((source, code, target))
+        return self._edge_ids[edge] if edge is not None else None
+
+    def add(self, edge_id: str, source_id: str, edge_type: str, target_id: str) -> None:
+        """Add an edge.
+
+        Args:
+            edge_id: Relationship id of the edge
+            source_id: Source entity id
+            edge_type: Relationship type
+            target_id: Target entity id
+
+        Raises:
+            ValueError: If an edge with the same id or the same
+                (source, type, target) already exists
+        """
+        source = self._intern(self._nodes, self._node_ids, source_id)
+        target = self._intern(self._nodes, self._node_ids, target_id)
+        code = self._intern(self._types, self._type_names, edge_type)
+        key = (source, code, target)
+        if edge_id in self._edges or key in self._keys:
+            raise ValueError(f"Duplicate edge {edge_id}: {source_id} -{edge_type}-> {target_id}")
+
+        edge = len(self._edge_ids)
+        self._reserve(edge + 1)
+        self._sources[edge] = source
+        self._targets[edge] = target
+        self._edge_types[edge] = code
+        self._edge_ids.append(edge_id)
+        self._edges[edge_id] = edge
+        self._keys[key] = edge
+
+        self._delta.setdefault(source, []).append(edge)
+        if target != source:
+            self._delta.setdefault(target, []).append(edge)
+        else:
+            self._delta[source].append(edge)
+        self._delta_size += 1
+        if self._delta_size > max(1024, self.merge_ratio * len(self._csr_edges) / 2):
+            self._rebuild()
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._sources.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        for name in ("_sources", "_targets", "_edge_types"):
+            array = np.zeros(new_capacity, dtype=np.int32)
+            array[:capacity] = getattr(self, name)
+            setattr(self, name, array)
+
+    def _rebuild(self) -> None:
+        """Merge the delta into freshly built CSR arrays."""
+        count = len(self._edge_ids)
+        numbers = np.arange(count, dtype=np.int32)
+        endpoints = np.concatenate([self._sources[:count], self._targets[:count]])
+        edges = np.concatenate([numbers, numbers])
+        # Group by endpoint, keeping edges in insertion order within a node
+        order = np.lexsort((edges, endpoints))
+
+        offsets = np.zeros(len(self._node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(endpoints, minlength=len(self._node_ids)), out=offsets[1:])
+        self._offsets = offsets
+        self._csr_edges = edges[order]
+        self._delta = {}
+        self._delta_size = 0
+
+    def edge_ids(self, node_id: str) -> List[str]:
+        """Ids of the edges touching an entity, in insertion order.
+
+        A self-loop is listed twice, once per endpoint.
+        """
+        node = self._nodes.get(node_id)
+        if node is None:
+            return []
+        if node + 1 < len(self._offsets):
+            edges = self._csr_edges[self._offsets[node]:self._offsets[node + 1]].tolist()
+        else:
+            edges = []
+        edges.extend(self._delta.get(node, ()))
+        return [self._edge_ids[edge] for edge in edges]
+
+    def degree(self, node_id: str) -> int:
+        """Number of edge endpoints at an entity."""
+        node = self._nodes.get(node_id)
+        if node is None:
+            return 0
+        degree = len(self._delta.get(node, ()))
+        if node + 1 < len(self._offsets):
+            degree += int(self._offsets[node + 1] - self._offsets[node])
+        return degree
+
+    def nodes(self) -> Iterator[str]:
+        """Entity ids that have at least one edge."""
+        return iter(self._node_ids)
+
+    @property
+    def node_count(self) -> int:
+        """Number of entities that have at least one edge."""
+        return len(self._node_ids)
+
+
+class RelationshipIndex(Mapping):
+    """Read-only entity_id -> [Relationship] view over an AdjacencyGraph.
+
+    Relationship models are looked up only for the entity being read.
+    Like the defaultdict it replaces, missing entities map to an empty list.
+    """
+
+    def __init__(self, adjacency: AdjacencyGraph, relationships: Mapping):
+        """Initialize the view.
+
+        Args:
+            adjacency: The adjacency core
+            relationships: Mapping of relationship id to Relationship
+        """
+        self._adjacency = adjacency
+        self._relationships = relationships
+
+    def __getitem__(self, entity_id: str) -> List[Any]:
+        return [self._relationships[edge_id] for edge_id in self._adjacency.edge_ids(entity_id)]
+
+    def get(self, entity_id: str, default: Any = None) -> Any:
+        return self[entity_id] if entity_id in self else default
+
+    def __contains__(self, entity_id: object) -> bool:
+        return self._adjacency.degree(entity_id) > 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self._adjacency.nodes()
+
+    def __len__(self) -> int:
+        return self._adjacency.node_count
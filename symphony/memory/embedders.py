@@ -0,0 +1,252 @@
+"""Embedders shared by the vector and knowledge graph memories."""
+
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from symphony.memory.vector_index import normalize_rows
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+(?:_[^\W_]+)*")
+
+
+class HashingEmbedder:
+    """Deterministic feature-hashing embedder.
+
+    Each token is hashed (BLAKE2b, stable across processes) to a few signed
+    positions of a ``dimension``-sized vector, so a text embeds to the
+    normalized sum of sparse +/-1 projections of its tokens. There is no
+    vocabulary to grow: memory is bounded by the ``cache_size`` most recent
+    token hashes.
+
+    Like the simple embedders it is meant for development and testing, but
+    it is fast enough for bulk ingestion and safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 384,
+        features_per_token: int = 8,
+        seed: int = 0,
+        cache_size: int = 65536
+    ):
+        """Initialize the embedder.
+
+        Args:
+            dimension: Embedding dimension
+            features_per_token: Number of signed positions set per token (1-16)
+            seed: Hash key; embedders with different seeds are unrelated
+            cache_size: Maximum number of token hashes kept in memory
+        """
+        if not 1 <= features_per_token <= 16:
+            raise ValueError("features_per_token must be between 1 and 16")
+
+        self.dimension = dimension
+        self.features_per_token = features_per_token
+        self.seed = seed
+        self._token_features = lru_cache(maxsize=cache_size)(self._hash_token)
+
+    def _hash_token(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (positions, signs) a token projects to."""
+        digest = hashlib.blake2b(
+            token.encode("utf-8"),
+            digest_size=4 * self.features_per_token,
+            key=str(self.seed).encode("utf-8")
+        ).digest()
+        values = np.frombuffer(digest, dtype="<u4")
+        positions = (values & 0x7FFFFFFF) % self.dimension
+        signs = np.where(values >> 31, -1.0, 1.0).astype(np.float32)
+        return positions.astype(np.int64), signs
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase word tokens."""
+        return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+    def embed(self, text: str) -> List[float]:
+        """Create an embedding for a text string."""
+        return self.embed_batch([text])[0].tolist()
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed several texts at once.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension) with unit-length
+            rows (all-zero rows for texts without tokens)
+        """
+        tokenized = [self.tokenize(text) for text in texts]
+        size = len(texts) * self.dimension
+        vocabulary: Dict[str, int] = {}
+        token_ids = [
+            vocabulary.setdefault(token, len(vocabulary))
+            for tokens in tokenized for token in tokens
+        ]
+        if not token_ids:
+            return np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        # Hash each distinct token once, then scatter all (row, position) pairs
+        features = [self._token_features(token) for token in vocabulary]
+        positions = np.stack([feature[0] for feature in features])[token_ids]
+        signs = np.stack([feature[1] for feature in features])[token_ids]
+        rows = np.repeat(np.arange(len(texts)), [len(tokens) for tokens in tokenized])
+        positions += rows[:, None] * self.dimension
+
+        flat = np.bincount(positions.ravel(), weights=signs.ravel(), minlength=size)
+        return normalize_rows(flat.reshape(len(texts), self.dimension))
+
+
+EMBEDDER_TYPES: Dict[str, Callable[..., Any]] = {
+    "hashing": HashingEmbedder
+}
+
+
+def resolve_embedder(
+    embedder: Union[None, str, Dict[str, Any], Any],
+    default: Callable[..., Any]
+) -> Any:
+    """Turn an embedder or embedder config into an embedder instance.
+
+    Args:
+        embedder: An embedder instance, an embedder type name ("simple" or
+            "hashing"), a config dict with a "type" key plus constructor
+            arguments, or None for the default
+        default: Factory for the "simple" embedder of the calling memory
+
+    Returns:
+        The embedder
+
+    Raises:
+        ValueError: If the embedder type is not recognized
+    """
+    if embedder is None:
+        return default()
+    if isinstance(embedder, str):
+        embedder = {"type": embedder}
+    if not isinstance(embedder, dict):
+        return embedder
+
+    config = dict(embedder)
+    embedder_type = config.pop("type", "simple")
+    if embedder_type == "simple":
+        return default(**config)
+    if embedder_type in EMBEDDER_TYPES:
+        return EMBEDDER_TYPES[embedder_type](**config)
+    raise ValueError(f"Unknown embedder type: {embedder_type}")
+
+
+def embed_batch(embedder: Any, texts: Sequence[str]) -> List[List[float]]:
+    """Embed several texts with any embedder.
+
+    Uses the embedder's own ``embed_batch`` when it has one and falls back
+    to one ``embed`` call per text.
+
+    Args:
+        embedder: An object with ``embed`` and optionally ``embed_batch``
+        texts: The texts to embed
+
+    Returns:
+        One embedding per text
+    """
+    if not texts:
+        return []
+    if hasattr(embedder, "embed_batch"):
+        vectors = embedder.embed_batch(list(texts))
+        return vectors.tolist() if isinstance(vectors, np.ndarray) else [list(v) for v in vectors]
+    return [embedder.embed(text) for text in texts]
+
+
+async def aembed_batch(embedder: Any, texts: Sequence[str]) -> List[List[float]]:
+    """Asynchronously embed several texts with any embedder.
+
+    Uses the embedder's own ``aembed_batch`` when it has one, so
+    model-backed embedders can make one non-blocking request per batch.
+
+    Args:
+        embedder: An object with ``embed`` and optionally ``embed_batch``
+            or ``aembed_batch``
+        texts: The texts to embed
+
+    Returns:
+        One embedding per text
+    """
+    if texts and hasattr(embedder, "aembed_batch"):
+        vectors = await embedder.aembed_batch(list(texts))
+        return vectors.tolist() if isinstance(vectors, np.ndarray) else [list(v) for v in vectors]
+    return embed_batch(embedder, texts)
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched calls.
+
+    Each ``embed()`` call joins a pending batch, which is sent to the
+    embedder once it reaches ``max_batch_size`` texts or ``max_latency``
+    seconds after its first text. With ``max_latency=0`` a batch is sent on
+    the next event loop iteration, so only requests made concurrently (for
+    example through ``asyncio.gather``) are combined and a lone request is
+    not delayed.
+    """
+
+    def __init__(self, embedder: Any, max_batch_size: int = 64, max_latency: float = 0.0):
+        """Initialize the batcher.
+
+        Args:
+            embedder: The embedder to call
+            max_batch_size: Maximum number of texts per embedder call
+            max_latency: Maximum seconds a text waits for its batch to fill
+        """
+        self.embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max_latency
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._handle is None:
+            if self.max_latency > 0:
+                self._handle = loop.call_later(self.max_latency, self._flush)
+            else:
+                self._handle = loop.call_soon(self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several texts, sharing batches with concurrent callers."""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _flush(self) -> None:
+        """Send the pending batch to the embedder."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            vectors = await aembed_batch(self.embedder, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
@@ -0,0 +1,457 @@
+"""Columnar on-disk storage for LocalGraph.
+
+A store is a directory with a ``manifest.json`` and a ``segments/``
+directory. Each segment holds one batch of entity, relationship and
+triplet records as plain ``.npy`` columns:
+
+- string columns are a UTF-8 byte blob plus an int64 offset array
+- repeated strings (entity and relationship types, predicates, sources)
+  are interned in a per-segment string table and stored as int32 codes
+- timestamps are float64 POSIX seconds, property dicts are JSON text
+- entity and triplet embeddings are float32 matrices
+
+Columns are opened with ``np.load(mmap_mode="r")`` and Pydantic models are
+only built when a record is first accessed. Segments are append-only;
+later segments override earlier records with the same id, and
+``write_snapshot`` compacts everything into a single segment.
+"""
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import MutableMapping, MutableSequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+SEGMENTS_DIR = "segments"
+FORMAT_VERSION = 1
+PICKLE_EXTENSIONS = (".pkl", ".pickle")
+
+
+def is_columnar_path(path: str) -> bool:
+    """Decide whether a LocalGraph storage path uses the columnar format.
+
+    Existing directories are columnar stores and existing files are legacy
+    pickles. New paths are columnar unless they end in .pkl or .pickle.
+    """
+    if os.path.isdir(path):
+        return True
+    if os.path.exists(path):
+        return False
+    return not path.lower().endswith(PICKLE_EXTENSIONS)
+
+
+class _Pending:
+    """Placeholder for a record that has not been materialized yet."""
+
+    __slots__ = ("token",)
+
+    def __init__(self, token: Any):
+        self.token = token
+
+
+class LazyModelMap(MutableMapping):
+    """Id -> model mapping that materializes stored records on first access."""
+
+    def __init__(self, materialize: Callable[[Any], Any]):
+        """Initialize the mapping.
+
+        Args:
+            materialize: Builds a model from a pending token
+        """
+        self._items: Dict[str, Any] = {}
+        self._materialize = materialize
+
+    def set_pending(self, key: str, token: Any) -> None:
+        """Register a record to be materialized when first accessed."""
+        self._items[key] = _Pending(token)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._items[key]
+        if isinstance(value, _Pending):
+            value = self._items[key] = self._materialize(value.token)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._items[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._items[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class LazyModelList(MutableSequence):
+    """List of models that materializes stored records on first access."""
+
+    def __init__(self, materialize: Callable[[Any], Any]):
+        """Initialize the list.
+
+        Args:
+            materialize: Builds a model from a pending token
+        """
+        self._items: List[Any] = []
+        self._materialize = materialize
+
+    def append_pending(self, token: Any) -> None:
+        """Append a record to be materialized when first accessed."""
+        self._items.append(_Pending(token))
+
+    def _resolve(self, index: int) -> Any:
+        value = self._items[index]
+        if isinstance(value, _Pending):
+            value = self._items[index] = self._materialize(value.token)
+        return value
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolve(i) for i in range(*index.indices(len(self._items)))]
+        return self._resolve(index)
+
+    def __setitem__(self, index, value) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def insert(self, index: int, value: Any) -> None:
+        self._items.insert(index, value)
+
+
+def _save_strings(directory: str, name: str, values: Sequence[str]) -> None:
+    """Save a string column as a UTF-8 blob and offsets."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+    np.save(os.path.join(directory, f"{name}.blob.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+
+
+class _StringColumn:
+    """Memory-mapped string column decoded on access."""
+
+    def __init__(self, directory: str, name: str):
+        blob_path = os.path.join(directory, f"{name}.blob.npy")
+        try:
+            self._blob = np.load(blob_path, mmap_mode="r")
+        except ValueError:
+            self._blob = np.load(blob_path)
+        self._offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self._blob[self._offsets[row]:self._offsets[row + 1]].tobytes().decode("utf-8")
+
+    def all(self) -> List[str]:
+        """Decode the whole column at once."""
+        data = self._blob.tobytes()
+        offsets = self._offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+class _StringTable:
+    """Interns repeated strings into int32 codes (-1 for None)."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        if value not in self._codes:
+            self._codes[value] = len(self.values)
+            self.values.append(value)
+        return self._codes[value]
+
+
+def _timestamp(value: datetime.datetime) -> float:
+    return value.timestamp()
+
+
+def _datetime(value: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(float(value))
+
+
+def _dumps(value: Dict[str, Any]) -> str:
+    return json.dumps(value, default=str)
+
+
+class Segment:
+    """A read-only, memory-mapped segment of a columnar graph store."""
+
+    def __init__(self, directory: str):
+        """Open a segment.
+
+        Args:
+            directory: Path to the segment directory
+        """
+        self.directory = directory
+        self._strings = _StringColumn(directory, "strings").all()
+
+        self.entity_ids = _StringColumn(directory, "entity_id")
+        self.entity_names = _StringColumn(directory, "entity_name")
+        self.entity_types = self._load("entity_type")
+        self.entity_created = self._load("entity_created")
+        self.entity_updated = self._load("entity_updated")
+        self.entity_properties = _StringColumn(directory, "entity_properties")
+        self.entity_embedding_rows = self._load("entity_embedding_row")
+        self.entity_embeddings = self._load("entity_embeddings")
+
+        self.relationship_ids = _StringColumn(directory, "relationship_id")
+        self.relationship_sources = _StringColumn(directory, "relationship_source")
+        self.relationship_targets = _StringColumn(directory, "relationship_target")
+        self.relationship_types = self._load("relationship_type")
+        self.relationship_created = self._load("relationship_created")
+        self.relationship_updated = self._load("relationship_updated")
+        self.relationship_properties = _StringColumn(directory, "relationship_properties")
+
+        self.triplet_ids = _StringColumn(directory, "triplet_id")
+        self.triplet_subjects = _StringColumn(directory, "triplet_subject")
+        self.triplet_objects = _StringColumn(directory, "triplet_object")
+        self.triplet_predicates = self._load("triplet_predicate")
+        self.triplet_sources = self._load("triplet_source")
+        self.triplet_confidence = self._load("triplet_confidence")
+        self.triplet_created = self._load("triplet_created")
+        self.triplet_metadata = _StringColumn(directory, "triplet_metadata")
+        self.triplet_embeddings = self._load("triplet_embeddings")
+
+    def _load(self, name: str) -> np.ndarray:
+        path = os.path.join(self.directory, f"{name}.npy")
+        try:
+            return np.load(path, mmap_mode="r")
+        except ValueError:
+            # Older NumPy versions cannot memory-map empty arrays
+            return np.load(path)
+
+    def _string(self, code: int) -> Optional[str]:
+        return self._strings[code] if code >= 0 else None
+
+    def entity_fields(self, row: int) -> Dict[str, Any]:
+        """Get the fields of an entity row, ready for model construction."""
+        embedding_row = int(self.entity_embedding_rows[row])
+        return {
+            "id": self.entity_ids[row],
+            "name": self.entity_names[row],
+            "type": self._string(int(self.entity_types[row])),
+            "created_at": _datetime(self.entity_created[row]),
+            "updated_at": _datetime(self.entity_updated[row]),
+            "embedding": self.entity_embeddings[embedding_row].tolist() if embedding_row >= 0 else None,
+            "properties": json.loads(self.entity_properties[row])
+        }
+
+    def relationship_type_names(self) -> List[Optional[str]]:
+        """Get the type of every relationship row."""
+        return [self._string(code) for code in self.relationship_types.tolist()]
+
+    def relationship_fields(self, row: int) -> Dict[str, Any]:
+        """Get the fields of a relationship row, ready for model construction."""
+        return {
+            "id": self.relationship_ids[row],
+            "source_id": self.relationship_sources[row],
+            "target_id": self.relationship_targets[row],
+            "type": self._string(int(self.relationship_types[row])),
+            "created_at": _datetime(self.relationship_created[row]),
+            "updated_at": _datetime(self.relationship_updated[row]),
+            "properties": json.loads(self.relationship_properties[row])
+        }
+
+    def triplet_fields(self, row: int) -> Dict[str, Any]:
+        """Get the fields of a triplet row, ready for model construction."""
+        return {
+            "id": self.triplet_ids[row],
+            "subject": self.triplet_subjects[row],
+            "predicate": self._string(int(self.triplet_predicates[row])),
+            "object": self.triplet_objects[row],
+            "confidence": float(self.triplet_confidence[row]),
+            "created_at": _datetime(self.triplet_created[row]),
+            "source": self._string(int(self.triplet_sources[row])),
+            "metadata": json.loads(self.triplet_metadata[row])
+        }
+
+
+def write_segment(
+    directory: str,
+    entities: Iterable[Any],
+    relationships: Iterable[Any],
+    triplets: Iterable[Any],
+    triplet_embeddings: Optional[np.ndarray] = None
+) -> None:
+    """Write records into a new segment directory.
+
+    Args:
+        directory: Segment directory to create
+        entities: Entity models
+        relationships: Relationship models
+        triplets: KnowledgeTriplet models
+        triplet_embeddings: Normalized triplet embeddings, one row per triplet
+    """
+    os.makedirs(directory)
+    strings = _StringTable()
+
+    def save(name: str, values: Any, dtype: Any) -> None:
+        np.save(os.path.join(directory, f"{name}.npy"), np.asarray(values, dtype=dtype))
+
+    entities = list(entities)
+    embeddings: List[List[float]] = []
+    embedding_rows = []
+    for entity in entities:
+        if entity.embedding and (not embeddings or len(entity.embedding) == len(embeddings[0])):
+            embedding_rows.append(len(embeddings))
+            embeddings.append(entity.embedding)
+        else:
+            embedding_rows.append(-1)
+
+    _save_strings(directory, "entity_id", [e.id for e in entities])
+    _save_strings(directory, "entity_name", [e.name for e in entities])
+    save("entity_type", [strings.code(e.type) for e in entities], np.int32)
+    save("entity_created", [_timestamp(e.created_at) for e in entities], np.float64)
+    save("entity_updated", [_timestamp(e.updated_at) for e in entities], np.float64)
+    _save_strings(directory, "entity_properties", [_dumps(e.properties) for e in entities])
+    save("entity_embedding_row", embedding_rows, np.int32)
+    save(
+        "entity_embeddings",
+        embeddings if embeddings else np.zeros((0, 0), dtype=np.float32),
+        np.float32
+    )
+
+    relationships = list(relationships)
+    _save_strings(directory, "relationship_id", [r.id for r in relationships])
+    _save_strings(directory, "relationship_source", [r.source_id for r in relationships])
+    _save_strings(directory, "relationship_target", [r.target_id for r in relationships])
+    save("relationship_type", [strings.code(r.type) for r in relationships], np.int32)
+    save("relationship_created", [_timestamp(r.created_at) for r in relationships], np.float64)
+    save("relationship_updated", [_timestamp(r.updated_at) for r in relationships], np.float64)
+    _save_strings(directory, "relationship_properties", [_dumps(r.properties) for r in relationships])
+
+    triplets = list(triplets)
+    _save_strings(directory, "triplet_id", [t.id for t in triplets])
+    _save_strings(directory, "triplet_subject", [t.subject for t in triplets])
+    _save_strings(directory, "triplet_object", [t.object for t in triplets])
+    save("triplet_predicate", [strings.code(t.predicate) for t in triplets], np.int32)
+    save("triplet_source", [strings.code(t.source) for t in triplets], np.int32)
+    save("triplet_confidence", [t.confidence for t in triplets], np.float64)
+    save("triplet_created", [_timestamp(t.created_at) for t in triplets], np.float64)
+    _save_strings(directory, "triplet_metadata", [_dumps(t.metadata) for t in triplets])
+    if triplet_embeddings is None:
+        triplet_embeddings = np.zeros((len(triplets), 0), dtype=np.float32)
+    save("triplet_embeddings", triplet_embeddings, np.float32)
+
+    _save_strings(directory, "strings", strings.values)
+
+
+class ColumnarGraphStore:
+    """Directory of append-only columnar segments plus a manifest."""
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: Store directory
+        """
+        self.path = path
+        self.segments_path = os.path.join(path, SEGMENTS_DIR)
+
+    def exists(self) -> bool:
+        """Whether the store has a manifest on disk."""
+        return os.path.exists(os.path.join(self.path, MANIFEST_FILE))
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.exists():
+            return {"version": FORMAT_VERSION, "segments": [], "next_segment": 1}
+        with open(os.path.join(self.path, MANIFEST_FILE), "r") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Atomically replace the manifest."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".manifest-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+    def segment_names(self) -> List[str]:
+        """Names of the live segments, oldest first."""
+        return list(self._read_manifest()["segments"])
+
+    def open_segments(self) -> List[Segment]:
+        """Open all live segments, oldest first."""
+        return [
+            Segment(os.path.join(self.segments_path, name))
+            for name in self.segment_names()
+        ]
+
+    def _new_segment(self, manifest: Dict[str, Any], *records: Any) -> str:
+        """Write a segment to a temp directory and move it into place."""
+        os.makedirs(self.segments_path, exist_ok=True)
+        name = f"{manifest['next_segment']:06d}"
+        tmp_dir = tempfile.mkdtemp(dir=self.segments_path, prefix=".tmp-")
+        os.rmdir(tmp_dir)
+        write_segment(tmp_dir, *records)
+        os.replace(tmp_dir, os.path.join(self.segments_path, name))
+        manifest["next_segment"] += 1
+        return name
+
+    def append_segment(
+        self,
+        entities: Iterable[Any],
+        relationships: Iterable[Any],
+        triplets: Iterable[Any],
+        triplet_embeddings: Optional[np.ndarray] = None
+    ) -> None:
+        """Append a segment of new or updated records."""
+        manifest = self._read_manifest()
+        name = self._new_segment(manifest, entities, relationships, triplets, triplet_embeddings)
+        manifest["segments"].append(name)
+        self._write_manifest(manifest)
+
+    def write_snapshot(
+        self,
+        entities: Iterable[Any],
+        relationships: Iterable[Any],
+        triplets: Iterable[Any],
+        triplet_embeddings: Optional[np.ndarray] = None
+    ) -> None:
+        """Replace all segments with a single segment holding every record."""
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._read_manifest()
+        name = self._new_segment(manifest, entities, relationships, triplets, triplet_embeddings)
+        manifest["segments"] = [name]
+        self._write_manifest(manifest)
+
+        # Remove replaced segments and leftovers from interrupted writes
+        for entry in os.listdir(self.segments_path):
+            if entry != name:
+                shutil.rmtree(os.path.join(self.segments_path, entry), ignore_errors=True)
+
+
+def latest_rows(
+    segments: Sequence[Segment],
+    ids_of: Callable[[Segment], "_StringColumn"]
+) -> Dict[str, Tuple[int, int]]:
+    """Map each id to the (segment number, row) of its most recent record."""
+    rows: Dict[str, Tuple[int, int]] = {}
+    for segment_no, segment in enumerate(segments):
+        for row, id in enumerate(ids_of(segment).all()):
+            rows[id] = (segment_no, row)
+    return rows
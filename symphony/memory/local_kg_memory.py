@@ -1,13 +1,13 @@
 """Local knowledge graph memory implementation inspired by Zep semantics."""
 
 import asyncio
+import bisect
 import datetime
 import json
 import os
 import pickle
 import time
 import uuid
-from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
@@ -15,7 +15,18 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import numpy as np
 from pydantic import BaseModel, Field, model_validator
 
+from symphony.memory.adjacency import AdjacencyGraph, RelationshipIndex
 from symphony.memory.base import BaseMemory
+from symphony.memory.embedders import EmbeddingBatcher, embed_batch, resolve_embedder
+from symphony.memory.persistence import WriteBehind, atomic_pickle_dump
+from symphony.memory.graph_store import (
+    ColumnarGraphStore,
+    LazyModelList,
+    LazyModelMap,
+    is_columnar_path,
+    latest_rows
+)
+from symphony.memory.vector_index import VectorIndex, cosine_similarities, normalize_rows, top_k_indices
 from symphony.utils.types import Message
 
 
@@ -74,6 +85,18 @@ class EmbeddingModel:
     def embed(self, text: str) -> List[float]:
         """Generate an embedding for the given text."""
         raise NotImplementedError("Subclasses must implement this method")
+    
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts.
+        
+        Model-backed subclasses should override this to embed the whole
+        batch in one request.
+        """
+        return [self.embed(text) for text in texts]
+    
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously generate embeddings for several texts."""
+        return self.embed_batch(texts)
 
 
 class SimpleEmbeddingModel(EmbeddingModel):
@@ -119,8 +142,9 @@ class SimpleEmbeddingModel(EmbeddingModel):
         """Get a vector for a word, creating a new one if needed."""
         if word not in self.word_vectors:
             # Create a deterministic vector based on the word
-            np.random.seed(hash(word) % 2**32)
-            self.word_vectors[word] = np.random.randn(self.dimension).tolist()
+            # (a private RandomState gives the same values without touching the global RNG)
+            seed = hash(word) % 2**32
+            self.word_vectors[word] = np.random.RandomState(seed).randn(self.dimension).tolist()
             
         return self.word_vectors[word]
 
@@ -277,21 +301,37 @@ Knowledge Triplets:"""
 class LocalGraph:
     """A local graph implementation for storing entities and relationships."""
     
-    def __init__(self, embedding_model: Optional[EmbeddingModel] = None):
-        """Initialize the local graph."""
+    def __init__(self, embedding_model: Union[EmbeddingModel, str, Dict[str, Any], None] = None):
+        """Initialize the local graph.
+        
+        Args:
+            embedding_model: Embedding model, or an embedder type name or config
+                dict such as {"type": "hashing", "dimension": 384}
+                (defaults to SimpleEmbeddingModel)
+        """
         self.entities: Dict[str, Entity] = {}  # id -> Entity
         self.entity_names: Dict[str, str] = {}  # name -> id
         self.relationships: Dict[str, Relationship] = {}  # id -> Relationship
-        self.rel_index: Dict[str, List[Relationship]] = defaultdict(list)  # entity_id -> [Relationships]
+        self.adjacency = AdjacencyGraph()  # interned (source, type, target) edges
+        self.rel_index = RelationshipIndex(self.adjacency, self.relationships)  # entity_id -> [Relationships]
+        self.entity_index = VectorIndex()  # entity_id -> name embedding
         self.triplets: List[KnowledgeTriplet] = []
-        self.embedding_model = embedding_model or SimpleEmbeddingModel()
+        self.triplet_index = VectorIndex()  # triplet_id -> embedding of triplet.as_text()
+        self._triplets_by_id: Dict[str, KnowledgeTriplet] = {}
+        self.embedding_model = resolve_embedder(embedding_model, SimpleEmbeddingModel)
         self._last_modified = datetime.datetime.now()
+        
+        # Changes not yet written by save_changes()
+        self._dirty_entities: Set[str] = set()
+        self._dirty_relationships: Set[str] = set()
+        self._persisted_triplets = 0
     
     def add_entity(
         self, 
         name: str, 
         entity_type: Optional[str] = None,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None
     ) -> Entity:
         """Add an entity to the graph.
         
@@ -299,6 +339,7 @@ class LocalGraph:
             name: The name of the entity
             entity_type: Optional type of the entity
             properties: Optional properties for the entity
+            embedding: Precomputed embedding of the name, used if the entity is new
             
         Returns:
             The added entity
@@ -312,10 +353,12 @@ class LocalGraph:
             if entity_type and entity_type != entity.type:
                 entity.type = entity_type
                 entity.updated_at = datetime.datetime.now()
+                self._dirty_entities.add(entity_id)
                 
             if properties:
                 entity.properties.update(properties)
                 entity.updated_at = datetime.datetime.now()
+                self._dirty_entities.add(entity_id)
                 
             return entity
         
@@ -324,15 +367,24 @@ class LocalGraph:
             name=name,
             type=entity_type,
             properties=properties or {},
-            embedding=self.embedding_model.embed(name)
+            embedding=embedding if embedding is not None else self.embedding_model.embed(name)
         )
         
         # Add to storage
         self.entities[entity.id] = entity
         self.entity_names[name] = entity.id
+        self._index_entity(entity)
+        self._dirty_entities.add(entity.id)
         
         return entity
     
+    def _index_entity(self, entity: Entity) -> None:
+        """Add an entity's embedding to the entity index, if it has a compatible one."""
+        if entity.embedding and (
+            self.entity_index.dimension in (None, len(entity.embedding))
+        ):
+            self.entity_index.add(entity.id, entity.embedding)
+    
     def get_entity(self, identifier: str) -> Optional[Entity]:
         """Get an entity by ID or name.
         
@@ -382,6 +434,19 @@ class LocalGraph:
         if not target_entity:
             target_entity = self.add_entity(name=target if isinstance(target, str) else "unknown")
         
+        # Check for duplicates
+        existing_id = self.adjacency.find(source_entity.id, relationship_type, target_entity.id)
+        if existing_id is not None:
+            existing_rel = self.relationships[existing_id]
+            
+            # Update properties if provided
+            if properties:
+                existing_rel.properties.update(properties)
+                existing_rel.updated_at = datetime.datetime.now()
+                self._dirty_relationships.add(existing_rel.id)
+            
+            return existing_rel
+        
         # Create relationship
         relationship = Relationship(
             source_id=source_entity.id,
@@ -390,40 +455,37 @@ class LocalGraph:
             properties=properties or {}
         )
         
-        # Check for duplicates
-        for existing_rel in self.rel_index[source_entity.id]:
-            if (existing_rel.source_id == relationship.source_id and
-                existing_rel.type == relationship.type and
-                existing_rel.target_id == relationship.target_id):
-                
-                # Update properties if provided
-                if properties:
-                    existing_rel.properties.update(properties)
-                    existing_rel.updated_at = datetime.datetime.now()
-                
-                return existing_rel
-        
         # Add to storage
         self.relationships[relationship.id] = relationship
-        self.rel_index[source_entity.id].append(relationship)
-        self.rel_index[target_entity.id].append(relationship)
+        self._dirty_relationships.add(relationship.id)
+        self.adjacency.add(relationship.id, source_entity.id, relationship_type, target_entity.id)
         
         return relationship
     
-    def add_triplet(self, triplet: KnowledgeTriplet) -> Tuple[Entity, Relationship, Entity]:
+    def add_triplet(
+        self,
+        triplet: KnowledgeTriplet,
+        embeddings: Optional[Dict[str, List[float]]] = None
+    ) -> Tuple[Entity, Relationship, Entity]:
         """Add a knowledge triplet to the graph.
         
         Args:
             triplet: The triplet to add
+            embeddings: Precomputed embeddings keyed by text, covering
+                texts_to_embed(triplet); computed in one batch if omitted
             
         Returns:
             Tuple of (subject entity, relationship, object entity)
         """
+        if embeddings is None:
+            texts = self.texts_to_embed(triplet)
+            embeddings = dict(zip(texts, embed_batch(self.embedding_model, texts)))
+        
         # Add subject entity
-        subject_entity = self.add_entity(triplet.subject)
+        subject_entity = self.add_entity(triplet.subject, embedding=embeddings.get(triplet.subject))
         
         # Add object entity
-        object_entity = self.add_entity(triplet.object)
+        object_entity = self.add_entity(triplet.object, embedding=embeddings.get(triplet.object))
         
         # Add relationship
         relationship = self.add_relationship(
@@ -433,11 +495,29 @@ class LocalGraph:
             properties={"confidence": triplet.confidence, "source": triplet.source}
         )
         
-        # Store triplet
+        # Store triplet and index its embedding once
         self.triplets.append(triplet)
+        self._index_triplet(triplet, embeddings.get(triplet.as_text()))
         
         return (subject_entity, relationship, object_entity)
     
+    def texts_to_embed(self, triplet: KnowledgeTriplet) -> List[str]:
+        """Get the texts add_triplet() needs embeddings for.
+        
+        These are the triplet text plus any subject or object that is not
+        an entity yet.
+        """
+        texts = [name for name in (triplet.subject, triplet.object) if name not in self.entity_names]
+        texts.append(triplet.as_text())
+        return list(dict.fromkeys(texts))
+    
+    def _index_triplet(self, triplet: KnowledgeTriplet, embedding: Optional[List[float]] = None) -> None:
+        """Add a triplet's text embedding to the triplet index, embedding it if needed."""
+        self._triplets_by_id[triplet.id] = triplet
+        if embedding is None:
+            embedding = self.embedding_model.embed(triplet.as_text())
+        self.triplet_index.add(triplet.id, embedding)
+    
     def get_entity_relationships(self, entity_identifier: str) -> List[Tuple[Entity, str, Entity]]:
         """Get all relationships involving an entity.
         
@@ -487,17 +567,11 @@ class LocalGraph:
         # Create query embedding
         query_embedding = self.embedding_model.embed(query)
         
-        # Calculate similarity with all entities
-        results = []
-        for entity in self.entities.values():
-            if entity.embedding:
-                similarity = self._cosine_similarity(query_embedding, entity.embedding)
-                if similarity >= threshold:
-                    results.append((entity, similarity))
-        
-        # Sort by similarity and limit
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+        # Score all indexed entities in one pass
+        return [
+            (self.entities[entity_id], similarity)
+            for entity_id, similarity in self.entity_index.search(query_embedding, limit, threshold)
+        ]
     
     def search_triplets(
         self, 
@@ -519,57 +593,123 @@ class LocalGraph:
         # Create query embedding
         query_embedding = self.embedding_model.embed(query)
         
-        # Calculate similarity with all triplets
-        results = []
-        for triplet in self.triplets:
-            triplet_text = triplet.as_text()
-            triplet_embedding = self.embedding_model.embed(triplet_text)
+        # Score all indexed triplets in one pass
+        return [
+            (self._triplets_by_id[triplet_id], similarity)
+            for triplet_id, similarity in self.triplet_index.search(query_embedding, limit)
+        ]
+    
+    def save(self, filepath: str) -> None:
+        """Save the whole graph.
+        
+        Paths ending in .pkl or .pickle (or existing pickle files) are
+        written as a single pickle; any other path is written as a
+        columnar store directory compacted into one segment.
+        
+        Args:
+            filepath: The path to save to
+        """
+        if is_columnar_path(filepath):
+            triplets = list(self.triplets)
+            ColumnarGraphStore(filepath).write_snapshot(
+                self.entities.values(),
+                self.relationships.values(),
+                triplets,
+                self._triplet_matrix(triplets)
+            )
+        else:
+            data = {
+                "entities": {k: v.model_dump() for k, v in self.entities.items()},
+                "entity_names": self.entity_names,
+                "relationships": {k: v.model_dump() for k, v in self.relationships.items()},
+                "triplets": [t.model_dump() for t in self.triplets],
+                "triplet_index": {
+                    "ids": list(self.triplet_index.ids),
+                    "matrix": self.triplet_index.matrix.copy()
+                }
+            }
             
-            similarity = self._cosine_similarity(query_embedding, triplet_embedding)
-            results.append((triplet, similarity))
+            atomic_pickle_dump(data, filepath)
         
-        # Sort by similarity and limit
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+        self._mark_clean()
     
-    def save(self, filepath: str) -> None:
-        """Save the graph to a file.
+    def save_changes(self, filepath: str, max_segments: int = 32) -> None:
+        """Persist only what changed since the last save or load.
+        
+        For columnar stores this appends one segment with the new and
+        updated records. Pickle paths, missing stores and stores that
+        already have ``max_segments`` segments get a full save instead.
         
         Args:
             filepath: The path to save to
+            max_segments: Segment count at which the store is compacted
         """
-        data = {
-            "entities": {k: v.model_dump() for k, v in self.entities.items()},
-            "entity_names": self.entity_names,
-            "relationships": {k: v.model_dump() for k, v in self.relationships.items()},
-            "triplets": [t.model_dump() for t in self.triplets]
-        }
+        store = ColumnarGraphStore(filepath)
+        if (
+            not is_columnar_path(filepath)
+            or not store.exists()
+            or len(store.segment_names()) >= max_segments
+        ):
+            self.save(filepath)
+            return
+        
+        triplets = self.triplets[self._persisted_triplets:]
+        if not (self._dirty_entities or self._dirty_relationships or triplets):
+            return
         
-        with open(filepath, "wb") as f:
-            pickle.dump(data, f)
+        store.append_segment(
+            [self.entities[id] for id in self._dirty_entities if id in self.entities],
+            [self.relationships[id] for id in self._dirty_relationships if id in self.relationships],
+            triplets,
+            self._triplet_matrix(triplets)
+        )
+        self._mark_clean()
+    
+    def _mark_clean(self) -> None:
+        """Record that every current record has been persisted."""
+        self._dirty_entities.clear()
+        self._dirty_relationships.clear()
+        self._persisted_triplets = len(self.triplets)
+    
+    def _triplet_matrix(self, triplets: List[KnowledgeTriplet]) -> Optional[np.ndarray]:
+        """Get the indexed (normalized) embeddings of triplets, in order."""
+        rows = [self.triplet_index.row(triplet.id) for triplet in triplets]
+        if not rows or None in rows:
+            return None
+        return self.triplet_index.matrix[rows]
     
     def load(self, filepath: str) -> None:
-        """Load the graph from a file.
+        """Load the graph from a file or columnar store directory.
         
         Args:
             filepath: The path to load from
         """
         if not os.path.exists(filepath):
             return
+        
+        if os.path.isdir(filepath):
+            self._load_columnar(filepath)
+            self._mark_clean()
+            return
             
         with open(filepath, "rb") as f:
             data = pickle.load(f)
             
         # Clear current data
-        self.entities.clear()
-        self.entity_names.clear()
-        self.relationships.clear()
-        self.rel_index.clear()
+        self.entities = {}
+        self.entity_names = {}
+        self.relationships = {}
+        self.adjacency = AdjacencyGraph()
+        self.rel_index = RelationshipIndex(self.adjacency, self.relationships)
+        self.entity_index = VectorIndex()
         self.triplets = []
+        self.triplet_index = VectorIndex()
+        self._triplets_by_id = {}
         
         # Load entities
         for entity_id, entity_data in data["entities"].items():
             self.entities[entity_id] = Entity(**entity_data)
+            self._index_entity(self.entities[entity_id])
             
         # Load entity names
         self.entity_names = data["entity_names"]
@@ -578,26 +718,118 @@ class LocalGraph:
         for rel_id, rel_data in data["relationships"].items():
             relationship = Relationship(**rel_data)
             self.relationships[rel_id] = relationship
-            self.rel_index[relationship.source_id].append(relationship)
-            self.rel_index[relationship.target_id].append(relationship)
+            self.adjacency.add(
+                rel_id, relationship.source_id, relationship.type, relationship.target_id
+            )
             
         # Load triplets
         for triplet_data in data["triplets"]:
-            self.triplets.append(KnowledgeTriplet(**triplet_data))
+            triplet = KnowledgeTriplet(**triplet_data)
+            self.triplets.append(triplet)
+            self._triplets_by_id[triplet.id] = triplet
+            
+        # Restore the triplet index, embedding only triplets it doesn't cover
+        # (files written before the index was persisted have none)
+        index_data = data.get("triplet_index")
+        if index_data and len(index_data["ids"]) and (
+            index_data["matrix"].shape[1] == getattr(self.embedding_model, "dimension", None)
+        ):
+            self.triplet_index = VectorIndex.from_matrix(index_data["ids"], index_data["matrix"])
+        for triplet in self.triplets:
+            if triplet.id not in self.triplet_index:
+                self._index_triplet(triplet)
+        
+        self._mark_clean()
+    
+    def _load_columnar(self, filepath: str) -> None:
+        """Load a columnar store, deferring model construction until access."""
+        segments = ColumnarGraphStore(filepath).open_segments()
+        
+        entity_rows = latest_rows(segments, lambda segment: segment.entity_ids)
+        relationship_rows = latest_rows(segments, lambda segment: segment.relationship_ids)
+        
+        self.entities = LazyModelMap(
+            lambda loc: Entity.model_construct(**segments[loc[0]].entity_fields(loc[1]))
+        )
+        self.relationships = LazyModelMap(
+            lambda loc: Relationship.model_construct(**segments[loc[0]].relationship_fields(loc[1]))
+        )
+        self._triplets_by_id = LazyModelMap(
+            lambda loc: KnowledgeTriplet.model_construct(**segments[loc[0]].triplet_fields(loc[1]))
+        )
+        self.triplets = LazyModelList(lambda id: self._triplets_by_id[id])
+        self.adjacency = AdjacencyGraph()
+        self.rel_index = RelationshipIndex(self.adjacency, self.relationships)
+        self.entity_names = {}
+        
+        names = [segment.entity_names.all() for segment in segments]
+        for entity_id, loc in entity_rows.items():
+            self.entities.set_pending(entity_id, loc)
+            self.entity_names[names[loc[0]][loc[1]]] = entity_id
+        
+        sources = [segment.relationship_sources.all() for segment in segments]
+        targets = [segment.relationship_targets.all() for segment in segments]
+        types = [segment.relationship_type_names() for segment in segments]
+        for rel_id, loc in relationship_rows.items():
+            self.relationships.set_pending(rel_id, loc)
+            self.adjacency.add(
+                rel_id, sources[loc[0]][loc[1]], types[loc[0]][loc[1]], targets[loc[0]][loc[1]]
+            )
+        
+        # Entity index: stored embeddings of the latest entity rows
+        entity_ids: List[str] = []
+        entity_vectors: List[np.ndarray] = []
+        for segment_no, segment in enumerate(segments):
+            ids = segment.entity_ids.all()
+            rows = [
+                row for row, id in enumerate(ids)
+                if entity_rows[id] == (segment_no, row) and segment.entity_embedding_rows[row] >= 0
+            ]
+            if rows:
+                entity_ids.extend(ids[row] for row in rows)
+                entity_vectors.append(segment.entity_embeddings[segment.entity_embedding_rows[rows]])
+        dimensions = {vectors.shape[1] for vectors in entity_vectors}
+        if len(dimensions) == 1:
+            self.entity_index = VectorIndex.from_matrix(
+                entity_ids, normalize_rows(np.concatenate(entity_vectors)), copy=False
+            )
+        else:
+            self.entity_index = VectorIndex()
+            for entity_id in entity_ids:
+                self._index_entity(self.entities[entity_id])
+        
+        # Triplets are append-only, so segments hold disjoint triplets
+        triplet_ids: List[str] = []
+        matrices: List[np.ndarray] = []
+        dimension = getattr(self.embedding_model, "dimension", None)
+        for segment_no, segment in enumerate(segments):
+            ids = segment.triplet_ids.all()
+            for row, triplet_id in enumerate(ids):
+                self._triplets_by_id.set_pending(triplet_id, (segment_no, row))
+                self.triplets.append_pending(triplet_id)
+            if ids and segment.triplet_embeddings.shape == (len(ids), dimension):
+                triplet_ids.extend(ids)
+                matrices.append(segment.triplet_embeddings)
+        
+        if len(matrices) == 1 and len(set(triplet_ids)) == len(triplet_ids):
+            self.triplet_index = VectorIndex.from_matrix(triplet_ids, matrices[0], copy=False)
+        elif matrices:
+            unique = {id: row for row, id in enumerate(triplet_ids)}
+            self.triplet_index = VectorIndex.from_matrix(
+                list(unique), np.concatenate(matrices)[list(unique.values())]
+            )
+        else:
+            self.triplet_index = VectorIndex()
+        for triplet_id in self._triplets_by_id:
+            if triplet_id not in self.triplet_index:
+                self._index_triplet(self._triplets_by_id[triplet_id])
     
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         if not vec1 or not vec2 or len(vec1) != len(vec2):
             return 0.0
             
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-            
-        return dot_product / (norm1 * norm2)
+        return float(cosine_similarities(vec1, [vec2])[0])
 
 
 class LocalKnowledgeGraphMemory(BaseMemory):
@@ -606,22 +838,33 @@ class LocalKnowledgeGraphMemory(BaseMemory):
     def __init__(
         self, 
         llm_client = None,
-        embedding_model: Optional[EmbeddingModel] = None,
+        embedding_model: Union[EmbeddingModel, str, Dict[str, Any], None] = None,
         storage_path: Optional[str] = None,
-        auto_extract: bool = True
+        auto_extract: bool = True,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_dirty: int = 100
     ):
         """Initialize the knowledge graph memory.
         
         Args:
             llm_client: LLM client for triplet extraction
-            embedding_model: Optional embedding model to use
-            storage_path: Optional path to persist the graph
+            embedding_model: Optional embedding model, or embedder type name or config dict
+            storage_path: Optional path to persist the graph (a columnar store
+                directory, or a pickle file if it ends in .pkl or .pickle)
             auto_extract: Whether to extract triplets from text automatically
+            write_behind: Whether to batch writes instead of saving on every change
+            flush_interval: Seconds before pending writes are flushed in the background
+            max_dirty: Number of pending changes that forces a flush
         """
         self.llm_client = llm_client
         self.graph = LocalGraph(embedding_model=embedding_model)
         self.storage_path = storage_path
         self.auto_extract = auto_extract
+        self._write_behind = (
+            WriteBehind(self._save_changes, flush_interval, max_dirty) if write_behind else None
+        )
+        self._batcher = EmbeddingBatcher(self.graph.embedding_model)
         
         # Initialize triplet extractor if auto_extract is enabled
         if auto_extract and llm_client:
@@ -642,12 +885,13 @@ class LocalKnowledgeGraphMemory(BaseMemory):
         """
         if isinstance(value, KnowledgeTriplet):
             # Store a triplet directly
-            self.graph.add_triplet(value)
+            await self._add_graph_triplet(value)
         elif isinstance(value, str) and len(value) > 0:
             # Store as document and extract triplets if enabled
             document_entity = self.graph.add_entity(
                 name=key,
                 entity_type="document",
+                embedding=await self._entity_embedding(key),
                 properties={"content": value, "timestamp": datetime.datetime.now().isoformat()}
             )
             
@@ -655,7 +899,7 @@ class LocalKnowledgeGraphMemory(BaseMemory):
             if self.auto_extract and self.extractor:
                 triplets = await self.extractor.extract_triplets(value)
                 for triplet in triplets:
-                    self.graph.add_triplet(triplet)
+                    await self._add_graph_triplet(triplet)
                     
                     # Link document to triplet
                     self.graph.add_relationship(
@@ -674,7 +918,7 @@ class LocalKnowledgeGraphMemory(BaseMemory):
         
         # Persist if storage path is set
         if self.storage_path:
-            self.graph.save(self.storage_path)
+            self._persist()
     
     async def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve a value from the knowledge graph memory.
@@ -856,11 +1100,11 @@ List them one per line.
             source=source
         )
         
-        self.graph.add_triplet(triplet)
+        await self._add_graph_triplet(triplet)
         
         # Persist if storage path is set
         if self.storage_path:
-            self.graph.save(self.storage_path)
+            self._persist()
             
         return triplet
     
@@ -927,6 +1171,7 @@ List them one per line.
             doc_entity = self.graph.add_entity(
                 name=doc_id,
                 entity_type="document",
+                embedding=await self._entity_embedding(doc_id),
                 properties={
                     "content": text,
                     "timestamp": datetime.datetime.now().isoformat(),
@@ -944,7 +1189,7 @@ List them one per line.
                 
         # Store triplets and link to document
         for triplet in triplets:
-            subject_entity, _, object_entity = self.graph.add_triplet(triplet)
+            subject_entity, _, object_entity = await self._add_graph_triplet(triplet)
             
             # Link document to entities
             if store_text and doc_entity:
@@ -962,7 +1207,7 @@ List them one per line.
             
         # Persist if storage path is set
         if self.storage_path:
-            self.graph.save(self.storage_path)
+            self._persist()
             
         return triplets
         
@@ -991,6 +1236,7 @@ List them one per line.
             doc_entity = self.graph.add_entity(
                 name=doc_id,
                 entity_type="document",
+                embedding=await self._entity_embedding(doc_id),
                 properties={
                     "content": text,
                     "timestamp": datetime.datetime.now().isoformat(),
@@ -1011,7 +1257,7 @@ List them one per line.
                     
             # Store triplets and link to document
             for triplet in triplets:
-                subject_entity, _, object_entity = self.graph.add_triplet(triplet)
+                subject_entity, _, object_entity = await self._add_graph_triplet(triplet)
                 
                 # Link document to entities (only if we stored the text)
                 if doc_entity:
@@ -1031,10 +1277,43 @@ List them one per line.
         
         # Persist if storage path is set
         if self.storage_path:
-            self.graph.save(self.storage_path)
+            self._persist()
             
         return results
     
+    async def _entity_embedding(self, name: str) -> Optional[List[float]]:
+        """Embed a name through the batcher unless it is already an entity."""
+        if name in self.graph.entity_names:
+            return None
+        return await self._batcher.embed(name)
+    
+    async def _add_graph_triplet(self, triplet: KnowledgeTriplet) -> Tuple[Entity, Relationship, Entity]:
+        """Add a triplet to the graph, embedding its texts through the batcher."""
+        texts = self.graph.texts_to_embed(triplet)
+        embeddings = await self._batcher.embed_many(texts)
+        return self.graph.add_triplet(triplet, dict(zip(texts, embeddings)))
+    
+    def _persist(self) -> None:
+        """Save changes now, or queue them when write-behind is enabled."""
+        if self._write_behind:
+            self._write_behind.mark_dirty()
+        else:
+            self._save_changes()
+    
+    def _save_changes(self) -> None:
+        """Append unsaved graph changes to storage."""
+        self.graph.save_changes(self.storage_path)
+    
+    def flush(self) -> None:
+        """Write any changes queued by write-behind to storage."""
+        if self._write_behind:
+            self._write_behind.flush()
+    
+    async def aclose(self) -> None:
+        """Stop background flushing and write any queued changes."""
+        if self._write_behind:
+            await self._write_behind.aclose()
+    
     def load(self) -> None:
         """Load the graph from storage."""
         if self.storage_path and os.path.exists(self.storage_path):
@@ -1208,13 +1487,21 @@ class ConversationKnowledgeGraphMemory(LocalKnowledgeGraphMemory):
     def __init__(
         self, 
         llm_client = None,
-        embedding_model: Optional[EmbeddingModel] = None,
+        embedding_model: Union[EmbeddingModel, str, Dict[str, Any], None] = None,
         storage_path: Optional[str] = None,
-        auto_extract: bool = True
+        auto_extract: bool = True,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_dirty: int = 100
     ):
         """Initialize conversation knowledge graph memory."""
-        super().__init__(llm_client, embedding_model, storage_path, auto_extract)
+        super().__init__(
+            llm_client, embedding_model, storage_path, auto_extract,
+            write_behind, flush_interval, max_dirty
+        )
         self._messages: List[Message] = []
+        self._message_index = VectorIndex()  # one row per non-empty message, in order
+        self._message_positions: List[int] = []  # row -> index in self._messages
         
     async def add_message(self, message: Message) -> None:
         """Add a message to the conversation history.
@@ -1222,34 +1509,48 @@ class ConversationKnowledgeGraphMemory(LocalKnowledgeGraphMemory):
         Args:
             message: The message to add
         """
-        # Add to local list
+        # Embed once for later searches (batched with concurrent calls), then
+        # add to the local list without yielding so positions stay ordered
+        embeddings = await self._batcher.embed_many(
+            [message.content] if message.content else []
+        )
         self._messages.append(message)
-        
-        # Create message entity
-        message_id = f"message_{len(self._messages)}"
+        index = len(self._messages) - 1
+        message_id = f"message_{index + 1}"
+        if embeddings:
+            self._message_index.add(message_id, embeddings[0])
+            self._message_positions.append(index)
+        
+        # Create message entity (concurrent calls may append more messages
+        # while the name is embedded, so only the captured index is used)
         message_entity = self.graph.add_entity(
             name=message_id,
             entity_type="message",
+            embedding=await self._entity_embedding(message_id),
             properties={
                 "content": message.content,
                 "role": message.role,
-                "index": len(self._messages) - 1,
+                "index": index,
                 "timestamp": datetime.datetime.now().isoformat(),
                 **message.additional_kwargs
             }
         )
         
-        # Link to previous message if exists
-        if len(self._messages) > 1:
-            prev_message_id = f"message_{len(self._messages) - 1}"
-            prev_message = self.graph.get_entity(prev_message_id)
-            
-            if prev_message:
-                self.graph.add_relationship(
-                    source=prev_message,
-                    relationship_type="followed_by",
-                    target=message_entity
-                )
+        # Link to the neighbouring messages whose entities already exist
+        prev_message = self.graph.get_entity(f"message_{index}") if index > 0 else None
+        if prev_message:
+            self.graph.add_relationship(
+                source=prev_message,
+                relationship_type="followed_by",
+                target=message_entity
+            )
+        next_message = self.graph.get_entity(f"message_{index + 2}")
+        if next_message:
+            self.graph.add_relationship(
+                source=message_entity,
+                relationship_type="followed_by",
+                target=next_message
+            )
         
         # Extract knowledge if enabled
         if self.auto_extract and self.extractor and len(message.content) > 20:
@@ -1257,7 +1558,7 @@ class ConversationKnowledgeGraphMemory(LocalKnowledgeGraphMemory):
             
             for triplet in triplets:
                 # Store triplet
-                subject_entity, _, object_entity = self.graph.add_triplet(triplet)
+                subject_entity, _, object_entity = await self._add_graph_triplet(triplet)
                 
                 # Link message to triplet entities
                 self.graph.add_relationship(
@@ -1274,7 +1575,7 @@ class ConversationKnowledgeGraphMemory(LocalKnowledgeGraphMemory):
         
         # Persist if storage path is set
         if self.storage_path:
-            self.graph.save(self.storage_path)
+            self._persist()
     
     def get_messages(self, limit: Optional[int] = None) -> List[Message]:
         """Get the conversation history.
@@ -1292,52 +1593,47 @@ class ConversationKnowledgeGraphMemory(LocalKnowledgeGraphMemory):
     async def search_conversation(
         self, 
         query: str, 
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        window: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Search conversation history.
         
+        Message embeddings are computed once in add_message, so a search only
+        embeds the query and scores the cached embeddings in one pass.
+        
         Args:
             query: The search query
             limit: Maximum number of results
+            window: Only search the most recent N messages (None for all)
             
         Returns:
             List of search results with message information
         """
         limit = limit or 10
+        if not len(self._message_index):
+            return []
         
-        # Create query embedding
-        embedding_model = self.graph.embedding_model
-        query_embedding = embedding_model.embed(query)
+        # Rows are in message order, so the window is a suffix of the buffer
+        start = 0
+        if window is not None:
+            start = bisect.bisect_left(self._message_positions, len(self._messages) - window)
+        
+        query_embedding = self.graph.embedding_model.embed(query)
+        scores = self._message_index.matrix[start:] @ normalize_rows(query_embedding)
         
-        # Search messages by similarity
         results = []
-        for i, message in enumerate(self._messages):
-            if not message.content:
-                continue
-                
-            message_embedding = embedding_model.embed(message.content)
-            similarity = self._cosine_similarity(query_embedding, message_embedding)
-            
+        for row in top_k_indices(scores, limit):
+            position = self._message_positions[start + row]
             results.append({
-                "message": message,
-                "index": i,
-                "score": similarity
+                "message": self._messages[position],
+                "index": position,
+                "score": float(scores[row])
             })
-        
-        # Sort by similarity and limit
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:limit]
+        return results
     
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         if not vec1 or not vec2 or len(vec1) != len(vec2):
             return 0.0
             
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-            
-        return dot_product / (norm1 * norm2)
\ No newline at end of file
+        return float(cosine_similarities(vec1, [vec2])[0])
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Memory manager for Symphony."""
 
 import asyncio
+import inspect
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -209,6 +210,48 @@ class MemoryManager:
         # If neither key nor query is provided
         return None
     
+    async def retrieve_many(
+        self,
+        queries: List[str],
+        memory_types: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[List[Any]]:
+        """Run several semantic searches at once.
+        
+        Memory systems that support search_many score all queries in a
+        single batched pass; others are searched once per query.
+        
+        Args:
+            queries: Search queries
+            memory_types: Which memory systems to search (if None, uses default order)
+            limit: Maximum number of results per query and memory system
+            
+        Returns:
+            One result list per query, in the same format as retrieve(query=...)
+        """
+        if memory_types is None:
+            memory_types = [
+                memory_type for memory_type in ("kg", "long_term")
+                if memory_type in self.memories
+            ] or ["working"]
+            
+        results: List[List[Any]] = [[] for _ in queries]
+        for memory_type in memory_types:
+            if memory_type not in self.memories:
+                continue
+            memory = self.memories[memory_type]
+            if hasattr(memory, "search_many"):
+                batch_results = memory.search_many(queries, limit=limit)
+            else:
+                batch_results = [memory.search(query, limit=limit) for query in queries]
+                if any(inspect.isawaitable(r) for r in batch_results):
+                    # Knowledge graph memories search asynchronously
+                    batch_results = await asyncio.gather(*batch_results)
+            for query_results, memory_results in zip(results, batch_results):
+                query_results.extend(memory_results)
+                
+        return results
+    
     def add_memory_system(self, name: str, memory_system: BaseMemory) -> None:
         """Add a new memory system to the manager.
         
@@ -378,6 +421,27 @@ class ConversationMemoryManager(MemoryManager):
         Returns:
             List of messages that match the query
         """
+        return (await self.search_conversation_many([query], limit, memory_types))[0]
+    
+    async def search_conversation_many(
+        self,
+        queries: List[str],
+        limit: Optional[int] = None,
+        memory_types: Optional[List[str]] = None
+    ) -> List[List[Message]]:
+        """Search conversation history for several queries at once.
+        
+        Vector memory scores all queries in a single batched pass; the
+        knowledge graph is searched for every query concurrently.
+        
+        Args:
+            queries: The search queries
+            limit: Maximum number of results to return per query
+            memory_types: Which memory systems to search (if None, uses all available)
+            
+        Returns:
+            One message list per query, in the same format as search_conversation()
+        """
         # Determine which memory systems to use
         if memory_types is None:
             memory_types = []
@@ -394,7 +458,7 @@ class ConversationMemoryManager(MemoryManager):
             if not memory_types:
                 memory_types = ["fallback"]
         
-        all_messages = []
+        all_messages: List[List[Message]] = [[] for _ in queries]
         
         # Try searching in knowledge graph memory first (most comprehensive)
         if "kg" in memory_types and "kg" in self.memories:
@@ -402,41 +466,64 @@ class ConversationMemoryManager(MemoryManager):
             
             # Use specialized conversation search if available
             if hasattr(kg, "search_conversation"):
-                kg_results = await kg.search_conversation(query, limit=limit)
+                kg_batches = await asyncio.gather(*(
+                    kg.search_conversation(query, limit=limit) for query in queries
+                ))
                 
                 # Format might vary depending on KG implementation, handle different result formats
-                for result in kg_results:
-                    if isinstance(result, Message):
-                        all_messages.append(result)
-                    elif isinstance(result, dict) and "message" in result:
-                        all_messages.append(result["message"])
-                    elif isinstance(result, tuple) and len(result) >= 2:
-                        # Might be (message, score) tuple
-                        msg = result[0]
-                        if isinstance(msg, Message):
-                            all_messages.append(msg)
+                for messages, kg_results in zip(all_messages, kg_batches):
+                    for result in kg_results:
+                        if isinstance(result, Message):
+                            messages.append(result)
+                        elif isinstance(result, dict) and "message" in result:
+                            messages.append(result["message"])
+                        elif isinstance(result, tuple) and len(result) >= 2:
+                            # Might be (message, score) tuple
+                            msg = result[0]
+                            if isinstance(msg, Message):
+                                messages.append(msg)
         
         # Then try vector memory
         if "long_term" in memory_types and "long_term" in self.memories:
             long_term = self.memories["long_term"]
-            results = long_term.search(query, limit=limit, include_metadata=True)
+            if hasattr(long_term, "search_many"):
+                batch_results = long_term.search_many(queries, limit=limit, include_metadata=True)
+            else:
+                batch_results = [
+                    long_term.search(query, limit=limit, include_metadata=True)
+                    for query in queries
+                ]
             
             # Convert results to Message objects
-            for content, metadata in results:
-                if isinstance(metadata, dict):
-                    role = metadata.get("role", "unknown")
-                    # Remove known metadata fields, keep additional_kwargs
-                    additional_kwargs = {
-                        k: v for k, v in metadata.items()
-                        if k not in ("role", "index", "timestamp")
-                    }
-                    
-                    all_messages.append(Message(
-                        role=role,
-                        content=content,
-                        additional_kwargs=additional_kwargs
-                    ))
-        
+            for messages, results in zip(all_messages, batch_results):
+                for content, metadata in results:
+                    if isinstance(metadata, dict):
+                        role = metadata.get("role", "unknown")
+                        # Remove known metadata fields, keep additional_kwargs
+                        additional_kwargs = {
+                            k: v for k, v in metadata.items()
+                            if k not in ("role", "index", "timestamp")
+                        }
+                        
+                        messages.append(Message(
+                            role=role,
+                            content=content,
+                            additional_kwargs=additional_kwargs
+                        ))
+        
+        return [
+            self._finish_conversation_search(query, messages, memory_types, limit)
+            for query, messages in zip(queries, all_messages)
+        ]
+    
+    def _finish_conversation_search(
+        self,
+        query: str,
+        all_messages: List[Message],
+        memory_types: List[str],
+        limit: Optional[int]
+    ) -> List[Message]:
+        """Add string matches if needed, then deduplicate and limit one query's results."""
         # Fallback: Basic string matching on recent messages
         if ("fallback" in memory_types or not all_messages) and self._messages:
             matching_messages = []
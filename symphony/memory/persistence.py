@@ -0,0 +1,116 @@
+"""Persistence helpers shared by the on-disk memory implementations."""
+
+import asyncio
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_pickle_dump(obj: Any, path: str) -> None:
+    """Pickle an object to a file so readers never see a partial write.
+
+    The data is written to a temp file in the same directory, fsynced and
+    then renamed over ``path``.
+
+    Args:
+        obj: The object to pickle
+        path: Destination file path
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class WriteBehind:
+    """Batches persistence of a memory so inserts don't each rewrite the file.
+
+    Changes are counted with ``mark_dirty()``. They are written by the
+    ``flush`` callback once ``max_dirty`` changes are pending, or after
+    ``flush_interval`` seconds by a background task on the running event
+    loop. Without a running loop only the count limit and explicit
+    ``flush()``/``aclose()`` calls write.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], None],
+        flush_interval: float = 1.0,
+        max_dirty: int = 100
+    ):
+        """Initialize the write-behind buffer.
+
+        Args:
+            flush: Writes the current state to disk
+            flush_interval: Seconds to wait after the first pending change
+                before flushing in the background
+            max_dirty: Pending change count that forces an immediate flush
+        """
+        self._flush = flush
+        self.flush_interval = flush_interval
+        self.max_dirty = max(1, max_dirty)
+        self.dirty = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self, count: int = 1) -> None:
+        """Record pending changes, flushing if the limit is reached."""
+        self.dirty += count
+        if self.dirty >= self.max_dirty:
+            self.flush()
+        else:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            self.flush()
+        except Exception:
+            # Nobody awaits this task; the changes stay pending and are
+            # retried by the next change or explicit flush
+            logger.exception("Background flush failed; %d changes still pending", self.dirty)
+
+    def flush(self) -> None:
+        """Write pending changes now.
+
+        Changes stay pending if the write raises.
+        """
+        if not self.dirty:
+            return
+        self._flush()
+        self.dirty = 0
+
+    def discard(self) -> None:
+        """Drop pending changes without writing them."""
+        self.dirty = 0
+        self._cancel()
+
+    async def aclose(self) -> None:
+        """Stop the background task and write pending changes."""
+        self._cancel()
+        self.flush()
+
+    def _cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
@@ -0,0 +1,268 @@
+"""Contiguous matrix-backed index for embedding similarity search."""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+VectorLike = Union[Sequence[float], np.ndarray]
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize a 1-D vector or each row of a 2-D matrix as float32.
+
+    Zero-norm rows are left as zeros so they score 0.0 against any query.
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return array / norms
+
+
+def cosine_similarities(query: VectorLike, vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one query against a stack of vectors.
+
+    Args:
+        query: 1-D query vector
+        vectors: 2-D array (or sequence of equal-length vectors), one per row
+
+    Returns:
+        1-D float32 array with one score per row
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    return normalize_rows(vectors) @ normalize_rows(np.asarray(query, dtype=np.float32).reshape(-1))
+
+
+def top_k_indices(
+    scores: np.ndarray,
+    limit: Optional[int] = None,
+    threshold: Optional[float] = None
+) -> np.ndarray:
+    """Select the indices of the best scores in descending order.
+
+    Uses argpartition so only the surviving ``limit`` candidates are sorted.
+    Ties keep their original (insertion) order.
+
+    Args:
+        scores: 1-D array of similarity scores
+        limit: Maximum number of indices to return (None or 0 for all)
+        threshold: Minimum score for an index to be returned
+
+    Returns:
+        Array of indices into ``scores``
+    """
+    if threshold is not None:
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(scores.shape[0])
+
+    if limit and limit < candidates.shape[0]:
+        partition = np.argpartition(-scores[candidates], limit - 1)[:limit]
+        candidates = np.sort(candidates[partition])
+
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order]
+
+
+class VectorIndex:
+    """Growable matrix of L2-normalized float32 vectors keyed by id.
+
+    Rows live in a single contiguous buffer that doubles in capacity as it
+    fills, so adds are amortized O(1) and a query is one matrix-vector
+    product. Removing an id moves the last row into the freed slot to keep
+    the live rows contiguous.
+    """
+
+    def __init__(self, dimension: Optional[int] = None, initial_capacity: int = 64):
+        """Initialize the index.
+
+        Args:
+            dimension: Vector dimension (inferred from the first add if None)
+            initial_capacity: Number of rows to allocate up front
+        """
+        self.dimension = dimension
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix = np.zeros((0, dimension or 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    @classmethod
+    def from_matrix(
+        cls,
+        ids: Sequence[str],
+        matrix: np.ndarray,
+        copy: bool = True
+    ) -> "VectorIndex":
+        """Build an index from ids and already-normalized rows.
+
+        Used when restoring a persisted index, so rows are not re-normalized.
+
+        Args:
+            ids: Unique ids in row order
+            matrix: 2-D array of normalized vectors, one row per id
+            copy: Whether to copy the rows; pass False to serve a read-only
+                memory-mapped matrix directly (it is copied on first write)
+        """
+        index = cls(dimension=matrix.shape[1])
+        index._matrix = np.array(matrix, dtype=np.float32, copy=True) if copy else matrix
+        index._ids = list(ids)
+        index._rows = {id: row for row, id in enumerate(index._ids)}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        """Ids in row order."""
+        return self._ids
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the live (normalized) rows."""
+        return self._matrix[:len(self._ids)]
+
+    def row(self, id: str) -> Optional[int]:
+        """Get the row number for an id, or None if not indexed."""
+        return self._rows.get(id)
+
+    def add(self, id: str, vector: VectorLike) -> None:
+        """Add or replace the vector stored for an id.
+
+        Args:
+            id: Identifier of the vector
+            vector: The raw (unnormalized) vector
+
+        Raises:
+            ValueError: If the vector dimension does not match the index
+        """
+        array = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if self.dimension is None:
+            self.dimension = array.shape[0]
+            self._matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        elif array.shape[0] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {array.shape[0]} does not match index dimension {self.dimension}"
+            )
+
+        self._ensure_writable()
+        row = self._rows.get(id)
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(id)
+            self._rows[id] = row
+
+        self._matrix[row] = normalize_rows(array)
+
+    def add_many(self, ids: Sequence[str], vectors: Iterable[VectorLike]) -> None:
+        """Add several vectors at once."""
+        for id, vector in zip(ids, vectors):
+            self.add(id, vector)
+
+    def remove(self, id: str) -> bool:
+        """Remove an id from the index.
+
+        Returns:
+            True if the id was indexed, False otherwise
+        """
+        row = self._rows.pop(id, None)
+        if row is None:
+            return False
+
+        self._ensure_writable()
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+        return True
+
+    def clear(self) -> None:
+        """Remove all vectors, keeping the dimension."""
+        self._matrix = np.zeros((0, self.dimension or 0), dtype=np.float32)
+        self._ids = []
+        self._rows = {}
+
+    def scores(self, query: VectorLike) -> np.ndarray:
+        """Cosine similarity of a query against every indexed row."""
+        query_np = normalize_rows(np.asarray(query, dtype=np.float32).reshape(-1))
+        return self.matrix @ query_np
+
+    def search(
+        self,
+        query: VectorLike,
+        limit: Optional[int] = None,
+        threshold: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """Find the ids most similar to a query vector.
+
+        Args:
+            query: The query vector
+            limit: Maximum number of results (None or 0 for all)
+            threshold: Minimum cosine similarity
+
+        Returns:
+            List of (id, similarity) tuples, most similar first
+        """
+        if not self._ids or not self._matches_dimension(query):
+            return []
+
+        scores = self.scores(query)
+        indices = top_k_indices(scores, limit, threshold)
+        return [(self._ids[i], float(scores[i])) for i in indices]
+
+    def search_many(
+        self,
+        queries: Sequence[VectorLike],
+        limit: Optional[int] = None,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the most similar ids for several query vectors at once.
+
+        All queries are scored with a single (Q x N) matrix product.
+
+        Args:
+            queries: The query vectors
+            limit: Maximum number of results per query (None or 0 for all)
+            threshold: Minimum cosine similarity
+
+        Returns:
+            One list of (id, similarity) tuples per query, most similar first
+        """
+        if not self._ids or not len(queries):
+            return [[] for _ in queries]
+        if not all(self._matches_dimension(query) for query in queries):
+            return [self.search(query, limit, threshold) for query in queries]
+
+        scores = normalize_rows(np.asarray(queries, dtype=np.float32)) @ self.matrix.T
+        results = []
+        for row in scores:
+            indices = top_k_indices(row, limit, threshold)
+            results.append([(self._ids[i], float(row[i])) for i in indices])
+        return results
+
+    def _matches_dimension(self, vector: VectorLike) -> bool:
+        return len(vector) == self.dimension
+
+    def _ensure_writable(self) -> None:
+        """Copy a read-only (e.g. memory-mapped) buffer before mutating it."""
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix, dtype=np.float32)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the backing buffer to hold at least ``size`` rows."""
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+
+        new_capacity = max(self._initial_capacity, capacity * 2, size)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = matrix
@@ -5,12 +5,15 @@ import os
 import pickle
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 from pydantic import BaseModel, Field
 
 from symphony.memory.base import BaseMemory
+from symphony.memory.embedders import EmbeddingBatcher, embed_batch, resolve_embedder
+from symphony.memory.persistence import WriteBehind, atomic_pickle_dump
+from symphony.memory.vector_index import VectorIndex
 from symphony.utils.types import Message
 
 
@@ -50,9 +53,9 @@ class SimpleEmbedder:
         """Get a vector for a word, creating a new one if needed."""
         if word not in self.word_vectors:
             # Create a deterministic but seemingly random vector based on the word
+            # (a private RandomState gives the same values without touching the global RNG)
             seed = sum(ord(c) for c in word)
-            np.random.seed(seed)
-            self.word_vectors[word] = np.random.randn(self.dimension).tolist()
+            self.word_vectors[word] = np.random.RandomState(seed).randn(self.dimension).tolist()
         
         return self.word_vectors[word]
     
@@ -86,18 +89,35 @@ class VectorMemory(BaseMemory):
         self, 
         embedder = None,
         persist_path: Optional[str] = None,
-        load_on_init: bool = True
+        load_on_init: bool = True,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_dirty: int = 100,
+        embed_batch_size: int = 64,
+        embed_max_latency: float = 0.0
     ):
         """Initialize the vector memory.
         
         Args:
-            embedder: The embedding model to use (defaults to SimpleEmbedder)
+            embedder: The embedding model to use, or an embedder type name or
+                config dict such as {"type": "hashing", "dimension": 384}
+                (defaults to SimpleEmbedder)
             persist_path: Optional path to persist memory to disk
             load_on_init: Whether to load from persist_path on initialization
+            write_behind: Whether to batch writes instead of saving on every insert
+            flush_interval: Seconds before pending writes are flushed in the background
+            max_dirty: Number of pending inserts that forces a flush
+            embed_batch_size: Maximum number of concurrent stores embedded in one call
+            embed_max_latency: Seconds a store may wait for its embedding batch to fill
         """
-        self.embedder = embedder or SimpleEmbedder()
+        self.embedder = resolve_embedder(embedder, SimpleEmbedder)
+        self._batcher = EmbeddingBatcher(self.embedder, embed_batch_size, embed_max_latency)
         self.entries: Dict[str, MemoryEntry] = {}
         self.persist_path = persist_path
+        self._index = VectorIndex()
+        self._write_behind = (
+            WriteBehind(self._save_entries, flush_interval, max_dirty) if write_behind else None
+        )
         
         # Load from disk if specified
         if persist_path and load_on_init and os.path.exists(persist_path):
@@ -107,8 +127,8 @@ class VectorMemory(BaseMemory):
         """Store a value in memory with the given key."""
         content = str(value)
         
-        # Create embedding
-        embedding = self.embedder.embed(content)
+        # Create embedding (batched with concurrent stores)
+        embedding = await self._batcher.embed(content)
         
         # Create and store entry
         entry = MemoryEntry(
@@ -116,12 +136,44 @@ class VectorMemory(BaseMemory):
             content=content,
             embedding=embedding
         )
-        self.entries[key] = entry
+        self._add_entry(entry)
         
         # Persist if path is set
         if self.persist_path:
+            self._persist()
+    
+    def _persist(self) -> None:
+        """Save now, or queue the save when write-behind is enabled."""
+        if self._write_behind:
+            self._write_behind.mark_dirty()
+        else:
             self.save()
     
+    def flush(self) -> None:
+        """Write any changes queued by write-behind to disk."""
+        if self._write_behind:
+            self._write_behind.flush()
+    
+    async def aclose(self) -> None:
+        """Stop background flushing and write any queued changes."""
+        if self._write_behind:
+            await self._write_behind.aclose()
+    
+    def _add_entry(self, entry: MemoryEntry) -> None:
+        """Store an entry and keep the similarity index in sync."""
+        self.entries[entry.id] = entry
+        if entry.embedding:
+            self._index.add(entry.id, entry.embedding)
+        else:
+            self._index.remove(entry.id)
+    
+    def _rebuild_index(self) -> None:
+        """Rebuild the similarity index from the stored entries."""
+        self._index = VectorIndex()
+        for key, entry in self.entries.items():
+            if entry.embedding:
+                self._index.add(key, entry.embedding)
+    
     async def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve a value from memory by key."""
         entry = self.entries.get(key)
@@ -151,20 +203,8 @@ class VectorMemory(BaseMemory):
         # Create query embedding
         query_embedding = self.embedder.embed(query)
         
-        # Calculate similarity with all entries
-        similarities: List[Tuple[str, float]] = []
-        for key, entry in self.entries.items():
-            if entry.embedding:
-                similarity = self._cosine_similarity(query_embedding, entry.embedding)
-                if similarity >= threshold:
-                    similarities.append((key, similarity))
-        
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Apply limit
-        if limit:
-            similarities = similarities[:limit]
+        # Score against the whole index in one pass
+        similarities = self._index.search(query_embedding, limit, threshold)
             
         # Format results
         results = []
@@ -177,6 +217,44 @@ class VectorMemory(BaseMemory):
                 
         return results
     
+    def search_many(
+        self,
+        queries: List[str],
+        limit: Optional[int] = None,
+        threshold: float = 0.0,
+        include_metadata: bool = False
+    ) -> List[List[Any]]:
+        """Search for items similar to each of several queries.
+        
+        All queries are embedded up front and scored in one matrix product.
+        
+        Args:
+            queries: The search queries
+            limit: Maximum number of results to return per query
+            threshold: Minimum similarity score (0-1)
+            include_metadata: Whether to include metadata in results
+            
+        Returns:
+            One result list per query, in the same format as search()
+        """
+        if not self.entries:
+            return [[] for _ in queries]
+            
+        query_embeddings = embed_batch(self.embedder, queries)
+        
+        results = []
+        for similarities in self._index.search_many(query_embeddings, limit, threshold):
+            query_results = []
+            for key, similarity in similarities:
+                entry = self.entries[key]
+                if include_metadata:
+                    query_results.append((entry.content, entry.metadata))
+                else:
+                    query_results.append(entry.content)
+            results.append(query_results)
+            
+        return results
+    
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         if not vec1 or not vec2 or len(vec1) != len(vec2):
@@ -198,19 +276,22 @@ class VectorMemory(BaseMemory):
     
     def save(self) -> None:
         """Save memory to disk."""
-        if not self.persist_path:
-            return
-            
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
-            
-            # Serialize entries
-            with open(self.persist_path, "wb") as f:
-                pickle.dump(self.entries, f)
+            self._save_entries()
         except Exception as e:
             print(f"Error saving vector memory: {e}")
     
+    def _save_entries(self) -> None:
+        """Write the entries to disk, raising on failure."""
+        if not self.persist_path:
+            return
+            
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+        
+        # Serialize entries without leaving a partial file on a crash
+        atomic_pickle_dump(self.entries, self.persist_path)
+    
     def load(self) -> None:
         """Load memory from disk."""
         if not self.persist_path or not os.path.exists(self.persist_path):
@@ -219,12 +300,16 @@ class VectorMemory(BaseMemory):
         try:
             with open(self.persist_path, "rb") as f:
                 self.entries = pickle.load(f)
+            self._rebuild_index()
         except Exception as e:
             print(f"Error loading vector memory: {e}")
     
     def clear(self) -> None:
         """Clear all entries."""
         self.entries = {}
+        self._index.clear()
+        if self._write_behind:
+            self._write_behind.discard()
         
         # Remove persisted file if it exists
         if self.persist_path and os.path.exists(self.persist_path):
@@ -250,10 +335,18 @@ class ConversationVectorMemory(VectorMemory):
         self,
         embedder = None,
         persist_path: Optional[str] = None,
-        load_on_init: bool = True
+        load_on_init: bool = True,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_dirty: int = 100,
+        embed_batch_size: int = 64,
+        embed_max_latency: float = 0.0
     ):
         """Initialize conversation vector memory."""
-        super().__init__(embedder, persist_path, load_on_init)
+        super().__init__(
+            embedder, persist_path, load_on_init, write_behind, flush_interval, max_dirty,
+            embed_batch_size, embed_max_latency
+        )
         self._messages: List[Message] = []
     
     def add_message(self, message: Message) -> None:
@@ -281,11 +374,11 @@ class ConversationVectorMemory(VectorMemory):
             metadata=metadata,
             embedding=embedding
         )
-        self.entries[key] = entry
+        self._add_entry(entry)
         
         # Persist if path is set
         if self.persist_path:
-            self.save()
+            self._persist()
     
     def get_messages(self, limit: Optional[int] = None) -> List[Message]:
         """Get the conversation history."""
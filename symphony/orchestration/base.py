@@ -19,6 +19,7 @@ class OrchestratorConfig(BaseModel):
     agent_configs: List[AgentConfig] = Field(default_factory=list)
     max_steps: int = 10
     max_time_seconds: Optional[int] = None  # None means no time limit
+    max_concurrency: Optional[int] = None  # Nodes run at once; None means no limit
 
 
 class Orchestrator(ABC):
@@ -0,0 +1,143 @@
+"""Checkpoint scheduling for Symphony workflows.
+
+This module decides when a running workflow is checkpointed and writes
+checkpoints in the background, so that steps only wait for a state
+snapshot rather than for the checkpoint to be stored.
+"""
+
+import asyncio
+from typing import Dict, Any, Optional, Union, Callable
+
+
+class CheckpointPolicy:
+    """When to checkpoint a running workflow between steps.
+
+    A checkpoint is due once ``every_steps`` steps have finished or
+    ``every_seconds`` seconds have passed since the previous checkpoint,
+    whichever comes first. With neither set, workflows are only
+    checkpointed at their start, on errors and on completion.
+    """
+
+    def __init__(self, every_steps: Optional[int] = 3, every_seconds: Optional[float] = None):
+        """Initialize the policy.
+
+        Args:
+            every_steps: Number of finished steps between checkpoints
+            every_seconds: Time in seconds between checkpoints
+
+        Raises:
+            ValueError: If an interval is not positive
+        """
+        if every_steps is not None and every_steps < 1:
+            raise ValueError(f"every_steps must be positive, got {every_steps}")
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError(f"every_seconds must be positive, got {every_seconds}")
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+
+    @classmethod
+    def coerce(cls, spec: Union[None, int, Dict[str, Any], "CheckpointPolicy"]) -> "CheckpointPolicy":
+        """Build a policy from a step count, a policy dictionary or a policy.
+
+        Dictionaries use the constructor argument names, as stored in a
+        workflow definition's "checkpoint_policy" metadata.
+
+        Raises:
+            ValueError: If the spec cannot be turned into a policy
+        """
+        if isinstance(spec, CheckpointPolicy):
+            return spec
+        if spec is None:
+            return cls()
+        if isinstance(spec, int) and not isinstance(spec, bool):
+            return cls(every_steps=spec)
+        if isinstance(spec, dict):
+            try:
+                return cls(**spec)
+            except TypeError as e:
+                raise ValueError(f"Invalid checkpoint policy {spec!r}: {e}")
+        raise ValueError(f"Invalid checkpoint policy: {spec!r}")
+
+    def is_due(self, steps_since: int, seconds_since: float) -> bool:
+        """Check whether a checkpoint is due.
+
+        Args:
+            steps_since: Steps finished since the previous checkpoint
+            seconds_since: Seconds passed since the previous checkpoint
+        """
+        if self.every_steps is not None and steps_since >= self.every_steps:
+            return True
+        return self.every_seconds is not None and seconds_since >= self.every_seconds
+
+
+class CheckpointWriter:
+    """Writes checkpoint snapshots of one checkpoint manager in the background.
+
+    Snapshots are written one at a time in the order they were submitted,
+    which keeps delta checkpoints chained correctly. At most
+    ``max_pending`` snapshots wait to be written; submitting more waits
+    for the queue to drain, which bounds the memory held by snapshots.
+    The background task ends once the queue is empty and is started again
+    by the next submit, so no task is left pending when the loop closes.
+    """
+
+    def __init__(self, checkpoint_manager: Any, max_pending: int = 4):
+        """Initialize the writer.
+
+        Args:
+            checkpoint_manager: Checkpoint manager writing the snapshots
+            max_pending: Maximum number of snapshots waiting to be written
+        """
+        self.checkpoint_manager = checkpoint_manager
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        snapshot: Any,
+        name: str,
+        metadata: Dict[str, Any],
+        on_written: Optional[Callable[[str], None]] = None
+    ) -> None:
+        """Queue a snapshot to be written.
+
+        Args:
+            snapshot: Snapshot taken with the checkpoint manager
+            name: Checkpoint name
+            metadata: Checkpoint metadata
+            on_written: Called with the checkpoint ID once it is written
+        """
+        if (self._task is None or self._task.done()
+                or self._task.get_loop() is not asyncio.get_running_loop()):
+            self._queue = asyncio.Queue(self.max_pending)
+            self._task = asyncio.create_task(self._run(self._queue))
+        await self._queue.put((snapshot, name, metadata, on_written))
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        # Nothing yields between the emptiness check and returning, so a
+        # submit either sees this task running or starts a new one
+        while not queue.empty():
+            snapshot, name, metadata, on_written = queue.get_nowait()
+            try:
+                checkpoint_id = await self.checkpoint_manager.write_snapshot(snapshot, name, metadata)
+                if on_written:
+                    on_written(checkpoint_id)
+            except Exception as e:
+                # Log checkpoint error but keep writing later snapshots
+                print(f"Warning: Failed to write checkpoint {name}: {e}")
+            finally:
+                queue.task_done()
+
+    async def flush(self) -> None:
+        """Wait until every submitted snapshot has been written."""
+        if (self._task is not None and not self._task.done()
+                and self._task.get_loop() is asyncio.get_running_loop()):
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Write the pending snapshots and stop the background task."""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
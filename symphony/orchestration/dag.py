@@ -2,9 +2,10 @@
 
 import asyncio
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from symphony.agents.base import AgentBase
 from symphony.orchestration.base import Orchestrator, OrchestratorConfig
@@ -40,18 +41,46 @@ class Node(BaseModel):
 
 
 class DAG(BaseModel):
-    """A directed acyclic graph representing a workflow."""
+    """A directed acyclic graph representing a workflow.
+    
+    Outgoing and incoming edge lists and in-degrees are cached per node and
+    rebuilt after ``add_node``/``add_edge`` (or direct changes to ``nodes``
+    or ``edges`` that change their size), so neighbour lookups cost the
+    node's degree rather than a scan of every edge. Edges whose endpoints
+    are not nodes are ignored by the lookups.
+    """
     
     nodes: Dict[str, Node] = Field(default_factory=dict)
     edges: List[Edge] = Field(default_factory=list)
     
+    _outgoing: Optional[Dict[str, List[Edge]]] = PrivateAttr(default=None)
+    _incoming: Dict[str, List[Edge]] = PrivateAttr(default_factory=dict)
+    _indexed_size: Tuple[int, int] = PrivateAttr(default=(0, 0))
+    
     def add_node(self, node: Node) -> None:
         """Add a node to the DAG."""
         self.nodes[node.id] = node
+        self._outgoing = None
     
     def add_edge(self, edge: Edge) -> None:
         """Add an edge to the DAG."""
         self.edges.append(edge)
+        self._outgoing = None
+    
+    def _index(self) -> Dict[str, List[Edge]]:
+        """Get the outgoing edge lists, rebuilding the indexes if stale."""
+        size = (len(self.nodes), len(self.edges))
+        if self._outgoing is None or self._indexed_size != size:
+            outgoing: Dict[str, List[Edge]] = {node_id: [] for node_id in self.nodes}
+            incoming: Dict[str, List[Edge]] = {node_id: [] for node_id in self.nodes}
+            for edge in self.edges:
+                if edge.source in self.nodes and edge.target in self.nodes:
+                    outgoing[edge.source].append(edge)
+                    incoming[edge.target].append(edge)
+            self._outgoing = outgoing
+            self._incoming = incoming
+            self._indexed_size = size
+        return self._outgoing
     
     def get_start_nodes(self) -> List[Node]:
         """Get all start nodes in the DAG."""
@@ -65,17 +94,47 @@ class DAG(BaseModel):
     
     def get_children(self, node_id: str) -> List[Node]:
         """Get all child nodes of a node."""
-        child_ids = [edge.target for edge in self.edges if edge.source == node_id]
-        return [self.nodes[node_id] for node_id in child_ids if node_id in self.nodes]
+        return [self.nodes[edge.target] for edge in self._index().get(node_id, [])]
     
     def get_parents(self, node_id: str) -> List[Node]:
         """Get all parent nodes of a node."""
-        parent_ids = [edge.source for edge in self.edges if edge.target == node_id]
-        return [self.nodes[node_id] for node_id in parent_ids if node_id in self.nodes]
+        self._index()
+        return [self.nodes[edge.source] for edge in self._incoming.get(node_id, [])]
     
     def get_outgoing_edges(self, node_id: str) -> List[Edge]:
         """Get all outgoing edges of a node."""
-        return [edge for edge in self.edges if edge.source == node_id]
+        return list(self._index().get(node_id, []))
+    
+    def get_in_degrees(self) -> Dict[str, int]:
+        """Get the number of incoming edges of every node."""
+        self._index()
+        return {node_id: len(edges) for node_id, edges in self._incoming.items()}
+    
+    def validate(self) -> List[str]:
+        """Check that the graph is acyclic.
+        
+        Returns:
+            Node IDs in topological order
+            
+        Raises:
+            ValueError: If the graph contains a cycle
+        """
+        outgoing = self._index()
+        in_degrees = self.get_in_degrees()
+        queue = deque(node_id for node_id, degree in in_degrees.items() if degree == 0)
+        order = []
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for edge in outgoing[node_id]:
+                in_degrees[edge.target] -= 1
+                if in_degrees[edge.target] == 0:
+                    queue.append(edge.target)
+        
+        if len(order) < len(self.nodes):
+            cyclic = sorted(node_id for node_id, degree in in_degrees.items() if degree > 0)
+            raise ValueError(f"DAG contains a cycle through nodes: {', '.join(cyclic)}")
+        return order
 
 
 class NodeResult(BaseModel):
@@ -142,54 +201,56 @@ class DAGOrchestrator(Orchestrator):
         self.dag = dag
     
     async def run(self, input_message: str) -> str:
-        """Run the DAG workflow with an input message."""
+        """Run the DAG workflow with an input message.
+        
+        Independent nodes run concurrently, bounded by the config's
+        ``max_concurrency``.
+        
+        Raises:
+            ValueError: If the DAG contains a cycle
+        """
         if not self.dag:
             return "No DAG configured"
             
         # Initialize execution state
         state = DAGExecutionState(dag=self.dag)
         
+        # A node becomes ready once every incoming edge comes from a
+        # successfully completed node
+        self.dag.validate()
+        waiting = self.dag.get_in_degrees()
+        
         # Find start nodes and mark them as ready
         start_nodes = self.dag.get_start_nodes()
         for node in start_nodes:
             state.mark_ready(node.id)
         
-        # Execute until complete
-        while not state.is_complete() and state.ready_nodes:
-            # Get a ready node
-            node_id = state.get_next_ready_node()
-            if not node_id:
-                break
-                
-            # Mark as active
-            state.mark_active(node_id)
-            
-            # Execute the node
-            try:
-                node = self.dag.nodes[node_id]
-                result = await self._execute_node(node, input_message, state)
-                state.mark_completed(node_id, result)
+        # Run every ready node at once (up to the concurrency limit) and
+        # release children as soon as the nodes they wait on complete
+        limit = self.config.max_concurrency
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while state.ready_nodes or running:
+                while state.ready_nodes and (not limit or len(running) < limit):
+                    node_id = state.get_next_ready_node()
+                    state.mark_active(node_id)
+                    task = asyncio.ensure_future(self._run_node(node_id, input_message, state))
+                    running[task] = node_id
                 
-                # If successful, mark child nodes as ready if all their parents are complete
-                if result.success:
-                    child_nodes = self.dag.get_children(node_id)
-                    for child in child_nodes:
-                        # Check if all parents are complete
-                        parents = self.dag.get_parents(child.id)
-                        parents_complete = all(parent.id in state.completed_nodes for parent in parents)
-                        
-                        if parents_complete:
-                            state.mark_ready(child.id)
-            except Exception as e:
-                state.mark_completed(
-                    node_id, 
-                    NodeResult(
-                        node_id=node_id,
-                        output=None,
-                        success=False,
-                        error=str(e)
-                    )
-                )
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    result = task.result()
+                    state.mark_completed(node_id, result)
+                    
+                    if result.success:
+                        for edge in self.dag.get_outgoing_edges(node_id):
+                            waiting[edge.target] -= 1
+                            if waiting[edge.target] == 0 and edge.target not in state.completed_nodes:
+                                state.mark_ready(edge.target)
+        finally:
+            for task in running:
+                task.cancel()
         
         # Return final result
         end_nodes = self.dag.get_end_nodes()
@@ -203,6 +264,18 @@ class DAGOrchestrator(Orchestrator):
         
         return f"Workflow completed with {success_count} successful nodes and {error_count} errors."
     
+    async def _run_node(self, node_id: str, input_message: str, state: DAGExecutionState) -> NodeResult:
+        """Execute a node, turning exceptions into a failed result."""
+        try:
+            return await self._execute_node(self.dag.nodes[node_id], input_message, state)
+        except Exception as e:
+            return NodeResult(
+                node_id=node_id,
+                output=None,
+                success=False,
+                error=str(e)
+            )
+    
     async def _execute_node(
         self, 
         node: Node, 
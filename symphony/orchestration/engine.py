@@ -4,14 +4,18 @@ This module provides the core engine for executing workflow definitions,
 managing workflow state, and handling errors during workflow execution.
 """
 
+import asyncio
+import time
 import traceback
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Type, Set, Union
+from typing import Dict, List, Optional, Any, Type, Set, Union, Tuple, Callable, Awaitable
 
 from symphony.core.registry import ServiceRegistry
 from symphony.persistence.repository import Repository
 from symphony.execution.workflow_tracker import WorkflowTracker, Workflow, WorkflowStatus
 from symphony.orchestration.workflow_definition import WorkflowDefinition, WorkflowContext, WorkflowStep, StepResult
+from symphony.orchestration.checkpointing import CheckpointPolicy, CheckpointWriter
 
 # Import state management components (conditionally to avoid import errors)
 try:
@@ -19,6 +23,11 @@ try:
 except ImportError:
     CheckpointManager = None
 
+EXECUTION_MODES = ("sequential", "dag")
+
+StepCallback = Callable[[int, WorkflowStep, StepResult], Awaitable[None]]
+StepFailure = Tuple[int, WorkflowStep, StepResult]
+
 
 class WorkflowEngine:
     """Engine for executing workflow definitions.
@@ -32,17 +41,31 @@ class WorkflowEngine:
     def __init__(self, 
                 service_registry: ServiceRegistry,
                 workflow_definition_repository: Repository[WorkflowDefinition],
-                workflow_tracker: WorkflowTracker):
+                workflow_tracker: WorkflowTracker,
+                max_concurrency: int = 8,
+                checkpoint_policy: Optional[CheckpointPolicy] = None,
+                max_pending_checkpoints: int = 4):
         """Initialize workflow engine.
         
         Args:
             service_registry: Registry for accessing services
             workflow_definition_repository: Repository for workflow definitions
             workflow_tracker: Tracker for workflow execution
+            max_concurrency: Maximum number of steps the engine runs at once
+                in DAG execution mode, across all workflows
+            checkpoint_policy: When to checkpoint running workflows, unless
+                a workflow or call sets its own (every 3 steps by default)
+            max_pending_checkpoints: Maximum number of checkpoints waiting
+                to be written in the background
         """
         self.service_registry = service_registry
         self.workflow_definition_repository = workflow_definition_repository
         self.workflow_tracker = workflow_tracker
+        self.max_concurrency = max_concurrency
+        self.checkpoint_policy = checkpoint_policy or CheckpointPolicy()
+        self.max_pending_checkpoints = max_pending_checkpoints
+        self._step_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self._checkpoint_writers: Dict[Any, CheckpointWriter] = {}
         
     async def execute_workflow_by_id(self, 
                                    workflow_def_id: str, 
@@ -70,19 +93,48 @@ class WorkflowEngine:
                              workflow_def: WorkflowDefinition, 
                              initial_context: Dict[str, Any] = None,
                              auto_checkpoint: bool = True,
-                             resume_from_checkpoint: bool = True,
-                             model_assignments: Optional[Dict[str, str]] = None) -> Workflow:
+                             resume_from_checkpoint: bool = False,
+                             model_assignments: Optional[Dict[str, str]] = None,
+                             execution_mode: Optional[str] = None,
+                             checkpoint_policy: Union[None, int, Dict[str, Any], CheckpointPolicy] = None) -> Workflow:
         """Execute a workflow from its definition.
         
+        Steps run one after another by default. In "dag" execution mode,
+        steps that declared the context keys they read and write (see
+        ``WorkflowStep.declare``) run concurrently as soon as the steps they
+        depend on have succeeded.
+        
+        Checkpoints are snapshotted between steps and written in the
+        background; the workflow returns once all of them are written.
+        
         Args:
             workflow_def: Workflow definition to execute
             initial_context: Initial context data for workflow execution
             auto_checkpoint: Whether to automatically create checkpoints during execution
-            resume_from_checkpoint: Whether to try resuming from a checkpoint if available
+            resume_from_checkpoint: Whether to continue the latest unfinished
+                run of this workflow definition from its checkpoint instead of
+                starting a new run (``initial_context`` is then ignored)
+            model_assignments: Models to use for different agent types
+            execution_mode: "sequential" or "dag"; defaults to the workflow
+                metadata's "execution_mode", else "sequential"
+            checkpoint_policy: When to checkpoint between steps (a
+                CheckpointPolicy, its dictionary form or a step count);
+                defaults to the workflow metadata's "checkpoint_policy",
+                else the engine's policy
             
         Returns:
             The executed workflow instance
+            
+        Raises:
+            ValueError: If the execution mode or checkpoint policy is invalid
         """
+        execution_mode = execution_mode or workflow_def.metadata.get("execution_mode", "sequential")
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+        if checkpoint_policy is None:
+            checkpoint_policy = workflow_def.metadata.get("checkpoint_policy", self.checkpoint_policy)
+        checkpoint_policy = CheckpointPolicy.coerce(checkpoint_policy)
+            
         # Check if state management is available and enabled
         checkpoint_manager = None
         if (auto_checkpoint or resume_from_checkpoint) and CheckpointManager is not None:
@@ -92,186 +144,127 @@ class WorkflowEngine:
                 # Checkpoint manager is not registered
                 print("Warning: Checkpoint manager not found, auto checkpointing disabled")
         
-        # Check for existing workflow checkpoint to resume
-        resumed_workflow = None
+        # Check for an unfinished run of this workflow to resume
+        resumed = None
         if resume_from_checkpoint and checkpoint_manager:
             try:
-                # Look for checkpoints related to this workflow definition
-                checkpoint_pattern = f"workflow_*_{workflow_def.name.replace(' ', '_').lower()}"
-                checkpoints = await self._find_matching_checkpoints(checkpoint_pattern)
-                
-                if checkpoints:
-                    # Sort by creation time (newest first)
-                    latest_checkpoint = sorted(checkpoints, key=lambda c: c.get("created_at", ""), reverse=True)[0]
-                    
-                    # Restore from checkpoint
-                    await checkpoint_manager.restore_checkpoint(
-                        self.service_registry.get_service("symphony_instance"),
-                        latest_checkpoint["id"]
-                    )
-                    
-                    # Extract workflow ID from checkpoint name
-                    # Format: workflow_{workflow_id}_{stage}
-                    checkpoint_name = latest_checkpoint.get("name", "")
-                    if checkpoint_name.startswith("workflow_"):
-                        parts = checkpoint_name.split("_")
-                        if len(parts) > 1:
-                            workflow_id = parts[1]
-                            
-                            # Try to get the workflow
-                            resumed_workflow = await self.workflow_tracker.get_workflow(workflow_id)
-                            
-                            if resumed_workflow and resumed_workflow.status != WorkflowStatus.COMPLETED:
-                                # We found a workflow in progress, so we'll resume it
-                                print(f"Resuming workflow {workflow_id} from checkpoint {latest_checkpoint['id']}")
-                                
-                                # TODO: Implement full workflow resumption logic
-                                # For now, we'll just return the resumed workflow
-                                # In the future, we should continue execution from where it left off
-                                return resumed_workflow
+                # Checkpoints still being written could belong to the run
+                await self._checkpoint_writer(checkpoint_manager).flush()
+                resumed = await self._load_resumable_run(checkpoint_manager, workflow_def)
             except Exception as e:
                 # Log resumption error but continue with fresh execution
                 print(f"Warning: Failed to resume workflow from checkpoint: {e}")
+        if not auto_checkpoint:
+            checkpoint_manager = None
         
-        # Create a new workflow execution
-        workflow = await self.workflow_tracker.create_workflow(
-            name=workflow_def.name,
-            description=workflow_def.description,
-            metadata=workflow_def.metadata.copy()
-        )
-        
-        # Store workflow definition ID in metadata
-        workflow.metadata["workflow_definition_id"] = workflow_def.id
-        await self.workflow_tracker.workflow_repository.update(workflow)
+        if resumed:
+            workflow, context = resumed
+            await self.workflow_tracker.update_workflow_status(
+                workflow.id, WorkflowStatus.RUNNING
+            )
+        else:
+            workflow, context = await self._start_run(workflow_def, initial_context, model_assignments)
+            
+            # Create initial checkpoint if enabled
+            if checkpoint_manager:
+                try:
+                    await self._checkpoint(
+                        checkpoint_manager, workflow_def, context,
+                        name=f"workflow_{workflow.id}_start",
+                        metadata={"stage": "start"},
+                        context_key="initial_checkpoint_id"
+                    )
+                except Exception as e:
+                    # Log checkpoint error but continue execution
+                    print(f"Warning: Failed to create initial checkpoint: {e}")
         
-        # Create workflow context
-        context_data = initial_context.copy() if initial_context else {}
+        steps_since_checkpoint = 0
+        last_checkpoint_time = time.monotonic()
         
-        # Add model assignments to context if provided
-        if model_assignments:
-            context_data["model_assignments"] = model_assignments
-        elif "model_assignments" in workflow_def.metadata:
-            # Use model assignments from workflow metadata
-            context_data["model_assignments"] = workflow_def.metadata["model_assignments"]
+        async def record_step_result(i: int, step: WorkflowStep, step_result: StepResult) -> None:
+            nonlocal steps_since_checkpoint, last_checkpoint_time
             
-        # Add default model to context if present in workflow metadata
-        if "default_model" in workflow_def.metadata:
-            context_data["default_model"] = workflow_def.metadata["default_model"]
+            # Store step result in context
+            context.set(f"step_results.{i}", {
+                "id": step.id,
+                "name": step.name,
+                "success": step_result.success,
+                "output": step_result.output,
+                "error": step_result.error
+            })
             
-        context = WorkflowContext(
-            workflow_id=workflow.id,
-            data=context_data,
-            service_registry=self.service_registry
-        )
-        
-        # Add workflow metadata to context
-        context.set("workflow_name", workflow_def.name)
-        context.set("workflow_id", workflow.id)
-        context.set("workflow_start_time", datetime.now().isoformat())
-        
-        # Update workflow status
-        await self.workflow_tracker.update_workflow_status(
-            workflow.id, WorkflowStatus.RUNNING
-        )
-        
-        # Create initial checkpoint if enabled
-        if checkpoint_manager:
+            # Create checkpoint after step if enabled and due
+            steps_since_checkpoint += 1
+            if not checkpoint_manager or not checkpoint_policy.is_due(
+                steps_since_checkpoint, time.monotonic() - last_checkpoint_time
+            ):
+                return
+            steps_since_checkpoint = 0
+            last_checkpoint_time = time.monotonic()
             try:
-                checkpoint_id = await checkpoint_manager.create_checkpoint(
-                    self.service_registry.get_service("symphony_instance"),
-                    name=f"workflow_{workflow.id}_start",
+                await self._checkpoint(
+                    checkpoint_manager, workflow_def, context,
+                    name=f"workflow_{workflow.id}_step_{i}",
                     metadata={
-                        "workflow_id": workflow.id,
-                        "workflow_name": workflow_def.name,
-                        "stage": "start",
-                        "timestamp": datetime.now().isoformat()
-                    }
+                        "step_index": i,
+                        "step_name": step.name,
+                        "stage": "mid_execution"
+                    },
+                    context_key=f"checkpoint_after_step_{i}"
                 )
-                context.set("initial_checkpoint_id", checkpoint_id)
             except Exception as e:
                 # Log checkpoint error but continue execution
-                print(f"Warning: Failed to create initial checkpoint: {e}")
+                print(f"Warning: Failed to create checkpoint after step {i}: {e}")
         
         try:
             # Get instantiated steps
             steps = workflow_def.get_steps()
             
-            # Execute each step in sequence
+            # Steps that already succeeded before a resume are not run again
+            completed = set()
             for i, step in enumerate(steps):
-                # Add step metadata to context
-                context.set("current_step_index", i)
-                context.set("current_step_name", step.name)
-                context.set("current_step_id", step.id)
+                previous = context.get(f"step_results.{i}") or {}
+                if previous.get("id") == step.id and previous.get("success"):
+                    completed.add(i)
+            
+            if execution_mode == "dag":
                 context.set("total_steps", len(steps))
+                failure = await self._execute_steps_dag(steps, context, record_step_result, completed)
+            else:
+                failure = await self._execute_steps_sequential(steps, context, record_step_result, completed)
+            
+            # If a step failed, mark workflow as failed
+            if failure is not None:
+                i, step, step_result = failure
+                error_message = (
+                    f"Step '{step.name}' failed: {step_result.error or 'Unknown error'}"
+                )
+                await self.workflow_tracker.update_workflow_status(
+                    workflow.id, 
+                    WorkflowStatus.FAILED,
+                    error_message
+                )
                 
-                # Execute step
-                step_result = await step.execute(context)
-                
-                # Store step result in context
-                context.set(f"step_results.{i}", {
-                    "id": step.id,
-                    "name": step.name,
-                    "success": step_result.success,
-                    "output": step_result.output,
-                    "error": step_result.error
-                })
+                # Store error in context
+                context.set("workflow_error", error_message)
                 
-                # Create checkpoint after step if enabled
-                if checkpoint_manager and (i > 0 and i % 3 == 0):  # Checkpoint every 3 steps
+                # Create error checkpoint if enabled
+                if checkpoint_manager:
                     try:
-                        checkpoint_id = await checkpoint_manager.create_checkpoint(
-                            self.service_registry.get_service("symphony_instance"),
-                            name=f"workflow_{workflow.id}_step_{i}",
+                        await self._checkpoint(
+                            checkpoint_manager, workflow_def, context,
+                            name=f"workflow_{workflow.id}_error",
                             metadata={
-                                "workflow_id": workflow.id,
-                                "workflow_name": workflow_def.name,
-                                "step_index": i,
-                                "step_name": step.name,
-                                "stage": "mid_execution",
-                                "timestamp": datetime.now().isoformat()
-                            }
+                                "error_step_index": i,
+                                "error_step_name": step.name,
+                                "error_message": error_message,
+                                "stage": "error"
+                            },
+                            context_key="error_checkpoint_id"
                         )
-                        context.set(f"checkpoint_after_step_{i}", checkpoint_id)
                     except Exception as e:
-                        # Log checkpoint error but continue execution
-                        print(f"Warning: Failed to create checkpoint after step {i}: {e}")
-                
-                # If a step fails, mark workflow as failed and break
-                if not step_result.success:
-                    error_message = (
-                        f"Step '{step.name}' failed: {step_result.error or 'Unknown error'}"
-                    )
-                    await self.workflow_tracker.update_workflow_status(
-                        workflow.id, 
-                        WorkflowStatus.FAILED,
-                        error_message
-                    )
-                    
-                    # Store error in context
-                    context.set("workflow_error", error_message)
-                    
-                    # Create error checkpoint if enabled
-                    if checkpoint_manager:
-                        try:
-                            checkpoint_id = await checkpoint_manager.create_checkpoint(
-                                self.service_registry.get_service("symphony_instance"),
-                                name=f"workflow_{workflow.id}_error",
-                                metadata={
-                                    "workflow_id": workflow.id,
-                                    "workflow_name": workflow_def.name,
-                                    "error_step_index": i,
-                                    "error_step_name": step.name,
-                                    "error_message": error_message,
-                                    "stage": "error",
-                                    "timestamp": datetime.now().isoformat()
-                                }
-                            )
-                            context.set("error_checkpoint_id", checkpoint_id)
-                        except Exception as e:
-                            # Log checkpoint error
-                            print(f"Warning: Failed to create error checkpoint: {e}")
-                    
-                    break
+                        # Log checkpoint error
+                        print(f"Warning: Failed to create error checkpoint: {e}")
             
             # If all steps completed successfully, mark workflow as completed
             else:
@@ -284,17 +277,12 @@ class WorkflowEngine:
                 # Create completion checkpoint if enabled
                 if checkpoint_manager:
                     try:
-                        checkpoint_id = await checkpoint_manager.create_checkpoint(
-                            self.service_registry.get_service("symphony_instance"),
+                        await self._checkpoint(
+                            checkpoint_manager, workflow_def, context,
                             name=f"workflow_{workflow.id}_complete",
-                            metadata={
-                                "workflow_id": workflow.id,
-                                "workflow_name": workflow_def.name,
-                                "stage": "complete",
-                                "timestamp": datetime.now().isoformat()
-                            }
+                            metadata={"stage": "complete"},
+                            context_key="completion_checkpoint_id"
                         )
-                        context.set("completion_checkpoint_id", checkpoint_id)
                     except Exception as e:
                         # Log checkpoint error
                         print(f"Warning: Failed to create completion checkpoint: {e}")
@@ -319,23 +307,24 @@ class WorkflowEngine:
             # Create error checkpoint if enabled
             if checkpoint_manager:
                 try:
-                    checkpoint_id = await checkpoint_manager.create_checkpoint(
-                        self.service_registry.get_service("symphony_instance"),
+                    await self._checkpoint(
+                        checkpoint_manager, workflow_def, context,
                         name=f"workflow_{workflow.id}_exception",
                         metadata={
-                            "workflow_id": workflow.id,
-                            "workflow_name": workflow_def.name,
                             "exception": str(e),
-                            "stage": "exception",
-                            "timestamp": datetime.now().isoformat()
-                        }
+                            "stage": "exception"
+                        },
+                        context_key="exception_checkpoint_id"
                     )
-                    context.set("exception_checkpoint_id", checkpoint_id)
                 except Exception as checkpoint_error:
                     # Log checkpoint error
                     print(f"Warning: Failed to create exception checkpoint: {checkpoint_error}")
             
         finally:
+            # Wait for the checkpoints still being written
+            if checkpoint_manager:
+                await self._checkpoint_writer(checkpoint_manager).flush()
+                
             # Store final context in workflow metadata
             workflow = await self.workflow_tracker.get_workflow(workflow.id)
             if workflow:
@@ -345,6 +334,314 @@ class WorkflowEngine:
         # Return the updated workflow
         return await self.workflow_tracker.get_workflow(workflow.id)
         
+    async def _start_run(self, 
+                       workflow_def: WorkflowDefinition, 
+                       initial_context: Optional[Dict[str, Any]],
+                       model_assignments: Optional[Dict[str, str]]) -> Tuple[Workflow, WorkflowContext]:
+        """Create a workflow execution and its context.
+        
+        Args:
+            workflow_def: Workflow definition to execute
+            initial_context: Initial context data for workflow execution
+            model_assignments: Models to use for different agent types
+            
+        Returns:
+            The new workflow and its context
+        """
+        workflow = await self.workflow_tracker.create_workflow(
+            name=workflow_def.name,
+            description=workflow_def.description,
+            metadata=workflow_def.metadata.copy()
+        )
+        
+        # Store workflow definition ID in metadata
+        workflow.metadata["workflow_definition_id"] = workflow_def.id
+        await self.workflow_tracker.workflow_repository.update(workflow)
+        
+        # Create workflow context
+        context_data = initial_context.copy() if initial_context else {}
+        
+        # Add model assignments to context if provided
+        if model_assignments:
+            context_data["model_assignments"] = model_assignments
+        elif "model_assignments" in workflow_def.metadata:
+            # Use model assignments from workflow metadata
+            context_data["model_assignments"] = workflow_def.metadata["model_assignments"]
+            
+        # Add default model to context if present in workflow metadata
+        if "default_model" in workflow_def.metadata:
+            context_data["default_model"] = workflow_def.metadata["default_model"]
+            
+        context = WorkflowContext(
+            workflow_id=workflow.id,
+            data=context_data,
+            service_registry=self.service_registry
+        )
+        
+        # Add workflow metadata to context
+        context.set("workflow_name", workflow_def.name)
+        context.set("workflow_id", workflow.id)
+        context.set("workflow_start_time", datetime.now().isoformat())
+        
+        # Update workflow status
+        await self.workflow_tracker.update_workflow_status(
+            workflow.id, WorkflowStatus.RUNNING
+        )
+        return workflow, context
+        
+    async def _load_resumable_run(self, 
+                                checkpoint_manager: Any, 
+                                workflow_def: WorkflowDefinition) -> Optional[Tuple[Workflow, WorkflowContext]]:
+        """Find the latest unfinished run of a workflow definition.
+        
+        The run's context, including the ``step_results.{i}`` of the steps
+        it finished, is reloaded from its latest checkpoint.
+        
+        Args:
+            checkpoint_manager: Checkpoint manager to read checkpoints from
+            workflow_def: Workflow definition about to be executed
+            
+        Returns:
+            The workflow and its restored context, or None if the latest run
+            of the definition completed or cannot be resumed
+        """
+        entry = await checkpoint_manager.latest_entry(definition_id=workflow_def.id)
+        
+        # Only the latest run of the definition is considered
+        if entry is None or entry.metadata.get("stage") == "complete":
+            return None
+        workflow = await self.workflow_tracker.get_workflow(entry.workflow_id)
+        if not workflow or workflow.status == WorkflowStatus.COMPLETED:
+            return None
+        state = await checkpoint_manager.load_entity_state(
+            entry.checkpoint_id, "WorkflowContext", workflow.id
+        )
+        if state is None:
+            return None
+            
+        try:
+            await checkpoint_manager.restore_checkpoint(
+                self.service_registry.get_service("symphony_instance"),
+                entry.checkpoint_id
+            )
+        except Exception as e:
+            # The workflow context alone is enough to continue
+            print(f"Warning: Failed to restore Symphony state from checkpoint: {e}")
+            
+        print(f"Resuming workflow {workflow.id} from checkpoint {entry.checkpoint_id}")
+        context = WorkflowContext(
+            workflow_id=workflow.id,
+            data=state["data"],
+            service_registry=self.service_registry
+        )
+        for key in ("workflow_error", "workflow_error_details"):
+            context.delete(key)
+        context.set("resumed_from_checkpoint_id", entry.checkpoint_id)
+        return workflow, context
+        
+    async def _checkpoint(self, 
+                        checkpoint_manager: Any, 
+                        workflow_def: WorkflowDefinition,
+                        context: WorkflowContext,
+                        name: str,
+                        metadata: Dict[str, Any],
+                        context_key: str) -> None:
+        """Checkpoint the Symphony instance together with a workflow's context.
+        
+        Only the snapshot is taken here: the Symphony entities are encoded
+        and the context is captured copy-on-write, so both reflect the same
+        point of the run. The checkpoint is written in the background.
+        
+        Args:
+            checkpoint_manager: Checkpoint manager to create the checkpoint with
+            workflow_def: Definition of the running workflow
+            context: Context of the running workflow
+            name: Checkpoint name
+            metadata: Stage-specific checkpoint metadata
+            context_key: Context key set to the checkpoint ID once written
+        """
+        snapshot = await checkpoint_manager.snapshot(
+            self.service_registry.get_service("symphony_instance"),
+            extra_entities=[("WorkflowContext", context.snapshot())]
+        )
+        await self._checkpoint_writer(checkpoint_manager).submit(
+            snapshot,
+            name,
+            {
+                "workflow_id": context.workflow_id,
+                "workflow_name": workflow_def.name,
+                "workflow_definition_id": workflow_def.id,
+                **metadata,
+                "timestamp": datetime.now().isoformat()
+            },
+            on_written=lambda checkpoint_id: context.set(context_key, checkpoint_id)
+        )
+        
+    def _checkpoint_writer(self, checkpoint_manager: Any) -> CheckpointWriter:
+        """Get the background writer of a checkpoint manager."""
+        writer = self._checkpoint_writers.get(checkpoint_manager)
+        if writer is None:
+            writer = CheckpointWriter(checkpoint_manager, self.max_pending_checkpoints)
+            self._checkpoint_writers[checkpoint_manager] = writer
+        return writer
+        
+    async def _execute_steps_sequential(self, 
+                                      steps: List[WorkflowStep], 
+                                      context: WorkflowContext,
+                                      on_result: StepCallback,
+                                      completed: Set[int]) -> Optional[StepFailure]:
+        """Execute steps one after another in list order.
+        
+        Args:
+            steps: Steps to execute
+            context: Workflow context
+            on_result: Called with the index, step and result of each step
+            completed: Indexes of steps that already succeeded
+            
+        Returns:
+            Index, step and result of the failed step, or None if all succeeded
+        """
+        for i, step in enumerate(steps):
+            if i in completed:
+                continue
+                
+            # Add step metadata to context
+            context.set("current_step_index", i)
+            context.set("current_step_name", step.name)
+            context.set("current_step_id", step.id)
+            context.set("total_steps", len(steps))
+            
+            # Execute step
+            step_result = await step.execute(context)
+            await on_result(i, step, step_result)
+            
+            # Stop at the first failing step
+            if not step_result.success:
+                return i, step, step_result
+        return None
+        
+    async def _execute_steps_dag(self, 
+                               steps: List[WorkflowStep], 
+                               context: WorkflowContext,
+                               on_result: StepCallback,
+                               completed: Set[int]) -> Optional[StepFailure]:
+        """Execute steps concurrently in the order of their data dependencies.
+        
+        Every step whose dependencies have succeeded is started, bounded by
+        the engine's concurrency limit. After a failure no further steps are
+        started; the ones already running are allowed to finish.
+        
+        Args:
+            steps: Steps to execute
+            context: Workflow context shared by all steps
+            on_result: Called with the index, step and result of each step
+            completed: Indexes of steps that already succeeded
+            
+        Returns:
+            Index, step and result of the first failed step, or None if all succeeded
+        """
+        dependencies = self._step_dependencies(steps)
+        waiting = [len(parents - completed) for parents in dependencies]
+        dependents: List[List[int]] = [[] for _ in steps]
+        for i, parents in enumerate(dependencies):
+            for parent in parents:
+                dependents[parent].append(i)
+                
+        ready = deque(
+            i for i, count in enumerate(waiting) if count == 0 and i not in completed
+        )
+        running: Dict[asyncio.Task, int] = {}
+        failure = None
+        try:
+            while ready or running:
+                while ready and failure is None:
+                    i = ready.popleft()
+                    running[asyncio.create_task(self._execute_step_limited(steps[i], context))] = i
+                if not running:
+                    break
+                    
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.get):
+                    i = running.pop(task)
+                    step_result = task.result()
+                    await on_result(i, steps[i], step_result)
+                    
+                    if not step_result.success:
+                        if failure is None:
+                            failure = (i, steps[i], step_result)
+                        continue
+                    for child in dependents[i]:
+                        waiting[child] -= 1
+                        if waiting[child] == 0:
+                            ready.append(child)
+        finally:
+            for task in running:
+                task.cancel()
+        return failure
+        
+    async def _execute_step_limited(self, step: WorkflowStep, context: WorkflowContext) -> StepResult:
+        """Execute a step while holding one of the engine's concurrency slots."""
+        # A semaphore is bound to the event loop it is first used in, so a
+        # new one is created when the engine is used from another loop
+        loop = asyncio.get_running_loop()
+        if self._step_slots is None or self._step_slots[0] is not loop:
+            self._step_slots = (loop, asyncio.Semaphore(self.max_concurrency))
+        async with self._step_slots[1]:
+            return await step.execute(context)
+        
+    @staticmethod
+    def _step_dependencies(steps: List[WorkflowStep]) -> List[Set[int]]:
+        """Infer the earlier steps each step has to wait for.
+        
+        A step waits for the last earlier writer of every key it reads or
+        writes, and for the earlier readers of every key it writes (since
+        that key was last written), so each key sees the same sequence of
+        reads and writes as in sequential execution. A step that did not
+        declare its inputs and outputs waits for all earlier steps, and all
+        later steps wait for it.
+        
+        Args:
+            steps: Steps in definition order
+            
+        Returns:
+            For each step, the indexes of the steps it depends on
+        """
+        dependencies: List[Set[int]] = []
+        last_writer: Dict[str, int] = {}
+        readers: Dict[str, List[int]] = {}
+        barrier: Optional[int] = None
+        since_barrier: List[int] = []
+        
+        for i, step in enumerate(steps):
+            if not step.declares_io:
+                parents = set(since_barrier)
+                if barrier is not None:
+                    parents.add(barrier)
+                dependencies.append(parents)
+                barrier, since_barrier = i, []
+                last_writer, readers = {}, {}
+                continue
+                
+            parents = {barrier} if barrier is not None else set()
+            for key in step.inputs:
+                if key in last_writer:
+                    parents.add(last_writer[key])
+            for key in step.outputs:
+                if key in last_writer:
+                    parents.add(last_writer[key])
+                parents.update(readers.get(key, ()))
+            parents.discard(i)
+            dependencies.append(parents)
+            
+            for key in step.inputs:
+                readers.setdefault(key, []).append(i)
+            for key in step.outputs:
+                last_writer[key] = i
+                readers[key] = []
+            since_barrier.append(i)
+            
+        return dependencies
+        
     async def _find_matching_checkpoints(self, name_pattern: str) -> List[Dict[str, Any]]:
         """Find checkpoints matching a name pattern.
         
@@ -352,7 +649,7 @@ class WorkflowEngine:
             name_pattern: Pattern to match checkpoint names against
             
         Returns:
-            List of matching checkpoints
+            Catalog entries of the matching checkpoints, newest first
         """
         if CheckpointManager is None:
             return []
@@ -365,25 +662,9 @@ class WorkflowEngine:
             return []
             
         try:
-            # List all checkpoints
-            checkpoints = await checkpoint_manager.list_checkpoints()
-            
-            # Filter by name pattern
-            import fnmatch
-            matching = []
-            for checkpoint in checkpoints:
-                # Convert Checkpoint objects to dictionaries for uniform access
-                if hasattr(checkpoint, 'to_dict'):
-                    # It's a Checkpoint object
-                    checkpoint_dict = checkpoint.to_dict()
-                    if fnmatch.fnmatch(checkpoint_dict.get("name", ""), name_pattern):
-                        matching.append(checkpoint_dict)
-                else:
-                    # It's already a dictionary
-                    if fnmatch.fnmatch(checkpoint.get("name", ""), name_pattern):
-                        matching.append(checkpoint)
-                    
-            return matching
+            # Look the pattern up in the checkpoint catalog (newest first)
+            entries = await checkpoint_manager.find_checkpoints(name_pattern)
+            return [entry.to_dict() for entry in entries]
             
         except Exception as e:
             print(f"Error finding matching checkpoints: {e}")
@@ -271,27 +271,42 @@ class ParallelStep(WorkflowStep):
             semaphore = asyncio.Semaphore(self.max_concurrency)
             
             async def execute_with_semaphore(step: WorkflowStep, index: int) -> StepResult:
+                # Reuse the result of a step that succeeded before a resume
+                if context.get(f"step.{self.id}.completed.{index}"):
+                    return StepResult(
+                        success=True,
+                        output=context.get(f"step.{self.id}.results.{index}", {}),
+                        task_id=context.get(f"step.{self.id}.task_ids.{index}")
+                    )
+                    
                 async with semaphore:
                     # Create a sub-context for each parallel execution
                     sub_context = context.create_sub_context()
                     sub_context.set("parallel_index", index)
                     result = await step.execute(sub_context)
-                    return result
+                    
+                # Store result in context as soon as it is available
+                context.set(f"step.{self.id}.results.{index}", result.output)
+                if result.task_id:
+                    context.set(f"step.{self.id}.task_ids.{index}", result.task_id)
+                if result.success:
+                    context.set(f"step.{self.id}.completed.{index}", True)
+                return result
             
             # Execute all steps concurrently
             results = await asyncio.gather(*[
                 execute_with_semaphore(step, i) for i, step in enumerate(self.steps)
             ])
-            
-            # Store results in context
-            for i, result in enumerate(results):
-                context.set(f"step.{self.id}.results.{i}", result.output)
-                if result.task_id:
-                    context.set(f"step.{self.id}.task_ids.{i}", result.task_id)
                 
             # All steps must succeed for parallel step to succeed
             success = all(result.success for result in results)
             
+            # Progress is only kept for resuming a failed step, so a step
+            # that runs again (e.g. inside a loop) starts from scratch
+            if success:
+                for i in range(len(self.steps)):
+                    context.delete(f"step.{self.id}.completed.{i}")
+            
             # If any step failed, collect errors
             error = None
             if not success:
@@ -368,8 +383,12 @@ class LoopStep(WorkflowStep):
             Result of loop execution
         """
         try:
-            iteration = 0
-            results = []
+            # Continue after the iterations that succeeded before a resume
+            iteration = context.get(f"step.{self.id}.completed_iterations", 0)
+            results = [
+                StepResult(success=True, output=context.get(f"step.{self.id}.iterations.{i}", {}))
+                for i in range(iteration)
+            ]
             
             # Store loop info in context
             context.set(f"step.{self.id}.max_iterations", self.max_iterations)
@@ -394,6 +413,7 @@ class LoopStep(WorkflowStep):
                     break
                     
                 iteration += 1
+                context.set(f"step.{self.id}.completed_iterations", iteration)
                 
             # Store final iteration count
             context.set(f"step.{self.id}.total_iterations", iteration)
@@ -401,6 +421,10 @@ class LoopStep(WorkflowStep):
             # Success if no iterations failed
             success = all(result.success for result in results)
             
+            # Progress is only kept for resuming a failed loop
+            if success:
+                context.delete(f"step.{self.id}.completed_iterations")
+            
             # If any iteration failed, get the error
             error = None
             if not success:
@@ -17,7 +17,7 @@ from datetime import datetime
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Type, ClassVar, Set, Union
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 
 from symphony.core.task import Task
 from symphony.execution.workflow_tracker import WorkflowStatus
@@ -45,14 +45,44 @@ class WorkflowContext(BaseModel):
     data: Dict[str, Any] = Field(default_factory=dict)
     service_registry: Any = None
     
+    # Whether ``data`` is shared with a snapshot and must be copied before
+    # the next write
+    _data_shared: bool = PrivateAttr(default=False)
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get value from context data."""
         return self.data.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set value in context data."""
+        self._own_data()
         self.data[key] = value
         
+    def delete(self, key: str) -> None:
+        """Remove a value from context data, if present."""
+        if key in self.data:
+            self._own_data()
+            del self.data[key]
+            
+    def _own_data(self) -> None:
+        if self._data_shared:
+            self.data = dict(self.data)
+            self._data_shared = False
+            
+    def snapshot(self) -> 'WorkflowContext':
+        """Take a copy-on-write snapshot of the context.
+        
+        The snapshot shares the data dictionary, which this context copies
+        on its next ``set`` or ``delete``, so taking a snapshot is O(1).
+        Values themselves are not copied; they should be replaced with
+        ``set`` rather than mutated in place.
+        
+        Returns:
+            A context holding the data as of now, without a service registry
+        """
+        self._data_shared = True
+        return WorkflowContext.model_construct(workflow_id=self.workflow_id, data=self.data)
+        
     def get_service(self, service_name: str) -> Any:
         """Get service from registry."""
         if not self.service_registry:
@@ -124,6 +154,35 @@ class WorkflowStep(ABC):
         self.id = str(uuid.uuid4())
         self.name = name
         self.description = description
+        self.inputs: Optional[List[str]] = None
+        self.outputs: Optional[List[str]] = None
+        
+    def declare(self, 
+               inputs: Optional[List[str]] = None, 
+               outputs: Optional[List[str]] = None) -> 'WorkflowStep':
+        """Declare the context keys the step reads and writes.
+        
+        The workflow engine uses these declarations to order steps in DAG
+        execution mode. A step without declarations is treated as touching
+        every key, so it runs alone between the steps before and after it.
+        Keys the step only uses privately (``step.{id}.*``) need not be
+        declared.
+        
+        Args:
+            inputs: Context keys read by the step
+            outputs: Context keys written by the step
+            
+        Returns:
+            Self for chaining
+        """
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        return self
+        
+    @property
+    def declares_io(self) -> bool:
+        """Whether the step declared its inputs and outputs."""
+        return self.inputs is not None
         
     def __init_subclass__(cls, **kwargs):
         """Register step subclasses automatically."""
@@ -150,12 +209,16 @@ class WorkflowStep(ABC):
         Returns:
             Dictionary representation of step
         """
-        return {
+        data = {
             "id": self.id,
             "type": self.__class__.__name__,
             "name": self.name,
             "description": self.description
         }
+        if self.declares_io:
+            data["inputs"] = self.inputs
+            data["outputs"] = self.outputs
+        return data
         
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowStep':
@@ -170,11 +233,18 @@ class WorkflowStep(ABC):
         Raises:
             ValueError: If step type is unknown
         """
+        data = dict(data)
         step_type = data.pop("type")
         step_class = cls.STEP_REGISTRY.get(step_type)
         if not step_class:
             raise ValueError(f"Unknown step type: {step_type}")
-        return step_class.from_dict(data)
+        step = step_class.from_dict(data)
+        # Keep the ID stable so context keys like step.{id}.* survive a resume
+        if "id" in data:
+            step.id = data["id"]
+        if "inputs" in data or "outputs" in data:
+            step.declare(data.get("inputs"), data.get("outputs"))
+        return step
 
 
 class WorkflowDefinition(BaseModel):
@@ -249,4 +249,7 @@ class TestWorkflowFacade:
         result = await workflow_facade.execute_workflow(workflow)
         
         assert result is mock_workflow
-        mock_engine.execute_workflow.assert_called_once()
\ No newline at end of file
+        mock_engine.execute_workflow.assert_called_once()
+        
+        # Unfinished runs are only resumed on request
+        assert mock_engine.execute_workflow.call_args.kwargs["resume_from_checkpoint"] is False
\ No newline at end of file
@@ -5,9 +5,11 @@ import asyncio
 from unittest.mock import patch, MagicMock
 
 from symphony.memory.local_kg_memory import (
-    Entity, Relationship, KnowledgeTriplet, LocalGraph,
+    ConversationKnowledgeGraphMemory, Entity, Relationship, KnowledgeTriplet, LocalGraph,
     LocalKnowledgeGraphMemory, SimpleEmbeddingModel, TripletExtractor
 )
+from symphony.memory.graph_store import ColumnarGraphStore, LazyModelMap, _Pending
+from symphony.utils.types import Message
 
 
 class TestLocalKGComponents:
@@ -234,6 +236,169 @@ class TestLocalGraph:
         
         assert found_incoming
 
+    def test_relationship_adjacency(self, tmp_path):
+        """Test relationship dedupe and adjacency on a hub entity."""
+        graph = LocalGraph()
+        graph.adjacency.merge_ratio = 0.0  # Exercise delta merges on small graphs
+        hub = graph.add_entity(name="Hub")
+        leaves = [graph.add_entity(name=f"Leaf{i}") for i in range(3000)]
+        for leaf in leaves:
+            graph.add_relationship(hub, "links", leaf)
+        assert len(graph.relationships) == 3000
+
+        # Duplicates resolve to the existing relationship and update it
+        again = graph.add_relationship(hub, "links", leaves[10], properties={"weight": 2})
+        assert again is graph.rel_index[hub.id][10]
+        assert again.properties == {"weight": 2}
+        assert len(graph.relationships) == 3000
+
+        # Merged and pending edges are listed in insertion order
+        loop = graph.add_relationship(leaves[0], "self", leaves[0])
+        assert [rel.target_id for rel in graph.rel_index[hub.id]] == [leaf.id for leaf in leaves]
+        assert graph.rel_index[leaves[0].id] == [graph.rel_index[hub.id][0], loop, loop]
+        assert "missing" not in graph.rel_index
+        assert graph.rel_index["missing"] == []
+        assert graph.rel_index.get("missing") is None
+        assert len(graph.rel_index) == 3001
+
+        for path in (str(tmp_path / "graph.pkl"), str(tmp_path / "graph")):
+            graph.save(path)
+            loaded = LocalGraph()
+            loaded.load(path)
+            assert len(loaded.rel_index[hub.id]) == 3000
+            assert loaded.add_relationship(hub.id, "links", leaves[5].id).id == graph.rel_index[hub.id][5].id
+            assert len(loaded.relationships) == 3001
+
+    def test_search_triplets_embeds_once(self):
+        """Test that triplets are embedded at insert time, not per search."""
+        graph = LocalGraph()
+        graph.add_triplet(KnowledgeTriplet(subject="Alice", predicate="works_at", object="Acme"))
+        graph.add_triplet(KnowledgeTriplet(subject="Bob", predicate="lives_in", object="Paris"))
+        
+        with patch.object(graph.embedding_model, "embed", wraps=graph.embedding_model.embed) as embed:
+            results = graph.search_triplets("Alice works_at Acme", limit=1)
+        
+        # Only the query is embedded
+        assert embed.call_count == 1
+        assert results[0][0].subject == "Alice"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    
+    def test_add_triplet_embeds_in_one_batch(self):
+        """Test that a triplet's new entities and text are embedded together."""
+        graph = LocalGraph()
+        graph.add_entity(name="Alice")
+        triplet = KnowledgeTriplet(subject="Alice", predicate="works_at", object="Acme")
+        assert graph.texts_to_embed(triplet) == ["Acme", "Alice works_at Acme"]
+
+        with patch.object(graph.embedding_model, "embed_batch", wraps=graph.embedding_model.embed_batch) as batch:
+            graph.add_triplet(triplet)
+
+        batch.assert_called_once_with(["Acme", "Alice works_at Acme"])
+        assert graph.get_entity("Acme").embedding == graph.embedding_model.embed("Acme")
+        assert graph.search_triplets("Alice works_at Acme", limit=1)[0][0] is triplet
+
+    def test_search_entities(self):
+        """Test vectorized entity search with limit and threshold."""
+        graph = LocalGraph()
+        graph.add_entity(name="machine learning")
+        graph.add_entity(name="deep learning")
+        graph.add_entity(name="cooking recipes")
+        
+        results = graph.search_entities("machine learning", limit=2, threshold=0.0)
+        assert results[0][0].name == "machine learning"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(results) <= 2
+        
+        # Scores match the scalar similarity helper
+        entity, score = results[0]
+        query_embedding = graph.embedding_model.embed("machine learning")
+        assert score == pytest.approx(graph._cosine_similarity(query_embedding, entity.embedding), abs=1e-5)
+        
+        assert graph.search_entities("machine learning", threshold=1.01) == []
+    
+    def test_save_and_load_triplet_index(self, tmp_path):
+        """Test that the triplet index is persisted and restored."""
+        filepath = str(tmp_path / "graph.pkl")
+        graph = LocalGraph()
+        graph.add_triplet(KnowledgeTriplet(subject="Alice", predicate="works_at", object="Acme"))
+        graph.add_triplet(KnowledgeTriplet(subject="Bob", predicate="lives_in", object="Paris"))
+        graph.save(filepath)
+        
+        loaded = LocalGraph()
+        with patch.object(loaded.embedding_model, "embed", wraps=loaded.embedding_model.embed) as embed:
+            loaded.load(filepath)
+        
+        # Stored triplet embeddings are reused rather than recomputed
+        assert embed.call_count == 0
+        assert len(loaded.triplet_index) == 2
+        results = loaded.search_triplets("Bob lives_in Paris", limit=1)
+        assert results[0][0].subject == "Bob"
+
+    def test_columnar_save_and_load(self, tmp_path):
+        """Test a columnar round trip that only builds models on access."""
+        path = str(tmp_path / "graph")
+        graph = LocalGraph()
+        graph.add_entity(name="Alice", entity_type="person", properties={"age": 30})
+        graph.add_triplet(KnowledgeTriplet(subject="Alice", predicate="works_at", object="Acme"))
+        graph.add_triplet(KnowledgeTriplet(subject="Bob", predicate="lives_in", object="Paris"))
+        graph.save(path)
+
+        loaded = LocalGraph()
+        with patch.object(loaded.embedding_model, "embed", wraps=loaded.embedding_model.embed) as embed:
+            loaded.load(path)
+        assert embed.call_count == 0
+
+        # Nothing is materialized until it is read
+        assert isinstance(loaded.entities, LazyModelMap)
+        assert isinstance(loaded.entities._items[graph.entity_names["Alice"]], _Pending)
+        alice = loaded.get_entity("Alice")
+        assert alice.type == "person"
+        assert alice.properties == {"age": 30}
+        assert alice.created_at == graph.get_entity("Alice").created_at
+
+        assert len(loaded.triplets) == 2
+        assert loaded.search_triplets("Bob lives_in Paris", limit=1)[0][0].subject == "Bob"
+        assert loaded.search_entities("Acme", limit=1)[0][0].name == "Acme"
+
+        relationships = loaded.get_entity_relationships("Alice")
+        assert [(source.name, rel_type, target.name) for source, rel_type, target in relationships] == [
+            ("Alice", "works_at", "Acme")
+        ]
+
+    def test_columnar_save_changes_appends_segments(self, tmp_path):
+        """Test that incremental saves append segments and compact at the limit."""
+        path = str(tmp_path / "graph")
+        store = ColumnarGraphStore(path)
+        graph = LocalGraph()
+        graph.add_triplet(KnowledgeTriplet(subject="Alice", predicate="works_at", object="Acme"))
+        graph.save_changes(path)
+        assert len(store.segment_names()) == 1
+
+        graph.add_entity(name="Alice", properties={"role": "engineer"})
+        graph.add_triplet(KnowledgeTriplet(subject="Bob", predicate="lives_in", object="Paris"))
+        graph.save_changes(path)
+        assert len(store.segment_names()) == 2
+
+        # No changes, no new segment
+        graph.save_changes(path)
+        assert len(store.segment_names()) == 2
+
+        loaded = LocalGraph()
+        loaded.load(path)
+        assert len(loaded.entities) == 4
+        assert len(loaded.triplets) == 2
+        assert loaded.get_entity("Alice").properties == {"role": "engineer"}
+        assert loaded.search_triplets("Alice works_at Acme", limit=1)[0][0].object == "Acme"
+
+        loaded.add_triplet(KnowledgeTriplet(subject="Carol", predicate="knows", object="Alice"))
+        loaded.save_changes(path, max_segments=2)
+        assert len(store.segment_names()) == 1
+
+        reloaded = LocalGraph()
+        reloaded.load(path)
+        assert len(reloaded.triplets) == 3
+        assert len(reloaded.get_entity_relationships("Alice")) == 2
+
 
 class TestLocalKnowledgeGraphMemory:
     """Test suite for LocalKnowledgeGraphMemory."""
@@ -271,7 +436,24 @@ class TestLocalKnowledgeGraphMemory:
         # Check that entities were created in the graph
         assert kg_memory.graph.get_entity("Symphony") is not None
         assert kg_memory.graph.get_entity("a framework") is not None
-    
+
+    @pytest.mark.asyncio
+    async def test_write_behind(self, tmp_path):
+        """Test that write-behind batches changes into segments until flushed."""
+        path = str(tmp_path / "graph")
+        memory = LocalKnowledgeGraphMemory(
+            storage_path=path, auto_extract=False, write_behind=True, flush_interval=60
+        )
+        await memory.add_triplet(subject="Alice", predicate="works_at", object="Acme")
+        await memory.add_triplet(subject="Bob", predicate="lives_in", object="Paris")
+        assert not ColumnarGraphStore(path).exists()
+
+        await memory.aclose()
+        assert len(ColumnarGraphStore(path).segment_names()) == 1
+
+        reloaded = LocalKnowledgeGraphMemory(storage_path=path, auto_extract=False)
+        assert len(reloaded.graph.triplets) == 2
+
     @pytest.mark.asyncio
     async def test_extract_and_store(self, kg_memory, monkeypatch):
         """Test extracting and storing triplets from text."""
@@ -407,4 +589,62 @@ class TestLocalKnowledgeGraphMemory:
                 found_supports_relation = True
         
         assert found_is_relation
-        assert found_supports_relation
\ No newline at end of file
+        assert found_supports_relation
+
+
+class TestConversationKnowledgeGraphMemory:
+    """Test suite for ConversationKnowledgeGraphMemory."""
+    
+    @pytest.mark.asyncio
+    async def test_search_conversation(self):
+        """Test that messages are ranked by similarity to the query."""
+        memory = ConversationKnowledgeGraphMemory(auto_extract=False)
+        await memory.add_message(Message(role="user", content="What is the weather in Paris?"))
+        await memory.add_message(Message(role="assistant", content="Python is a programming language."))
+        await memory.add_message(Message(role="user", content=""))
+        
+        results = await memory.search_conversation("weather in Paris", limit=2)
+        assert len(results) == 2
+        assert results[0]["index"] == 0
+        assert results[0]["message"].content == "What is the weather in Paris?"
+        assert results[0]["score"] >= results[1]["score"]
+    
+    @pytest.mark.asyncio
+    async def test_search_conversation_uses_cached_embeddings(self):
+        """Test that searches reuse message embeddings and honor the window."""
+        memory = ConversationKnowledgeGraphMemory(auto_extract=False)
+        await memory.add_message(Message(role="user", content="What is the weather in Paris?"))
+        await memory.add_message(Message(role="assistant", content="Python is a programming language."))
+        await memory.add_message(Message(role="user", content="Tell me about Java."))
+        
+        embedding_model = memory.graph.embedding_model
+        with patch.object(embedding_model, "embed", wraps=embedding_model.embed) as embed:
+            results = await memory.search_conversation("weather in Paris", limit=3)
+            assert embed.call_count == 1
+        assert results[0]["index"] == 0
+        
+        # Only the last two messages are scanned within the window
+        results = await memory.search_conversation("weather in Paris", window=2)
+        assert sorted(r["index"] for r in results) == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_add_message(self):
+        """Test that concurrent adds keep each message's index and links."""
+        memory = ConversationKnowledgeGraphMemory(auto_extract=False)
+        contents = ["First message", "Second message", "Third message"]
+        await asyncio.gather(*(
+            memory.add_message(Message(role="user", content=content)) for content in contents
+        ))
+        
+        for i, content in enumerate(contents):
+            entity = memory.graph.get_entity(f"message_{i + 1}")
+            assert entity.properties["index"] == i
+            assert entity.properties["content"] == memory.get_messages()[i].content
+        
+        for i in (1, 2):
+            links = [
+                target.name
+                for _, rel_type, target in memory.graph.get_entity_relationships(f"message_{i}")
+                if rel_type == "followed_by"
+            ]
+            assert links == [f"message_{i + 1}"]
@@ -11,6 +11,7 @@ from symphony.memory.memory_manager import (
     MemoryManager,
     WorkingMemory
 )
+from symphony.memory.local_kg_memory import LocalKnowledgeGraphMemory
 from symphony.memory.vector_memory import VectorMemory
 from symphony.utils.types import Message
 
@@ -158,6 +159,51 @@ class TestMemoryManager:
         # Check that store was called on the new memory system
         new_memory.store.assert_called_once_with("key5", "value5")
         
+    @pytest.mark.asyncio
+    async def test_retrieve_many(self, memory_manager):
+        """Test batched semantic retrieval across several queries."""
+        await memory_manager.store("python", "Python is a programming language", importance=0.9)
+        await memory_manager.store("weather", "The weather is sunny today", importance=0.9)
+        
+        results = await memory_manager.retrieve_many(
+            ["python programming", "sunny weather"],
+            limit=1
+        )
+        assert results == [
+            ["Python is a programming language"],
+            ["The weather is sunny today"]
+        ]
+        
+    @pytest.mark.asyncio
+    async def test_retrieve_many_with_async_search(self, memory_manager):
+        """Test batched retrieval awaits memories whose search is async."""
+        kg = LocalKnowledgeGraphMemory(auto_extract=False)
+        await kg.store("python", "Python is a programming language")
+        memory_manager.add_memory_system("kg", kg)
+        
+        results = await memory_manager.retrieve_many(
+            ["python", "weather"],
+            memory_types=["kg"],
+            limit=1
+        )
+        assert len(results) == 2
+        assert results[0][0]["name"] == "python"
+        
+    @pytest.mark.asyncio
+    async def test_concurrent_stores_share_embedding_batches(self, memory_manager):
+        """Test that concurrent stores are embedded in one batched call."""
+        embedder = memory_manager.memories["long_term"].embedder
+        embedder.embed_batch = mock.Mock(side_effect=lambda texts: [embedder.embed(t) for t in texts])
+        
+        await asyncio.gather(*(
+            memory_manager.store(f"fact_{i}", f"Fact number {i}", importance=0.9)
+            for i in range(5)
+        ))
+        
+        embedder.embed_batch.assert_called_once()
+        assert len(embedder.embed_batch.call_args[0][0]) == 5
+        assert await memory_manager.retrieve("fact_3") == "Fact number 3"
+        
     @pytest.mark.asyncio
     async def test_consolidate(self, memory_manager):
         """Test memory consolidation."""
@@ -208,6 +254,13 @@ class TestConversationMemoryManager:
         assert len(results) > 0
         assert "machine learning" in results[0].content.lower()
         
+        # Batched searches match one search per query
+        batched = await conversation_memory_manager.search_conversation_many(
+            ["machine learning", "deep learning"]
+        )
+        assert batched[0] == results
+        assert batched[1] == await conversation_memory_manager.search_conversation("deep learning")
+        
     @pytest.mark.asyncio
     async def test_importance_strategy(self, conversation_memory_manager):
         """Test the importance strategy."""
@@ -0,0 +1,135 @@
+"""Unit tests for DAG-based orchestration."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from symphony.orchestration.base import OrchestratorConfig
+from symphony.orchestration.dag import DAG, DAGOrchestrator, Edge, Node, NodeType
+
+
+class SleepyAgent:
+    """Agent stub that records how many agents run at the same time."""
+    
+    def __init__(self, name, tracker, delay=0.05, fail=False):
+        self.name = name
+        self.tracker = tracker
+        self.delay = delay
+        self.fail = fail
+    
+    async def run(self, input_message):
+        self.tracker["running"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        self.tracker["order"].append(self.name)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError(f"{self.name} failed")
+            return f"{self.name}({input_message})"
+        finally:
+            self.tracker["running"] -= 1
+
+
+def fan_out_dag(width):
+    """START -> worker_0..worker_{width-1} -> END."""
+    dag = DAG()
+    dag.add_node(Node(id="start", type=NodeType.START))
+    dag.add_node(Node(id="end", type=NodeType.END))
+    for i in range(width):
+        dag.add_node(Node(id=f"worker_{i}", type=NodeType.AGENT, config={"agent_name": f"agent_{i}"}))
+        dag.add_edge(Edge(source="start", target=f"worker_{i}"))
+        dag.add_edge(Edge(source=f"worker_{i}", target="end"))
+    return dag
+
+
+def make_orchestrator(dag, agents, max_concurrency=None):
+    orchestrator = DAGOrchestrator(
+        OrchestratorConfig(max_concurrency=max_concurrency), MagicMock(), MagicMock()
+    )
+    orchestrator.agents = agents
+    orchestrator.set_dag(dag)
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_ready_nodes_run_concurrently():
+    """Test that independent nodes run at the same time."""
+    tracker = {"running": 0, "peak": 0, "order": []}
+    agents = {f"agent_{i}": SleepyAgent(f"agent_{i}", tracker) for i in range(4)}
+    orchestrator = make_orchestrator(fan_out_dag(4), agents)
+    
+    output = await orchestrator.run("hi")
+    
+    assert tracker["peak"] == 4
+    assert sorted(output.splitlines()) == [f"agent_{i}(hi)" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_running_nodes():
+    """Test that the config bounds how many nodes run at once."""
+    tracker = {"running": 0, "peak": 0, "order": []}
+    agents = {f"agent_{i}": SleepyAgent(f"agent_{i}", tracker) for i in range(5)}
+    orchestrator = make_orchestrator(fan_out_dag(5), agents, max_concurrency=2)
+    
+    output = await orchestrator.run("hi")
+    
+    assert tracker["peak"] == 2
+    assert len(output.splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_children_wait_for_all_parents():
+    """Test that a child is released once its last parent completes, and not after failures."""
+    tracker = {"running": 0, "peak": 0, "order": []}
+    dag = DAG()
+    dag.add_node(Node(id="start", type=NodeType.START))
+    for name, delay in (("fast", 0.01), ("slow", 0.05), ("join", 0.01), ("broken", 0.01), ("after", 0.01)):
+        dag.add_node(Node(id=name, type=NodeType.AGENT, config={"agent_name": name}))
+    dag.add_edge(Edge(source="start", target="fast"))
+    dag.add_edge(Edge(source="start", target="slow"))
+    dag.add_edge(Edge(source="fast", target="join"))
+    dag.add_edge(Edge(source="slow", target="join"))
+    dag.add_edge(Edge(source="start", target="broken"))
+    dag.add_edge(Edge(source="broken", target="after"))
+    agents = {
+        "fast": SleepyAgent("fast", tracker, delay=0.01),
+        "slow": SleepyAgent("slow", tracker, delay=0.05),
+        "join": SleepyAgent("join", tracker, delay=0.01),
+        "broken": SleepyAgent("broken", tracker, delay=0.01, fail=True),
+        "after": SleepyAgent("after", tracker, delay=0.01),
+    }
+    orchestrator = make_orchestrator(dag, agents)
+    
+    output = await orchestrator.run("hi")
+    
+    assert tracker["order"][-1] == "join"
+    assert "after" not in tracker["order"]
+    assert output == "Workflow completed with 4 successful nodes and 1 errors."
+
+
+@pytest.mark.asyncio
+async def test_dag_adjacency_indexes():
+    """Test cached adjacency lookups, invalidation and cycle detection."""
+    dag = fan_out_dag(3)
+    dag.add_edge(Edge(source="worker_0", target="missing"))
+    
+    assert [node.id for node in dag.get_children("start")] == ["worker_0", "worker_1", "worker_2"]
+    assert [node.id for node in dag.get_parents("end")] == ["worker_0", "worker_1", "worker_2"]
+    assert [edge.target for edge in dag.get_outgoing_edges("worker_0")] == ["end"]
+    assert dag.get_in_degrees() == {"start": 0, "end": 3, "worker_0": 1, "worker_1": 1, "worker_2": 1}
+    
+    # Adding nodes and edges invalidates the indexes
+    dag.add_node(Node(id="extra", type=NodeType.AGENT))
+    dag.add_edge(Edge(source="extra", target="end"))
+    assert dag.get_in_degrees()["end"] == 4
+    dag.edges.append(Edge(source="start", target="extra"))
+    assert [node.id for node in dag.get_parents("extra")] == ["start"]
+    
+    order = dag.validate()
+    assert order[0] == "start" and order[-1] == "end"
+    
+    dag.add_edge(Edge(source="end", target="worker_1"))
+    with pytest.raises(ValueError, match="cycle"):
+        dag.validate()
+    with pytest.raises(ValueError, match="cycle"):
+        await make_orchestrator(dag, {}).run("hi")
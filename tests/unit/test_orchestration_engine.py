@@ -1,5 +1,6 @@
 """Unit tests for the workflow engine."""
 
+import asyncio
 import pytest
 from datetime import datetime
 from unittest.mock import MagicMock, AsyncMock, patch
@@ -14,6 +15,11 @@ from symphony.orchestration.workflow_definition import (
     StepResult
 )
 from symphony.orchestration.engine import WorkflowEngine
+from symphony.orchestration.checkpointing import CheckpointPolicy
+from symphony.orchestration.steps import ParallelStep, LoopStep
+from symphony.persistence.memory_repository import InMemoryRepository
+from symphony.core.state import CheckpointManager, FileStorageProvider
+from symphony.core.task import Task
 
 
 class MockStep(WorkflowStep):
@@ -52,6 +58,66 @@ class MockStep(WorkflowStep):
         )
 
 
+class SleepStep(WorkflowStep):
+    """Step that sleeps and logs when it starts and ends."""
+    
+    log = []
+    
+    def __init__(self, name, description="", delay=0.02, should_succeed=True):
+        super().__init__(name, description)
+        self.delay = delay
+        self.should_succeed = should_succeed
+        
+    async def execute(self, context):
+        """Log the start, sleep, write the declared outputs and log the end."""
+        SleepStep.log.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        for key in self.outputs or []:
+            context.set(key, self.name)
+        SleepStep.log.append(("end", self.name))
+        return StepResult(success=self.should_succeed, output={}, error=None if self.should_succeed else "boom")
+    
+    def to_dict(self):
+        """Convert to dictionary for serialization."""
+        data = super().to_dict()
+        data["delay"] = self.delay
+        data["should_succeed"] = self.should_succeed
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary."""
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            delay=data.get("delay", 0.02),
+            should_succeed=data.get("should_succeed", True)
+        )
+
+
+class FlakyStep(WorkflowStep):
+    """Step that counts its runs and fails on chosen ones."""
+    
+    runs = {}
+    failing_runs = set()  # (name, run number) pairs that fail
+    
+    async def execute(self, context):
+        """Count the run and fail if it is one of the failing runs."""
+        run = FlakyStep.runs[self.name] = FlakyStep.runs.get(self.name, 0) + 1
+        if (self.name, run) in FlakyStep.failing_runs:
+            return StepResult(success=False, output={"run": run}, error=f"{self.name} failed")
+        return StepResult(success=True, output={"run": run})
+    
+    def to_dict(self):
+        """Convert to dictionary for serialization."""
+        return super().to_dict()
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary."""
+        return cls(name=data["name"], description=data.get("description", ""))
+
+
 @pytest.fixture
 def mock_registry():
     """Create a mock service registry."""
@@ -397,4 +463,229 @@ class TestWorkflowEngine:
         assert f"step_results.1" in updated_workflow.metadata["context"]
         assert updated_workflow.metadata["context"][f"step_results.1"]["name"] == "Step2"
         assert updated_workflow.metadata["context"][f"step_results.1"]["output"]["result"] == "Step 2 result"
-        assert updated_workflow.metadata["context"][f"step_results.1"]["output"]["data"] == ["a", "b", "c"]
\ No newline at end of file
+        assert updated_workflow.metadata["context"][f"step_results.1"]["output"]["data"] == ["a", "b", "c"]
+        
+    def test_step_dependencies_from_declared_keys(self):
+        """Test inferring step dependencies from declared inputs and outputs."""
+        steps = [
+            SleepStep("a").declare(outputs=["x"]),
+            SleepStep("b").declare(outputs=["y"]),
+            SleepStep("c").declare(inputs=["x", "y"], outputs=["z"]),
+            SleepStep("d").declare(inputs=["x"]),
+            SleepStep("e").declare(outputs=["x"]),
+            SleepStep("f"),
+            SleepStep("g").declare(inputs=["z"])
+        ]
+        
+        dependencies = WorkflowEngine._step_dependencies(steps)
+        
+        assert dependencies[0] == set()
+        assert dependencies[1] == set()
+        assert dependencies[2] == {0, 1}
+        assert dependencies[3] == {0}
+        # Overwriting x waits for its last writer and for its readers
+        assert dependencies[4] == {0, 2, 3}
+        # Undeclared steps run alone between their neighbours
+        assert dependencies[5] == {0, 1, 2, 3, 4}
+        assert dependencies[6] == {5}
+        
+        # Declarations survive serialization
+        restored = WorkflowStep.from_dict(steps[2].to_dict())
+        assert restored.inputs == ["x", "y"]
+        assert restored.outputs == ["z"]
+        assert not WorkflowStep.from_dict(steps[5].to_dict()).declares_io
+        
+    @pytest.mark.asyncio
+    async def test_execute_workflow_dag_mode(self, mock_registry, mock_workflow_def_repo, mock_workflow_tracker):
+        """Test that DAG mode runs independent steps concurrently."""
+        workflow_def = WorkflowDefinition(name="DAG Workflow")
+        workflow_def = workflow_def.add_step(SleepStep("a").declare(outputs=["x"]))
+        workflow_def = workflow_def.add_step(SleepStep("b").declare(outputs=["y"]))
+        workflow_def = workflow_def.add_step(SleepStep("c").declare(inputs=["x", "y"], outputs=["z"]))
+        
+        def run(mode, max_concurrency=8):
+            SleepStep.log = []
+            engine = WorkflowEngine(
+                service_registry=mock_registry,
+                workflow_definition_repository=mock_workflow_def_repo,
+                workflow_tracker=mock_workflow_tracker,
+                max_concurrency=max_concurrency
+            )
+            return engine.execute_workflow(workflow_def, execution_mode=mode)
+        
+        # Sequential execution stays the default
+        await run(None)
+        assert SleepStep.log == [
+            ("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")
+        ]
+        
+        await run("dag")
+        assert SleepStep.log[:2] == [("start", "a"), ("start", "b")]
+        assert SleepStep.log[-2:] == [("start", "c"), ("end", "c")]
+        mock_workflow_tracker.update_workflow_status.assert_any_call(
+            "test_workflow_id", WorkflowStatus.COMPLETED
+        )
+        context = mock_workflow_tracker.workflow_repository.update.call_args_list[-1][0][0].metadata["context"]
+        assert context["z"] == "c"
+        assert [context[f"step_results.{i}"]["name"] for i in range(3)] == ["a", "b", "c"]
+        
+        # The concurrency cap applies to DAG mode
+        await run("dag", max_concurrency=1)
+        assert SleepStep.log[:2] == [("start", "a"), ("end", "a")]
+        
+        with pytest.raises(ValueError, match="Unknown execution mode"):
+            await run("unordered")
+            
+    def test_execute_workflow_dag_mode_across_event_loops(self, mock_registry, mock_workflow_def_repo, mock_workflow_tracker):
+        """Test that one engine runs capped DAG workflows in separate event loops."""
+        workflow_def = WorkflowDefinition(name="DAG Workflow")
+        workflow_def = workflow_def.add_step(SleepStep("a").declare(outputs=["x"]))
+        workflow_def = workflow_def.add_step(SleepStep("b").declare(outputs=["y"]))
+        engine = WorkflowEngine(
+            service_registry=mock_registry,
+            workflow_definition_repository=mock_workflow_def_repo,
+            workflow_tracker=mock_workflow_tracker,
+            max_concurrency=1
+        )
+        
+        for _ in range(2):
+            SleepStep.log = []
+            asyncio.run(engine.execute_workflow(workflow_def, execution_mode="dag"))
+            assert SleepStep.log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+            
+    @pytest.mark.asyncio
+    async def test_execute_workflow_dag_mode_failure(self, workflow_engine, mock_workflow_tracker):
+        """Test that DAG mode skips the dependents of a failed step."""
+        workflow_def = WorkflowDefinition(name="Failing DAG Workflow", metadata={"execution_mode": "dag"})
+        workflow_def = workflow_def.add_step(SleepStep("a", should_succeed=False).declare(outputs=["x"]))
+        workflow_def = workflow_def.add_step(SleepStep("b", delay=0.05).declare(outputs=["y"]))
+        workflow_def = workflow_def.add_step(SleepStep("c").declare(inputs=["x"]))
+        SleepStep.log = []
+        
+        await workflow_engine.execute_workflow(workflow_def)
+        
+        # b was already running and finishes, c never starts
+        assert ("end", "b") in SleepStep.log
+        assert ("start", "c") not in SleepStep.log
+        mock_workflow_tracker.update_workflow_status.assert_any_call(
+            "test_workflow_id", WorkflowStatus.FAILED, "Step 'a' failed: boom"
+        )
+            
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(self, tmp_path, mock_workflow_def_repo):
+        """Test that a failed run resumes after the work it already finished."""
+        checkpoint_manager = CheckpointManager(FileStorageProvider(str(tmp_path)))
+        services = {"checkpoint_manager": checkpoint_manager, "symphony_instance": object()}
+        registry = MagicMock(spec=ServiceRegistry)
+        registry.get_service.side_effect = services.__getitem__
+        tracker = WorkflowTracker(InMemoryRepository(Workflow), InMemoryRepository(Task))
+        engine = WorkflowEngine(
+            service_registry=registry,
+            workflow_definition_repository=mock_workflow_def_repo,
+            workflow_tracker=tracker
+        )
+        
+        workflow_def = WorkflowDefinition(name="Resumable Workflow")
+        for step in [
+            FlakyStep("a"),
+            ParallelStep("fan out", steps=[FlakyStep("p1"), FlakyStep("p2")]),
+            LoopStep("loop", step=FlakyStep("body"), max_iterations=3),
+            FlakyStep("c")
+        ]:
+            workflow_def = workflow_def.add_step(step)
+        FlakyStep.runs = {}
+        FlakyStep.failing_runs = {("p2", 1), ("body", 2)}
+        
+        # The first run fails in the parallel step, the second one in the loop
+        first = await engine.execute_workflow(workflow_def)
+        assert first.status == WorkflowStatus.FAILED
+        second = await engine.execute_workflow(workflow_def, resume_from_checkpoint=True)
+        assert second.id == first.id
+        assert second.status == WorkflowStatus.FAILED
+        third = await engine.execute_workflow(workflow_def, resume_from_checkpoint=True)
+        assert third.id == first.id
+        assert third.status == WorkflowStatus.COMPLETED
+        
+        # Finished steps, parallel branches and loop iterations ran once
+        assert FlakyStep.runs == {"a": 1, "p1": 1, "p2": 2, "body": 4, "c": 1}
+        context = third.metadata["context"]
+        assert context["step_results.2"]["output"]["iterations"] == 3
+        assert "workflow_error" not in context
+        
+        # A completed run is not resumed
+        fourth = await engine.execute_workflow(workflow_def, resume_from_checkpoint=True)
+        assert fourth.id != first.id
+        assert FlakyStep.runs["a"] == 2
+        
+        # Runs are only resumed when asked to
+        FlakyStep.failing_runs = {("c", 3)}
+        fifth = await engine.execute_workflow(workflow_def)
+        assert fifth.status == WorkflowStatus.FAILED
+        sixth = await engine.execute_workflow(workflow_def, {"fresh": True})
+        assert sixth.id != fifth.id
+        assert sixth.status == WorkflowStatus.COMPLETED
+        assert sixth.metadata["context"]["fresh"] is True
+        assert FlakyStep.runs["a"] == 4
+        
+    def test_checkpoint_policy(self):
+        """Test step- and time-based checkpoint policies."""
+        assert CheckpointPolicy.coerce(None).every_steps == 3
+        assert CheckpointPolicy.coerce(5).every_steps == 5
+        timed = CheckpointPolicy.coerce({"every_steps": None, "every_seconds": 30})
+        assert not timed.is_due(steps_since=100, seconds_since=10)
+        assert timed.is_due(steps_since=1, seconds_since=30)
+        assert CheckpointPolicy(every_steps=2).is_due(steps_since=2, seconds_since=0)
+        with pytest.raises(ValueError):
+            CheckpointPolicy.coerce({"every": 3})
+            
+    @pytest.mark.asyncio
+    async def test_checkpoints_written_in_background(self, tmp_path, mock_workflow_def_repo):
+        """Test that steps do not wait for checkpoints to be written."""
+        class SlowCheckpointManager(CheckpointManager):
+            async def write_snapshot(self, snapshot, name=None, metadata=None):
+                await asyncio.sleep(0.05)
+                checkpoint_id = await super().write_snapshot(snapshot, name, metadata)
+                SleepStep.log.append(("written", name.split("_", 2)[2]))
+                return checkpoint_id
+                
+        services = {
+            "checkpoint_manager": SlowCheckpointManager(FileStorageProvider(str(tmp_path))),
+            "symphony_instance": object()
+        }
+        registry = MagicMock(spec=ServiceRegistry)
+        registry.get_service.side_effect = services.__getitem__
+        tracker = WorkflowTracker(InMemoryRepository(Workflow), InMemoryRepository(Task))
+        engine = WorkflowEngine(
+            service_registry=registry,
+            workflow_definition_repository=mock_workflow_def_repo,
+            workflow_tracker=tracker,
+            max_pending_checkpoints=1
+        )
+        
+        workflow_def = WorkflowDefinition(name="Background Checkpoints", metadata={"checkpoint_policy": 2})
+        for name in "abcd":
+            workflow_def = workflow_def.add_step(SleepStep(name, delay=0.01))
+        SleepStep.log = []
+        
+        workflow = await engine.execute_workflow(workflow_def)
+        
+        # The first step ran while the start checkpoint was being written
+        assert SleepStep.log.index(("start", "a")) < SleepStep.log.index(("written", "start"))
+        # Every checkpoint was written, in order, before the workflow returned
+        assert [event[1] for event in SleepStep.log if event[0] == "written"] == [
+            "start", "step_1", "step_3", "complete"
+        ]
+        # The writer task ends once its queue is drained
+        assert engine._checkpoint_writer(services["checkpoint_manager"])._task.done()
+        assert workflow.status == WorkflowStatus.COMPLETED
+        context = workflow.metadata["context"]
+        assert context["initial_checkpoint_id"].startswith("ckpt_")
+        assert context["completion_checkpoint_id"].startswith("ckpt_")
+        assert context["checkpoint_after_step_3"].startswith("ckpt_")
+        
+        # The snapshot holds the context as of the checkpoint
+        state = await services["checkpoint_manager"].load_entity_state(
+            context["checkpoint_after_step_1"], "WorkflowContext", workflow.id
+        )
+        assert "step_results.1" in state["data"]
+        assert "step_results.2" not in state["data"]
@@ -6,6 +6,8 @@ import tempfile
 import asyncio
 from typing import Dict, Any, List
 
+import numpy as np
+
 from symphony.core.registry.backends.base import (
     StorageBackend, 
     BackendType,
@@ -14,10 +16,13 @@ from symphony.core.registry.backends.base import (
 
 from symphony.core.registry.backends.vector_store import (
     InMemoryVectorStore, 
-    FileVectorStore
+    FileVectorStore,
+    IVFVectorStore,
+    MetadataIndex
 )
 
 from symphony.core.registry.backends.knowledge_graph import (
+    KnowledgeGraphBackend,
     InMemoryKnowledgeGraph,
     FileKnowledgeGraph
 )
@@ -143,6 +148,258 @@ async def test_vector_store_file_backend(temp_dir):
     await backend.disconnect()
 
 
+@pytest.mark.asyncio
+async def test_vector_store_file_backend_packed(temp_dir):
+    """Test packed segment storage, tombstones, reload and compaction."""
+    path = os.path.join(temp_dir, "vector_store_packed")
+    backend = FileVectorStore(path, segment_size=2, compaction_ratio=0.4)
+    assert backend.storage == "packed"
+    await backend.initialize({})
+    await backend.connect()
+    
+    for i in range(5):
+        await backend.add(f"v{i}", [float(i), 1.0, 0.0], {"i": i})
+    await backend.add("v0", [0.0, 0.0, 1.0], {"i": 0, "updated": True})
+    await backend.delete("v1")
+    assert backend.packed.segments == ["seg-000001", "seg-000002", "seg-000003"]
+    assert backend.packed.tombstone_count == 2
+    await backend.disconnect()
+    
+    # A torn row at the end of the active segment is discarded on reload
+    with open(os.path.join(path, "packed", "seg-000003.ids"), "a") as f:
+        f.write('"torn"')
+    
+    backend = FileVectorStore(path, segment_size=2, compaction_ratio=0.4)
+    await backend.connect()
+    assert await backend.count() == 4
+    assert (await backend.get("v0"))["metadata"] == {"i": 0, "updated": True}
+    assert (await backend.get("v0"))["vector"] == [0.0, 0.0, 1.0]
+    assert await backend.get("v1") is None
+    assert isinstance(backend.vectors["v2"], np.memmap)
+    
+    # Crossing the dead-row ratio compacts into a single segment
+    await backend.delete("v2")
+    await backend._compaction_task
+    assert backend.packed.segments == ["seg-000004"]
+    assert backend.packed.tombstone_count == 0
+    assert sorted(os.listdir(os.path.join(path, "packed"))) == [
+        "manifest.json", "seg-000004.f32", "seg-000004.ids", "seg-000004.meta"
+    ]
+    await backend.add("v5", [5.0, 1.0, 0.0], {"i": 5})
+    await backend.disconnect()
+    
+    backend = FileVectorStore(path)
+    await backend.connect()
+    assert sorted(backend.vectors) == ["v0", "v3", "v4", "v5"]
+    results = await backend.search([0.0, 0.0, 1.0], limit=1)
+    assert results[0]["id"] == "v0"
+    
+    # A delete waiting for the lock while a compaction holds it
+    async with backend._lock:
+        compaction = asyncio.create_task(backend.compact())
+        await asyncio.sleep(0)
+        deletion = asyncio.create_task(backend.delete("v3"))
+        await asyncio.sleep(0)
+    await asyncio.gather(compaction, deletion)
+    assert sorted(backend.vectors) == ["v0", "v4", "v5"]
+    await backend.disconnect()
+    backend = FileVectorStore(path)
+    await backend.connect()
+    assert sorted(backend.vectors) == ["v0", "v4", "v5"]
+    await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_vector_store_file_backend_legacy_files(temp_dir):
+    """Test that per-file vector directories keep the files layout."""
+    path = os.path.join(temp_dir, "vector_store_files")
+    backend = FileVectorStore(path, storage="files")
+    await backend.initialize({})
+    await backend.add("a", [1.0, 0.0], {"name": "A"})
+    await backend.disconnect()
+    assert os.listdir(os.path.join(path, "vectors")) == ["a.json"]
+    
+    backend = FileVectorStore(path)
+    assert backend.storage == "files"
+    assert (await backend.get("a"))["metadata"] == {"name": "A"}
+    
+    with pytest.raises(ValueError):
+        FileVectorStore(path, storage="sqlite")
+
+
+@pytest.mark.asyncio
+async def test_vector_store_search_many(temp_dir):
+    """Test batched multi-query search on both vector store backends."""
+    backends = [
+        InMemoryVectorStore(),
+        FileVectorStore(os.path.join(temp_dir, "vector_store_many")),
+    ]
+    
+    for backend in backends:
+        await backend.initialize({})
+        await backend.connect()
+        await backend.add("x", [1.0, 0.0, 0.0], {"axis": "x"})
+        await backend.add("y", [0.0, 1.0, 0.0], {"axis": "y"})
+        await backend.add("z", [0.0, 0.0, 1.0], {"axis": "z"})
+        
+        queries = [[0.9, 0.1, 0.0], [0.0, 0.2, 0.8]]
+        results = await backend.search_many(queries, limit=2)
+        assert len(results) == 2
+        for query, query_results in zip(queries, results):
+            expected = await backend.search(query, limit=2)
+            assert [r["id"] for r in query_results] == [r["id"] for r in expected]
+            assert query_results[0]["similarity"] == pytest.approx(expected[0]["similarity"])
+        
+        filtered = await backend.search_many(queries, metadata_filter={"axis": "y"})
+        assert [[r["id"] for r in rs] for rs in filtered] == [["y"], ["y"]]
+        
+        await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_vector_store_matrix_search(temp_dir):
+    """Test matrix search after deletes and without materialized vectors."""
+    backends = [
+        InMemoryVectorStore(),
+        FileVectorStore(os.path.join(temp_dir, "vector_store_matrix")),
+    ]
+    rng = np.random.RandomState(0)
+    data = {f"v{i}": rng.rand(8).tolist() for i in range(20)}
+    query = rng.rand(8).tolist()
+    
+    for backend in backends:
+        await backend.initialize({})
+        await backend.connect()
+        for id, vector in data.items():
+            await backend.add(id, vector, {"even": int(id[1:]) % 2 == 0})
+        for id in ("v0", "v7", "v19"):
+            await backend.delete(id)
+        
+        live = [id for id in data if id not in ("v0", "v7", "v19")]
+        matrix = np.array([data[id] for id in live])
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+        expected = [live[i] for i in np.argsort(-scores)[:5]]
+        
+        results = await backend.search(query, limit=5)
+        assert [r["id"] for r in results] == expected
+        assert results[0]["vector"] == pytest.approx(data[expected[0]])
+        
+        hits = await backend.search(query, limit=5, include_vectors=False)
+        assert [r["id"] for r in hits] == expected
+        assert all("vector" not in r for r in hits)
+        
+        filtered = await backend.search(query, limit=3, metadata_filter={"even": True})
+        assert all(r["metadata"]["even"] for r in filtered)
+        
+        with pytest.raises(ValueError):
+            await backend.add("bad", [1.0, 2.0])
+        assert await backend.get("bad") is None
+        
+        await backend.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_vector_store_metadata_index(temp_dir):
+    """Test equality and $in filters through the inverted metadata index."""
+    backends = [
+        InMemoryVectorStore(),
+        FileVectorStore(os.path.join(temp_dir, "vector_store_filter")),
+        InMemoryVectorStore(metadata_index=MetadataIndex(keys=["tenant"])),
+    ]
+    
+    for backend in backends:
+        await backend.initialize({})
+        await backend.connect()
+        for i in range(12):
+            await backend.add(
+                f"v{i}", [1.0, float(i), 0.0],
+                {"tenant": f"t{i % 3}", "agent_id": f"a{i % 2}", "tags": ["x"]}
+            )
+        await backend.add("v0", [1.0, 0.0, 0.0], {"tenant": "t9", "agent_id": "a0"})
+        await backend.delete("v3")
+        
+        def ids(results):
+            return sorted(r["id"] for r in results)
+        
+        query = [1.0, 1.0, 0.0]
+        assert ids(await backend.search(query, 20, {"tenant": "t0"})) == ["v6", "v9"]
+        assert ids(await backend.search(query, 20, {"tenant": "t0", "agent_id": "a1"})) == ["v9"]
+        assert ids(await backend.search(query, 20, {"tenant": {"$in": ["t9", "t1"]}, "agent_id": "a0"})) == [
+            "v0", "v10", "v4"
+        ]
+        assert ids(await backend.search(query, 20, {"tenant": "t1", "tags": ["x"]})) == ["v1", "v10", "v4", "v7"]
+        assert await backend.search(query, 20, {"tenant": "missing"}) == []
+        
+        await backend.disconnect()
+    
+    # The file store rebuilds the index on load
+    backend = FileVectorStore(os.path.join(temp_dir, "vector_store_filter"))
+    results = await backend.search([1.0, 1.0, 0.0], 20, {"tenant": {"$in": ["t9"]}})
+    assert [r["id"] for r in results] == ["v0"]
+
+
+@pytest.mark.asyncio
+async def test_vector_store_ivf_backend():
+    """Test approximate IVF vector store backend."""
+    backend = await StorageBackendFactory.create_backend(
+        BackendType.VECTOR_STORE,
+        "ivf",
+        "test_ivf",
+        {"n_lists": 8, "nprobe": 2, "train_size": 200}
+    )
+    
+    assert isinstance(backend, IVFVectorStore)
+    
+    # Clustered data so the coarse quantizer has structure to find
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 16))
+    for i in range(400):
+        vector = centers[i % 8] + 0.1 * rng.normal(size=16)
+        await backend.add(f"v{i}", vector.tolist(), {"cluster": i % 8})
+    
+    assert backend.is_trained
+    assert await backend.count() == 400
+    
+    # Nearest neighbour of a stored vector is itself
+    stored = await backend.get("v42")
+    results = await backend.search(stored["vector"], limit=5)
+    assert results[0]["id"] == "v42"
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    
+    # Metadata filter only returns matching rows
+    results = await backend.search(stored["vector"], metadata_filter={"cluster": 2})
+    assert results and all(r["metadata"]["cluster"] == 2 for r in results)
+    results = await backend.search(stored["vector"], metadata_filter={"cluster": {"$in": [1, 2]}})
+    assert results and all(r["metadata"]["cluster"] in (1, 2) for r in results)
+
+    # A filter matching only far-away lists widens the probe to fill the limit
+    v0 = await backend.get("v0")
+    results = await backend.search(v0["vector"], limit=10, metadata_filter={"cluster": 5}, nprobe=1)
+    assert len(results) == 10
+    assert all(r["metadata"]["cluster"] == 5 for r in results)
+    
+    # Positional arguments follow the VectorStoreBackend signature
+    results = await backend.search(v0["vector"], 5, None, False)
+    assert len(results) == 5 and all("vector" not in r for r in results)
+    batched = await backend.search_many([v0["vector"]], 5, None, False)
+    assert [r["id"] for r in batched[0]] == [r["id"] for r in results]
+
+    # Incremental delete and add
+    assert await backend.delete("v42") is True
+    assert await backend.delete("v42") is False
+    results = await backend.search(stored["vector"], limit=5)
+    assert "v42" not in [r["id"] for r in results]
+    await backend.add("v42", stored["vector"])
+    assert (await backend.search(stored["vector"], limit=1))[0]["id"] == "v42"
+    
+    # Scanning every list is exact
+    queries = [(centers[i] + 0.1 * rng.normal(size=16)).tolist() for i in range(8)]
+    report = await backend.recall_report(queries, limit=10, nprobe_values=[1, 8])
+    assert [row["nprobe"] for row in report] == [1, 8]
+    assert report[1]["recall"] == pytest.approx(1.0)
+    assert report[0]["recall"] <= report[1]["recall"]
+
+
 @pytest.mark.asyncio
 async def test_knowledge_graph_memory_backend():
     """Test in-memory knowledge graph backend."""
@@ -200,6 +457,167 @@ async def test_knowledge_graph_memory_backend():
     await backend.disconnect()
 
 
+@pytest.mark.asyncio
+async def test_knowledge_graph_file_backend_log(temp_dir):
+    """Test the log-structured file knowledge graph backend."""
+    backend = await StorageBackendFactory.create_backend(
+        BackendType.KNOWLEDGE_GRAPH,
+        "file",
+        "test_file",
+        {"path": temp_dir, "compact_threshold": 5}
+    )
+    
+    assert isinstance(backend, FileKnowledgeGraph)
+    assert backend.storage == "log"
+    
+    await backend.add_entity("person1", "person", {"name": "Alice"})
+    await backend.add_entity("person2", "person", {"name": "Bob"})
+    await backend.add_entity("document1", "document", {"title": "Report"})
+    await backend.add_relation("person1", "document1", "AUTHORED", {"date": "2023-01-01"})
+    await backend.add_relation("person2", "document1", "REVIEWED", {"date": "2023-01-02"})
+    
+    # The fifth record triggered a compaction into a snapshot
+    assert backend.log.records_since_snapshot == 0
+    assert sorted(os.listdir(backend.log.path)) == ["log-000001.jsonl", "snapshot.jsonl"]
+    
+    await backend.update_entity("person2", {"age": 40})
+    assert await backend.delete_relation("person1", "document1", "AUTHORED")
+    assert not await backend.delete_relation("person1", "document1", "AUTHORED")
+    assert await backend.delete_entity("person1")
+    await backend.disconnect()
+    
+    # Simulate a crash in the middle of writing a record
+    with open(os.path.join(backend.log.path, "log-000001.jsonl"), "a") as f:
+        f.write('{"op":"entity","id":"torn"')
+    
+    # Startup replays the snapshot plus the log tail
+    reloaded = FileKnowledgeGraph(temp_dir)
+    await reloaded.connect()
+    assert await reloaded.get_entity("person1") is None
+    assert (await reloaded.get_entity("person2"))["properties"] == {"name": "Bob", "age": 40}
+    assert await reloaded.get_entity("torn") is None
+    relations = await reloaded.get_relations("document1", direction="incoming")
+    assert [(r["from_id"], r["type"]) for r in relations] == [("person2", "REVIEWED")]
+    
+    # The torn record was discarded, so new appends replay cleanly
+    await reloaded.add_entity("person3", "person")
+    await reloaded.disconnect()
+    await reloaded.connect()
+    assert await reloaded.get_entity("person3") is not None
+    await reloaded.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_knowledge_graph_file_backend_legacy_files(temp_dir):
+    """Test that directories using one JSON file per record keep that layout."""
+    backend = FileKnowledgeGraph(temp_dir, storage="files")
+    await backend.initialize({})
+    await backend.add_entity("person1", "person", {"name": "Alice"})
+    await backend.add_entity("document1", "document")
+    await backend.add_relation("person1", "document1", "AUTHORED")
+    await backend.disconnect()
+    
+    assert os.path.exists(os.path.join(temp_dir, "entities", "person1.json"))
+    
+    reloaded = FileKnowledgeGraph(temp_dir)
+    assert reloaded.storage == "files"
+    results = await reloaded.query("person1", ["AUTHORED"])
+    assert [entity["id"] for entity in results] == ["document1"]
+    await reloaded.disconnect()
+    
+    with pytest.raises(ValueError):
+        FileKnowledgeGraph(temp_dir, storage="sqlite")
+
+
+@pytest.mark.asyncio
+async def test_knowledge_graph_bulk_ingest(temp_dir):
+    """Test bulk entity and relation ingestion on both backends."""
+    path = os.path.join(temp_dir, "kg_bulk")
+    entities = [{"id": f"e{i}", "type": "thing", "properties": {"n": i}} for i in range(50)]
+    relations = [{"from_id": f"e{i}", "to_id": f"e{i + 1}", "type": "NEXT"} for i in range(49)]
+    
+    for backend in [InMemoryKnowledgeGraph(), FileKnowledgeGraph(path)]:
+        await backend.initialize({})
+        await backend.connect()
+        await backend.add_entities_bulk(entities)
+        await backend.add_relations_bulk(relations)
+        
+        assert (await backend.get_entity("e7"))["properties"] == {"n": 7}
+        assert [r["to_id"] for r in await backend.get_relations("e7")] == ["e8"]
+        assert [e["id"] for e in await backend.query("e0", ["NEXT"] * 3)] == ["e3"]
+        
+        # The batch is validated before anything is stored
+        with pytest.raises(ValueError):
+            await backend.add_relations_bulk([
+                {"from_id": "e0", "to_id": "e2", "type": "SKIP"},
+                {"from_id": "e0", "to_id": "missing", "type": "SKIP"}
+            ])
+        with pytest.raises(ValueError):
+            await backend.add_entities_bulk([{"id": "no_type"}])
+        assert await backend.get_relations("e0", "SKIP") == []
+        assert await backend.get_entity("no_type") is None
+    
+    # Both batches went to the log
+    with open(os.path.join(path, "log", "log-000000.jsonl")) as f:
+        assert sum(1 for _ in f) == 99
+    await backend.disconnect()
+    reloaded = FileKnowledgeGraph(path)
+    assert [r["to_id"] for r in await reloaded.get_relations("e48")] == ["e49"]
+    
+    # The base-class fallback adds the items one by one
+    backend = InMemoryKnowledgeGraph()
+    await KnowledgeGraphBackend.add_entities_bulk(backend, entities[:2])
+    await KnowledgeGraphBackend.add_relations_bulk(backend, relations[:1])
+    assert [r["to_id"] for r in await backend.get_relations("e0")] == ["e1"]
+
+
+@pytest.mark.asyncio
+async def test_knowledge_graph_traversal(temp_dir):
+    """Test deduplicated path queries, bounded BFS and shortest paths."""
+    for backend in [InMemoryKnowledgeGraph(), FileKnowledgeGraph(os.path.join(temp_dir, "kg_traversal"))]:
+        await backend.initialize({})
+        await backend.connect()
+        for entity_id in "abcdf":
+            await backend.add_entity(entity_id, "person")
+        await backend.add_entity("e", "company")
+        await backend.add_relation("a", "b", "KNOWS")
+        await backend.add_relation("a", "c", "KNOWS", {"close": True})
+        await backend.add_relation("b", "d", "KNOWS")
+        await backend.add_relation("c", "d", "KNOWS")
+        await backend.add_relation("c", "f", "KNOWS")
+        await backend.add_relation("d", "e", "WORKS_AT")
+        
+        def ids(entities):
+            return [entity["id"] for entity in entities]
+        
+        # d is reached along two paths but returned once
+        assert ids(await backend.query("a", ["KNOWS", "KNOWS"])) == ["d", "f"]
+        assert ids(await backend.query("a", ["KNOWS", "KNOWS"], limit=1)) == ["d"]
+        assert ids(await backend.query("d", [{"type": "KNOWS", "direction": "incoming"}])) == ["b", "c"]
+        assert ids(await backend.query("a", [{"type": "KNOWS", "properties": {"close": True}}])) == ["c"]
+        assert ids(await backend.query("b", ["KNOWS", {"entity_type": "company"}])) == ["e"]
+        with pytest.raises(ValueError):
+            await backend.query("a", [{"type": "KNOWS", "direction": "sideways"}])
+        
+        neighborhood = await backend.neighborhood("a", max_depth=2)
+        assert [(entity["id"], entity["depth"]) for entity in neighborhood] == [
+            ("a", 0), ("b", 1), ("c", 1), ("d", 2), ("f", 2)
+        ]
+        assert ids(await backend.neighborhood("a", max_depth=2, limit=3)) == ["a", "b", "c"]
+        
+        assert ids(await backend.shortest_path("a", "e")) == ["a", "b", "d", "e"]
+        assert await backend.shortest_path("e", "a") == []
+        assert ids(await backend.shortest_path("e", "a", direction="both")) == ["e", "d", "b", "a"]
+        assert await backend.shortest_path("a", "e", max_depth=2) == []
+        assert await backend.shortest_path("a", "e", relation_types=["KNOWS"]) == []
+        
+        # The generic base-class implementations agree with the native ones
+        assert await KnowledgeGraphBackend.neighborhood(backend, "a", max_depth=2) == neighborhood
+        assert ids(await KnowledgeGraphBackend.shortest_path(backend, "a", "e")) == ["a", "b", "d", "e"]
+        
+        await backend.disconnect()
+
+
 @pytest.mark.asyncio
 async def test_checkpoint_store_memory_backend():
     """Test in-memory checkpoint store backend."""
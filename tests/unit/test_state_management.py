@@ -154,4 +154,226 @@ async def test_transaction_atomicity(storage_provider):
     
     # Verify item was not stored
     item3 = await storage_provider.retrieve("test/item3.json")
-    assert item3 is None
\ No newline at end of file
+    assert item3 is None
+
+@pytest.mark.asyncio
+async def test_checkpoint_content_addressed_bundles(storage_provider, checkpoint_manager):
+    """Test that checkpoints share unchanged bundles and release them on delete."""
+    from types import SimpleNamespace
+    
+    tasks = {
+        f"task_{i}": SimpleNamespace(id=f"task_{i}", name=f"Task {i}", status="pending")
+        for i in range(3)
+    }
+    instance = SimpleNamespace(tasks=SimpleNamespace(tasks=tasks))
+    
+    first_id = await checkpoint_manager.create_checkpoint(instance, "first")
+    tasks["task_0"].status = "completed"
+    second_id = await checkpoint_manager.create_checkpoint(instance, "second")
+    
+    first = await checkpoint_manager.get_checkpoint(first_id)
+    second = await checkpoint_manager.get_checkpoint(second_id)
+    first_keys = {e["entity_id"]: e["bundle_key"] for e in first.entities}
+    second_keys = {
+        e["entity_id"]: e["bundle_key"] for e in await checkpoint_manager.resolve_entities(second)
+    }
+    
+    # Only the changed task got a new blob
+    assert first_keys["task_0"] != second_keys["task_0"]
+    assert first_keys["task_1"] == second_keys["task_1"]
+    assert first_keys["task_2"] == second_keys["task_2"]
+    blobs = [k for k in await storage_provider.list_keys("blobs") if not k.endswith("refcounts.json")]
+    assert len(blobs) == 4
+    
+    bundle = await storage_provider.retrieve_bundle(second_keys["task_0"])
+    assert bundle.data["status"] == "completed"
+    
+    # Deleting the first checkpoint only frees the blob no one else uses
+    assert await checkpoint_manager.delete_checkpoint(first_id) is True
+    assert await storage_provider.retrieve(first_keys["task_0"]) is None
+    for key in second_keys.values():
+        assert await storage_provider.retrieve(key) is not None
+    assert (await checkpoint_manager.get_latest_checkpoint()).checkpoint_id == second_id
+    
+    # Reference counts are persisted, so a new provider sees them too
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path))
+    assert await reopened.delete_checkpoint(second_id) is True
+    blobs = [k for k in await storage_provider.list_keys("blobs") if not k.endswith("refcounts.json")]
+    assert blobs == []
+    assert await reopened.get_latest_checkpoint() is None
+
+
+@pytest.mark.asyncio
+async def test_delta_checkpoint_chain(storage_provider):
+    """Test delta checkpoints, chain replay, forced full checkpoints and folding."""
+    from types import SimpleNamespace
+    from symphony.core.state import mark_dirty
+    
+    manager = CheckpointManager(storage_provider, max_chain_length=2)
+    tasks = {
+        f"task_{i}": SimpleNamespace(id=f"task_{i}", name=f"Task {i}", status="pending")
+        for i in range(3)
+    }
+    instance = SimpleNamespace(tasks=SimpleNamespace(tasks=tasks))
+    
+    async def resolved(checkpoint_id):
+        checkpoint = await manager.get_checkpoint(checkpoint_id)
+        entries = await manager.resolve_entities(checkpoint)
+        states = {}
+        for entry in entries:
+            bundle = await storage_provider.retrieve_bundle(entry["bundle_key"])
+            states[entry["entity_id"]] = bundle.data["status"]
+        return checkpoint, states
+    
+    base_id = await manager.create_checkpoint(instance, "base")
+    tasks["task_0"].status = "running"
+    del tasks["task_2"]
+    delta_id = await manager.create_checkpoint(instance, "delta")
+    
+    delta, states = await resolved(delta_id)
+    assert delta.parent_id == base_id and delta.chain_length == 1
+    assert [e["entity_id"] for e in delta.entities] == ["task_0"]
+    assert delta.removed == [["Task", "task_2"]]
+    assert delta.entity_count == 2
+    assert states == {"task_0": "running", "task_1": "pending"}
+    
+    # Entities with a revision counter are only re-encoded once marked dirty
+    mark_dirty(tasks["task_1"])
+    second_id = await manager.create_checkpoint(instance, "second")
+    tasks["task_1"].status = "completed"
+    unmarked_id = await manager.create_checkpoint(instance, "unmarked")
+    unmarked, _ = await resolved(unmarked_id)
+    assert not unmarked.is_delta  # Chain limit reached
+    _, states = await resolved(unmarked_id)
+    assert states["task_1"] == "pending"
+    mark_dirty(tasks["task_1"])
+    marked_id = await manager.create_checkpoint(instance, "marked")
+    marked, states = await resolved(marked_id)
+    assert [e["entity_id"] for e in marked.entities] == ["task_1"]
+    assert states["task_1"] == "completed"
+    
+    # A fresh manager chains onto the latest checkpoint from storage
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path), max_chain_length=2)
+    reopened_id = await reopened.create_checkpoint(instance, "reopened")
+    assert (await reopened.get_checkpoint(reopened_id)).parent_id == marked_id
+    assert (await reopened.get_checkpoint(reopened_id)).entities == []
+    
+    # Stored revisions are not trusted for another object with the same counter
+    tasks["task_1"] = SimpleNamespace(id="task_1", name="Task 1", status="failed")
+    mark_dirty(tasks["task_1"])
+    mark_dirty(tasks["task_1"])
+    fresh = CheckpointManager(FileStorageProvider(storage_provider.base_path), max_chain_length=8)
+    replaced_id = await fresh.create_checkpoint(instance, "replaced")
+    replaced, states = await resolved(replaced_id)
+    assert [e["entity_id"] for e in replaced.entities] == ["task_1"]
+    assert states["task_1"] == "failed"
+    
+    # Deleting a checkpoint folds its changes into the next one in the chain
+    _, expected = await resolved(second_id)
+    assert await manager.delete_checkpoint(delta_id) is True
+    second, states = await resolved(second_id)
+    assert second.parent_id == base_id
+    assert states == expected
+    assert await manager.delete_checkpoint(base_id) is True
+    second, states = await resolved(second_id)
+    assert not second.is_delta and second.removed == []
+    assert states == expected
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_snapshot(checkpoint_manager):
+    """Test which entities a snapshot encodes before it is written."""
+    from types import SimpleNamespace
+    from symphony.core.state import mark_dirty
+    
+    tasks = {
+        "tracked": SimpleNamespace(id="tracked", name="Tracked", status="pending"),
+        "plain": SimpleNamespace(id="plain", name="Plain", status="pending")
+    }
+    mark_dirty(tasks["tracked"])
+    instance = SimpleNamespace(tasks=SimpleNamespace(tasks=tasks))
+    
+    # Every entity is encoded when the snapshot is taken
+    snapshot = await checkpoint_manager.snapshot(instance)
+    assert [bundle.entity_id for bundle, _, _ in snapshot.bundles] == ["tracked", "plain"]
+    assert snapshot.deferred == []
+    tasks["plain"].status = "running"
+    checkpoint_id = await checkpoint_manager.write_snapshot(snapshot)
+    checkpoint = await checkpoint_manager.get_checkpoint(checkpoint_id)
+    states = {}
+    for entry in await checkpoint_manager.resolve_entities(checkpoint):
+        bundle = await checkpoint_manager.storage.retrieve_bundle(entry["bundle_key"])
+        states[entry["entity_id"]] = bundle.data["status"]
+    assert states == {"tracked": "pending", "plain": "pending"}
+    
+    # The same object at the same revision reuses its bundle
+    again = await checkpoint_manager.snapshot(instance)
+    assert again.bundles[0][0] is snapshot.bundles[0][0]
+    
+    # A replacement object with the same id and revision is encoded again
+    tasks["tracked"] = SimpleNamespace(id="tracked", name="Tracked", status="running")
+    mark_dirty(tasks["tracked"])
+    replaced = await checkpoint_manager.snapshot(instance)
+    assert replaced.bundles[0][0].data["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_catalog(storage_provider, checkpoint_manager):
+    """Test catalog-backed listing, pattern lookup and rebuilds."""
+    from types import SimpleNamespace
+    from symphony.core.state.catalog import CATALOG_KEY
+    
+    tasks = {"task_0": SimpleNamespace(id="task_0", name="Task 0", status="pending")}
+    instance = SimpleNamespace(tasks=SimpleNamespace(tasks=tasks))
+    
+    ids = []
+    for workflow_id in ("wf1", "wf2", "wf1"):
+        ids.append(await checkpoint_manager.create_checkpoint(
+            instance, f"workflow_{workflow_id}_step_{len(ids)}", {"workflow_id": workflow_id}
+        ))
+    
+    assert [e.checkpoint_id for e in await checkpoint_manager.list_entries()] == ids[::-1]
+    assert [e.checkpoint_id for e in await checkpoint_manager.list_entries("wf1")] == [ids[2], ids[0]]
+    assert (await checkpoint_manager.latest_entry("wf2")).checkpoint_id == ids[1]
+    assert [e.checkpoint_id for e in await checkpoint_manager.find_checkpoints("workflow_wf1_*")] == [
+        ids[2], ids[0]
+    ]
+    assert await checkpoint_manager.find_checkpoints("other_*") == []
+    assert [c.checkpoint_id for c in await checkpoint_manager.list_checkpoints()] == ids[::-1]
+    
+    # Deleting the latest checkpoint moves the latest pointer via the catalog
+    assert await checkpoint_manager.delete_checkpoint(ids[2]) is True
+    assert (await checkpoint_manager.get_latest_checkpoint()).checkpoint_id == ids[1]
+    assert [e.checkpoint_id for e in await checkpoint_manager.list_entries("wf1")] == [ids[0]]
+    
+    # The catalog file is reloaded by new managers and rebuilt if missing
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path))
+    assert [e.checkpoint_id for e in await reopened.list_entries()] == [ids[1], ids[0]]
+    await storage_provider.delete(CATALOG_KEY)
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path))
+    assert [e.checkpoint_id for e in await reopened.list_entries()] == [ids[1], ids[0]]
+    assert (await reopened.find_checkpoints("workflow_wf2_*"))[0].entity_count == 1
+    
+    # A torn last line is dropped on load and does not swallow the next append
+    with open(os.path.join(storage_provider.base_path, "data", CATALOG_KEY), "a") as f:
+        f.write('{"add": {"checkpoint_id": "torn"')
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path))
+    assert [e.checkpoint_id for e in await reopened.list_entries()] == [ids[1], ids[0]]
+    new_ids = [
+        await reopened.create_checkpoint(instance, f"workflow_wf2_step_{i}", {"workflow_id": "wf2"})
+        for i in (3, 4)
+    ]
+    reopened = CheckpointManager(FileStorageProvider(storage_provider.base_path))
+    assert [e.checkpoint_id for e in await reopened.list_entries()] == new_ids[::-1] + [ids[1], ids[0]]
+    
+    # Checkpoints are indexed by their workflow definition
+    assert await reopened.latest_entry(definition_id="def1") is None
+    def_ids = [
+        await reopened.create_checkpoint(
+            instance, f"workflow_{workflow_id}_step", {"workflow_id": workflow_id, "workflow_definition_id": "def1"}
+        )
+        for workflow_id in ("wf3", "wf4")
+    ]
+    assert (await reopened.latest_entry(definition_id="def1")).checkpoint_id == def_ids[1]
+    assert await reopened.delete_checkpoint(def_ids[1]) is True
+    assert (await reopened.latest_entry(definition_id="def1")).checkpoint_id == def_ids[0]
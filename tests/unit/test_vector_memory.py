@@ -0,0 +1,344 @@
+"""Tests for vector memory and its similarity index."""
+
+import asyncio
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from symphony.memory.embedders import EmbeddingBatcher, HashingEmbedder
+from symphony.memory.local_kg_memory import LocalGraph
+from symphony.memory.persistence import WriteBehind, atomic_pickle_dump
+from symphony.memory.vector_index import VectorIndex, top_k_indices
+from symphony.memory.vector_memory import ConversationVectorMemory, SimpleEmbedder, VectorMemory
+from symphony.utils.types import Message
+
+
+class TestVectorIndex:
+    """Tests for the VectorIndex class."""
+
+    def test_add_and_search(self):
+        """Test that search ranks rows by cosine similarity."""
+        index = VectorIndex(initial_capacity=1)
+        index.add("x", [1.0, 0.0])
+        index.add("y", [0.0, 2.0])
+        index.add("xy", [1.0, 1.0])
+
+        results = index.search([1.0, 0.1], limit=2)
+        assert [id for id, _ in results] == ["x", "xy"]
+        assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+        assert len(index) == 3
+
+    def test_replace_and_remove(self):
+        """Test that replacing and removing ids keeps rows consistent."""
+        index = VectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 1.0])
+        index.add("c", [-1.0, 0.0])
+
+        index.add("a", [0.0, 1.0])
+        assert index.search([0.0, 1.0], threshold=0.99) == [
+            ("a", pytest.approx(1.0)),
+            ("b", pytest.approx(1.0)),
+        ]
+
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert "a" not in index
+        assert index.search([-1.0, 0.0], limit=1)[0][0] == "c"
+
+    def test_dimension_mismatch(self):
+        """Test that mismatched vectors are rejected."""
+        index = VectorIndex()
+        index.add("a", [1.0, 0.0])
+        with pytest.raises(ValueError):
+            index.add("b", [1.0, 0.0, 0.0])
+        assert index.search([1.0, 0.0, 0.0]) == []
+
+    def test_top_k_indices(self):
+        """Test top-k selection with limit and threshold."""
+        scores = np.array([0.1, 0.9, 0.5, 0.9, -0.2], dtype=np.float32)
+        assert top_k_indices(scores, limit=2).tolist() == [1, 3]
+        assert top_k_indices(scores, threshold=0.0).tolist() == [1, 3, 2, 0]
+
+
+class TestVectorMemory:
+    """Tests for the VectorMemory class."""
+
+    @pytest.mark.asyncio
+    async def test_search(self):
+        """Test semantic search over stored values."""
+        memory = VectorMemory()
+        await memory.store("weather", "The weather is sunny today")
+        await memory.store("python", "Python is a programming language")
+        await memory.store("rain", "Rain is expected tomorrow")
+
+        results = memory.search("python programming", limit=1)
+        assert results == ["Python is a programming language"]
+
+        all_results = memory.search("weather today", threshold=-1.0)
+        assert len(all_results) == 3
+        assert all_results[0] == "The weather is sunny today"
+
+    @pytest.mark.asyncio
+    async def test_overwrite_key(self):
+        """Test that overwriting a key replaces its indexed vector."""
+        memory = VectorMemory()
+        await memory.store("key", "apples and oranges")
+        await memory.store("key", "cars and trucks")
+
+        results = memory.search("cars trucks", threshold=-1.0)
+        assert results == ["cars and trucks"]
+
+    @pytest.mark.asyncio
+    async def test_persistence_rebuilds_index(self, tmp_path):
+        """Test that loading from disk restores searchability."""
+        path = str(tmp_path / "memory.pkl")
+        memory = VectorMemory(persist_path=path)
+        await memory.store("python", "Python is a programming language")
+        await memory.store("weather", "The weather is sunny today")
+
+        reloaded = VectorMemory(persist_path=path)
+        assert reloaded.search("sunny weather", limit=1) == ["The weather is sunny today"]
+
+        reloaded.clear()
+        assert reloaded.search("sunny weather") == []
+
+    def test_conversation_search_messages(self):
+        """Test that added messages are searchable with metadata."""
+        memory = ConversationVectorMemory()
+        memory.add_message(Message(role="user", content="How do I bake bread?"))
+        memory.add_message(Message(role="assistant", content="Mix flour, water and yeast."))
+
+        messages = memory.search_messages("bake bread", limit=1)
+        assert len(messages) == 1
+        assert messages[0].role == "user"
+
+
+class TestSearchMany:
+    """Tests for batched multi-query search."""
+
+    def test_vector_index_search_many(self):
+        """Test that batched search matches per-query search."""
+        rng = np.random.default_rng(0)
+        index = VectorIndex()
+        for i, vector in enumerate(rng.normal(size=(50, 8))):
+            index.add(f"v{i}", vector)
+
+        queries = rng.normal(size=(5, 8))
+        batched = index.search_many(queries, limit=3)
+        assert len(batched) == 5
+        for query, results in zip(queries, batched):
+            assert [id for id, _ in results] == [id for id, _ in index.search(query, limit=3)]
+
+    @pytest.mark.asyncio
+    async def test_vector_memory_search_many(self):
+        """Test that VectorMemory returns one result list per query."""
+        memory = VectorMemory()
+        await memory.store("weather", "The weather is sunny today")
+        await memory.store("python", "Python is a programming language")
+
+        results = memory.search_many(["python programming", "sunny weather"], limit=1)
+        assert results == [
+            ["Python is a programming language"],
+            ["The weather is sunny today"],
+        ]
+        assert VectorMemory().search_many(["anything"]) == [[]]
+
+
+class TestWriteBehind:
+    """Tests for write-behind persistence."""
+
+    @pytest.mark.asyncio
+    async def test_batches_saves_until_max_dirty(self, tmp_path):
+        """Test that inserts are saved once per max_dirty changes."""
+        path = str(tmp_path / "memory.pkl")
+        memory = VectorMemory(persist_path=path, write_behind=True, flush_interval=60, max_dirty=3)
+
+        await memory.store("a", "first value")
+        await memory.store("b", "second value")
+        assert not os.path.exists(path)
+
+        await memory.store("c", "third value")
+        assert len(VectorMemory(persist_path=path).entries) == 3
+
+        await memory.store("d", "fourth value")
+        assert len(VectorMemory(persist_path=path).entries) == 3
+        memory.flush()
+        assert len(VectorMemory(persist_path=path).entries) == 4
+        await memory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_background_flush_and_aclose(self, tmp_path):
+        """Test that pending changes are flushed by the timer and on close."""
+        path = str(tmp_path / "memory.pkl")
+        memory = VectorMemory(persist_path=path, write_behind=True, flush_interval=0.01)
+        await memory.store("a", "first value")
+        await asyncio.sleep(0.05)
+        assert len(VectorMemory(persist_path=path).entries) == 1
+
+        memory = ConversationVectorMemory(persist_path=path, write_behind=True, flush_interval=60)
+        memory.add_message(Message(role="user", content="Hello there"))
+        await memory.aclose()
+        assert len(VectorMemory(persist_path=path).entries) == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_discards_pending_writes(self, tmp_path):
+        """Test that clearing drops queued writes instead of recreating the file."""
+        path = str(tmp_path / "memory.pkl")
+        memory = VectorMemory(persist_path=path, write_behind=True, flush_interval=60)
+        await memory.store("a", "first value")
+        memory.clear()
+        memory.flush()
+        assert not os.path.exists(path)
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_changes_pending(self):
+        """Test that changes are retried after a write fails."""
+        writes = []
+
+        def flaky_write():
+            writes.append(len(writes))
+            if len(writes) == 1:
+                raise OSError("disk full")
+
+        buffer = WriteBehind(flaky_write, flush_interval=0.01)
+        buffer.mark_dirty()
+        await asyncio.sleep(0.05)
+        assert writes == [0]
+        assert buffer.dirty == 1
+
+        buffer.flush()
+        assert writes == [0, 1]
+        assert buffer.dirty == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_vector_memory_flush_keeps_changes_pending(self, tmp_path):
+        """Test that VectorMemory write failures reach the write-behind buffer."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("not a directory")
+        path = str(blocker / "memory.pkl")
+        memory = VectorMemory(persist_path=path, write_behind=True, flush_interval=60)
+        await memory.store("a", "first")
+
+        with pytest.raises(OSError):
+            memory.flush()
+        assert memory._write_behind.dirty == 1
+
+        blocker.unlink()
+        memory.flush()
+        assert memory._write_behind.dirty == 0
+        assert len(VectorMemory(persist_path=path).entries) == 1
+        await memory.aclose()
+
+    def test_atomic_pickle_dump(self, tmp_path):
+        """Test that atomic writes replace the file and leave no temp files."""
+        path = str(tmp_path / "data.pkl")
+        atomic_pickle_dump({"a": 1}, path)
+        atomic_pickle_dump({"b": 2}, path)
+
+        with open(path, "rb") as f:
+            assert pickle.load(f) == {"b": 2}
+        assert os.listdir(tmp_path) == ["data.pkl"]
+
+
+class TestHashingEmbedder:
+    """Tests for the feature-hashing embedder."""
+
+    def test_embed_batch(self):
+        """Test that batch and single embeddings agree and are normalized."""
+        embedder = HashingEmbedder(dimension=64)
+        batch = embedder.embed_batch(["Hello, world!", "", "hello world"])
+
+        assert batch.shape == (3, 64)
+        assert batch.dtype == np.float32
+        assert np.linalg.norm(batch[0]) == pytest.approx(1.0, abs=1e-6)
+        assert not batch[1].any()
+        assert np.allclose(batch[0], batch[2])
+        assert np.allclose(embedder.embed("hello world"), batch[0])
+
+    def test_deterministic_and_seeded(self):
+        """Test that embeddings depend only on the text and seed."""
+        assert HashingEmbedder(seed=1).embed("alpha beta") == HashingEmbedder(seed=1).embed("alpha beta")
+        assert HashingEmbedder(seed=1).embed("alpha beta") != HashingEmbedder(seed=2).embed("alpha beta")
+
+    def test_bounded_cache(self):
+        """Test that the token cache does not grow past its limit."""
+        embedder = HashingEmbedder(cache_size=10)
+        embedder.embed_batch([f"token{i}" for i in range(100)])
+        assert embedder._token_features.cache_info().currsize == 10
+
+    @pytest.mark.asyncio
+    async def test_select_by_config(self):
+        """Test that memories can select the embedder by name or config."""
+        memory = VectorMemory(embedder={"type": "hashing", "dimension": 32})
+        assert isinstance(memory.embedder, HashingEmbedder)
+        assert memory.embedder.dimension == 32
+
+        await memory.store("python", "Python is a programming language")
+        await memory.store("weather", "The weather is sunny today")
+        assert memory.search("sunny weather", limit=1) == ["The weather is sunny today"]
+
+        graph = LocalGraph(embedding_model="hashing")
+        assert isinstance(graph.embedding_model, HashingEmbedder)
+        assert isinstance(VectorMemory(embedder="simple").embedder, SimpleEmbedder)
+        with pytest.raises(ValueError):
+            VectorMemory(embedder="unknown")
+
+
+class TestEmbeddingBatcher:
+    """Tests for the micro-batching embedding queue."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_requests(self):
+        """Test that concurrent requests are split into batches by size."""
+        embedder = HashingEmbedder(dimension=16)
+        calls = []
+        original = embedder.embed_batch
+        embedder.embed_batch = lambda texts: calls.append(list(texts)) or original(texts)
+
+        batcher = EmbeddingBatcher(embedder, max_batch_size=4)
+        texts = [f"text {i}" for i in range(10)]
+        vectors = await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+        assert [len(batch) for batch in calls] == [4, 4, 2]
+        assert np.allclose(vectors[7], embedder.embed("text 7"))
+        assert await batcher.embed_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_latency_limit_and_async_embedder(self):
+        """Test that a partial batch waits for the latency limit and uses aembed_batch."""
+        class AsyncEmbedder:
+            def __init__(self):
+                self.batches = []
+
+            def embed(self, text):
+                raise AssertionError("single-text embed should not be used")
+
+            async def aembed_batch(self, texts):
+                self.batches.append(texts)
+                return [[float(len(text)), 1.0] for text in texts]
+
+        embedder = AsyncEmbedder()
+        batcher = EmbeddingBatcher(embedder, max_latency=0.01)
+        first = asyncio.ensure_future(batcher.embed("a"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(batcher.embed("bbb"))
+
+        assert await first == [1.0, 1.0]
+        assert await second == [3.0, 1.0]
+        assert embedder.batches == [["a", "bbb"]]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that an embedder failure is raised in each waiting request."""
+        class FailingEmbedder:
+            def embed_batch(self, texts):
+                raise RuntimeError("embedding service unavailable")
+
+        batcher = EmbeddingBatcher(FailingEmbedder())
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)